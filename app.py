@@ -1,16 +1,26 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, get_flashed_messages
-from src.data_loading import load_elo_data, merge_data, load_match_data
-from src.prediction import get_team_list, predict_match, print_betting_odds, print_previous_matchups
-from src.data_scraping import get_elo_data
+from flask import Flask, Response, g, render_template, request, jsonify, redirect, url_for, flash, get_flashed_messages
+from src.prediction import get_team_list, predict_match, predict_matches, print_previous_matchups, resolve_elos
+from src.data_scraping import get_elo_data, load_latest_elo_data
+from src.fixture_matrix import build_fixture_matrix
+from src.elo_snapshot import EloSnapshot
+from src.elo_refresher import EloRefresher
+from src.shared_elo import SharedEloStore
+from src.simulation import simulate_season
+from src.prediction_cache import PredictionCache
+from src.linear_model import LinearGoalsModel
+from src.model_registry import ModelRegistry
+from src.profiling import RequestProfiler
+from src.jobs import JobQueue, FINISHED, SUCCEEDED
+from src.training_jobs import retrain_job, backtest_job
+from src import metrics
 from config import Config
-import math
-import pickle
 import os
-import joblib
 import logging
+import threading
+import time
 from datetime import datetime
+from functools import partial
 import sys
-import pandas as pd
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,35 +34,220 @@ app.config.from_object(Config)
 
 # Initialize global variables
 model = None
-elo_data = None
+model_version = None
+elo_snapshot = None
 match_data = None
+head_to_head = None
+fixture_matrix = None
+elo_refresher = None
+elo_lock = threading.Lock()
+# ELO snapshot file shared by all worker processes
+elo_store = SharedEloStore(app.config['ELO_SNAPSHOT_PATH'])
+elo_store_stamp = None
+# Versioned models; a newly activated version is swapped in between requests
+model_registry = ModelRegistry(app.config['MODEL_REGISTRY_DIR'])
+model_registry_stamp = None
+model_lock = threading.Lock()
+# Warm-up progress: 'pending' until warm_up() has run, then 'ready' or 'failed'
+warmup_state = 'pending'
+warmup_seconds = None
+# /predict results for the current ELO snapshot and model
+prediction_cache = PredictionCache(
+    maxsize=app.config['PREDICTION_CACHE_SIZE'],
+    ttl=app.config['PREDICTION_CACHE_TTL']
+)
+# Request and stage latency histograms served at /metrics
+metrics.registry.enabled = app.config['METRICS_ENABLED']
+# Opt-in cProfile of individual requests, written to PROFILE_DIR
+request_profiler = RequestProfiler(
+    app.config['PROFILE_DIR'],
+    enabled=app.config['PROFILING_ENABLED'],
+    sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+    token=app.config['PROFILE_TOKEN'],
+    keep=app.config['PROFILE_KEEP']
+)
+# Long-running operations submitted through /jobs
+job_queue = JobQueue(
+    app.config['JOB_DB_PATH'],
+    workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_MAX_PENDING'],
+    retention=app.config['JOB_RETENTION']
+)
+
+def set_elo_data(new_elo_data, version=None, fetched_at=None):
+    """
+    Publish new ELO data as a snapshot and rebuild the fixture matrix.
+    With a version from the shared store, older or repeated versions are ignored.
+    """
+    global elo_snapshot, fixture_matrix
+    with elo_lock:
+        current = elo_snapshot.version if elo_snapshot is not None else 0
+        if version is None:
+            version = current + 1
+        elif version <= current:
+            return
+        timestamp = datetime.fromtimestamp(fetched_at) if fetched_at else None
+        snapshot = EloSnapshot.from_dataframe(new_elo_data, version, timestamp)
+        matrix = build_fixture_matrix(model, snapshot)
+        # Requests holding the old snapshot keep using it; the matrix
+        # version stamp stops it being mixed with the new one
+        elo_snapshot = snapshot
+        fixture_matrix = matrix
+        prediction_cache.invalidate((snapshot.version, model_version))
+
+def publish_elo_data(new_elo_data):
+    """Write freshly fetched ELO data to the shared store and use it in this worker"""
+    with elo_store.lock():
+        fetched_at = time.time()
+        version = elo_store.write(new_elo_data, fetched_at)
+    set_elo_data(new_elo_data, version, fetched_at)
+
+def sync_elo_data():
+    """Pick up a newer snapshot written by another worker, if there is one"""
+    global elo_store_stamp
+    stamp = elo_store.stamp()
+    if stamp is None or stamp == elo_store_stamp:
+        return
+    stored, version, fetched_at = elo_store.read()
+    if stored is not None:
+        set_elo_data(stored, version, fetched_at)
+        # Only a successful read marks the file as seen, so a failed one is retried
+        elo_store_stamp = stamp
+
+def load_stored_elo_data():
+    """
+    Load the last good ELO data from the shared store, falling back to the
+    database if configured. Returns the time the data was fetched, or None.
+    """
+    sync_elo_data()
+    if elo_snapshot is None and app.config.get('SQLALCHEMY_DATABASE_URI'):
+        stored = load_latest_elo_data()
+        if stored is not None:
+            # Unknown fetch time: share it, but mark it due for a refresh
+            with elo_store.lock():
+                if elo_store.stamp() is None:
+                    elo_store.write(stored, fetched_at=time.time() - app.config['ELO_REFRESH_TTL'])
+            sync_elo_data()
+    return elo_snapshot.timestamp.timestamp() if elo_snapshot is not None else None
+
+def load_model():
+    """
+    Load the active model from the registry, falling back to the exported
+    coefficients and then the sklearn pickle.
+
+    Returns:
+        (model, version), or (None, None) if no model was found
+    """
+    arrays, metadata = model_registry.load()
+    if arrays is not None:
+        return LinearGoalsModel.from_arrays(arrays, metadata['features'], metadata.get('link', 'identity')), metadata['version']
+    
+    # Load the exported coefficients, which need no sklearn; fall back
+    # to unpickling the sklearn model
+    model_path = app.config['LINEAR_MODEL_PATH']
+    if os.path.exists(model_path):
+        loaded = LinearGoalsModel.load(model_path)
+    else:
+        model_path = app.config['MODEL_PATH']
+        if not os.path.exists(model_path):
+            logger.error(f"Model file not found at {model_path}")
+            return None, None
+        import joblib
+        loaded = joblib.load(model_path)
+    return loaded, f"file-{os.stat(model_path).st_mtime_ns}"
+
+def set_model(new_model, version):
+    """Swap in a new model and rebuild everything derived from it"""
+    global model, model_version, fixture_matrix
+    with elo_lock:
+        snapshot = elo_snapshot
+        matrix = build_fixture_matrix(new_model, snapshot) if snapshot is not None else None
+        # In-flight requests finish with the model they started with
+        model = new_model
+        model_version = version
+        fixture_matrix = matrix
+        if snapshot is not None:
+            prediction_cache.invalidate((snapshot.version, model_version))
+    logger.info(f"Serving model version {version}")
+
+def sync_model():
+    """Pick up a model version activated in the registry since the last check"""
+    global model_registry_stamp
+    stamp = model_registry.stamp()
+    if stamp is None or stamp == model_registry_stamp:
+        return
+    # One request per worker loads the new version; others keep serving the old one
+    if not model_lock.acquire(blocking=False):
+        return
+    try:
+        version = model_registry.current()
+        if version != model_version:
+            arrays, metadata = model_registry.load(version)
+            if arrays is not None:
+                set_model(LinearGoalsModel.from_arrays(arrays, metadata['features'], metadata.get('link', 'identity')), version)
+        model_registry_stamp = stamp
+    except Exception as e:
+        logger.error(f"Error loading model version from registry: {e}")
+    finally:
+        model_lock.release()
+
+def start_elo_refresher(last_refresh):
+    """Start refreshing ELO data in the background"""
+    global elo_refresher
+    elo_refresher = EloRefresher(
+        fetch=get_elo_data,
+        publish=set_elo_data,
+        ttl=app.config['ELO_REFRESH_TTL'],
+        store=elo_store,
+        retry_delay=app.config['ELO_REFRESH_RETRY'],
+        max_backoff=app.config['ELO_REFRESH_MAX_BACKOFF'],
+        last_refresh=last_refresh
+    ).start()
 
 def initialize_app():
     """Initialize the application by loading model and data"""
-    global model, elo_data, match_data
+    global model, model_version, model_registry_stamp, match_data, head_to_head
     
     try:
+        # Heavy modules only needed here are imported on first use
+        from src.data_loading import load_match_data
+        from src.head_to_head import build_head_to_head
+
         # Load model
-        model_path = app.config['MODEL_PATH']
-        if not os.path.exists(model_path):
-            logger.error(f"Model file not found at {model_path}")
+        model_registry_stamp = model_registry.stamp()
+        model, model_version = load_model()
+        if model is None:
             return False
-            
-        model = joblib.load(model_path)
-        logger.info("Model loaded successfully")
+        logger.info(f"Model version {model_version} loaded successfully")
         
-        # Load ELO data
-        elo_data = get_elo_data()
-        if elo_data is None:
+        # Load the last good ELO data so startup never waits on clubelo.com
+        last_refresh = load_stored_elo_data()
+        background = app.config['ELO_REFRESH_TTL'] > 0
+        if not background:
+            # No background refresher: fetch now, keeping stored data as a fallback
+            fetched = get_elo_data()
+            if fetched is not None:
+                publish_elo_data(fetched)
+        if elo_snapshot is not None:
+            logger.info("ELO data loaded successfully")
+        elif not background:
             logger.error("Failed to load ELO data")
             return False
-        logger.info("ELO data loaded successfully")
+        else:
+            logger.warning("No stored ELO data, waiting for the first background refresh")
+        
+        if background:
+            start_elo_refresher(last_refresh)
         
         # Load match data
         match_data = load_match_data()
         if match_data is None:
             logger.error("Failed to load match data")
             return False
+        head_to_head = build_head_to_head(match_data)
+        if head_to_head is None:
+            logger.error("Failed to build head-to-head index")
+            return False
         logger.info("Match data loaded successfully")
                 
         return True
@@ -60,16 +255,155 @@ def initialize_app():
         logger.error(f"Error during initialization: {str(e)}")
         return False
 
-# Initialize the app
-if not initialize_app():
-    logger.error("Failed to initialize application")
-    # Don't raise an exception, let the app start anyway
+def warm_up():
+    """Load the model and data; /readyz reports ready once this succeeds"""
+    global warmup_state, warmup_seconds
+    started = time.perf_counter()
+    ok = initialize_app()
+    warmup_seconds = time.perf_counter() - started
+    if ok:
+        logger.info(f"Warm-up finished in {warmup_seconds:.2f}s")
+    else:
+        logger.error("Failed to initialize application")
+        # Don't raise an exception, let the app start anyway
+    warmup_state = 'ready' if ok else 'failed'
+    return ok
+
+def start_warm_up():
+    """
+    Run the warm-up as configured by APP_WARMUP: 'background' (default) so
+    the worker answers health checks straight away, 'sync' to finish before
+    the import returns, or 'off' to leave calling warm_up() to the caller.
+    """
+    mode = app.config['APP_WARMUP']
+    if mode == 'background':
+        threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+    elif mode == 'sync':
+        warm_up()
+
+# Initialize the app; a job child spawned while app.py runs as a script
+# imports it again as __mp_main__ and needs no warm-up
+if __name__ != '__mp_main__':
+    start_warm_up()
+
+# Endpoints served before warm-up has finished
+WARMUP_EXEMPT = {'healthz', 'readyz', 'metrics', 'static'}
+
+# Registered first so the profile covers the other hooks too
+@app.before_request
+def start_profile():
+    """Profile this request if asked to by header or query parameter, or sampled"""
+    if request_profiler.enabled and request_profiler.wanted(
+            request.headers.get('X-Profile') or request.args.get('profile')):
+        g.profile = request_profiler.start()
+
+@app.after_request
+def finish_profile(response):
+    started = g.pop('profile', None)
+    if started is not None:
+        snapshot = elo_snapshot
+        name = request_profiler.finish(started, request.url_rule.rule if request.url_rule else 'unmatched', {
+            'method': request.method,
+            'path': request.full_path,
+            'status': response.status_code,
+            'body': request.get_json(silent=True),
+            'elo_version': snapshot.version if snapshot is not None else None,
+            'model_version': model_version
+        })
+        if name is not None:
+            response.headers['X-Profile-Id'] = name
+    return response
+
+@app.teardown_request
+def discard_profile(exc):
+    """Stop a profile left running by an unhandled exception"""
+    started = g.pop('profile', None)
+    if started is not None:
+        started[0].disable()
+
+@app.before_request
+def start_request_timer():
+    """Time the request and attribute its stage timings to the route"""
+    if metrics.registry.enabled:
+        g.request_started = time.perf_counter()
+        metrics.set_route(request.url_rule.rule if request.url_rule else 'unmatched')
+
+@app.after_request
+def record_request_time(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        labels = (('method', request.method), ('route', route), ('status', str(response.status_code)))
+        metrics.registry.observe('request_duration_seconds', labels, time.perf_counter() - started)
+    return response
+
+@app.before_request
+def refresh_shared_state():
+    """Keep this worker on the latest ELO version written by any worker"""
+    if request.endpoint in WARMUP_EXEMPT:
+        return None
+    if warmup_state == 'pending':
+        if request.endpoint == 'index':
+            return render_template('error.html', error="The app is starting up, please try again shortly"), 503
+        return jsonify({'error': 'Service is warming up'}), 503
+    sync_model()
+    sync_elo_data()
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: the model and data are loaded and predictions can be served"""
+    snapshot = elo_snapshot
+    checks = {
+        'model': model is not None,
+        'elo_data': snapshot is not None,
+        'match_data': head_to_head is not None
+    }
+    ready = warmup_state == 'ready' and all(checks.values())
+    body = {
+        'ready': ready,
+        'warmup': warmup_state,
+        'warmup_seconds': round(warmup_seconds, 3) if warmup_seconds is not None else None,
+        'elo_version': snapshot.version if snapshot is not None else None,
+        'model_version': model_version,
+        'checks': checks
+    }
+    return jsonify(body), 200 if ready else 503
+
+def collect_app_metrics():
+    """Prediction cache counters and the versions of the data being served"""
+    stats = prediction_cache.stats()
+    snapshot = elo_snapshot
+    yield 'prediction_cache_hits_total', 'counter', 'Prediction cache hits', [((), stats['hits'])]
+    yield 'prediction_cache_misses_total', 'counter', 'Prediction cache misses', [((), stats['misses'])]
+    yield 'prediction_cache_evictions_total', 'counter', 'Prediction cache evictions', [((), stats['evictions'])]
+    yield 'prediction_cache_entries', 'gauge', 'Entries in the prediction cache', [((), stats['size'])]
+    yield 'elo_version', 'gauge', 'Version of the ELO snapshot being served', \
+        [((), snapshot.version if snapshot is not None else 0)]
+    if snapshot is not None and snapshot.timestamp is not None:
+        yield 'elo_fetched_timestamp_seconds', 'gauge', 'When the ELO data being served was fetched', \
+            [((), snapshot.timestamp.timestamp())]
+    yield 'model_info', 'gauge', 'Model version being served', [((('version', model_version or ''),), 1)]
+    yield 'ready', 'gauge', 'Whether warm-up has finished successfully', [((), int(warmup_state == 'ready'))]
+
+metrics.registry.add_collector(collect_app_metrics)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics for this worker process"""
+    if not metrics.registry.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
     """Render the home page"""
     try:
-        teams = get_team_list(elo_data) if elo_data is not None else pd.DataFrame()
+        teams = get_team_list(elo_snapshot.to_dataframe()) if elo_snapshot is not None else None
         return render_template('index.html', teams=teams)
     except Exception as e:
         logger.error(f"Error rendering index page: {str(e)}")
@@ -87,46 +421,284 @@ def predict():
         if not home_team or not away_team:
             return jsonify({'error': 'Missing team data'}), 400
             
-        # Get prediction
-        prediction = predict_match(model, home_team, away_team, custom_elos)
+        # Read one snapshot for the whole request
+        snapshot = elo_snapshot
+        matrix = fixture_matrix
+        
+        # Cached results are keyed on the ratings actually used, so custom
+        # ELO requests share entries with identical ratings
+        cache_key = None
+        started = metrics.start()
+        if snapshot is not None:
+            generation = (snapshot.version, model_version)
+            home_elo, away_elo = resolve_elos(home_team, away_team, custom_elos, snapshot.ratings)
+            if home_elo is not None and away_elo is not None:
+                cache_key = (home_team, away_team, float(home_elo), float(away_elo), model_version)
+                cached = prediction_cache.get(cache_key, generation)
+                metrics.lap('cache_lookup', started)
+                if cached is not None:
+                    return jsonify(cached)
+            
+        # Use the precomputed fixture matrix unless custom ELOs were given
+        prediction = None
+        if not custom_elos and matrix is not None and snapshot is not None:
+            started = metrics.start()
+            prediction = matrix.lookup(home_team, away_team, snapshot.version)
+            metrics.lap('fixture_matrix', started)
+        if prediction is None:
+            prediction = predict_match(model, home_team, away_team, custom_elos, snapshot=snapshot)
         if prediction is None:
             return jsonify({'error': 'Failed to generate prediction'}), 500
             
         # Get previous matchups
-        matchups = print_previous_matchups(match_data, home_team, away_team)
+        matchups = print_previous_matchups(head_to_head, home_team, away_team)
         prediction['previous_matchups'] = matchups
         
+        if cache_key is not None:
+            prediction_cache.put(cache_key, prediction, generation)
         return jsonify(prediction)
         
     except Exception as e:
         logger.error(f"Error in predict route: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/predict/cache', methods=['GET'])
+def predict_cache_stats():
+    """Report prediction cache hit, miss and eviction counters"""
+    return jsonify(prediction_cache.stats())
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Handle prediction requests for a list of fixtures"""
+    try:
+        data = request.get_json()
+        fixtures = data.get('fixtures')
+        custom_elos = data.get('custom_elos')
+        
+        if not fixtures or not all(
+            isinstance(fixture, dict) and fixture.get('home_team') and fixture.get('away_team')
+            for fixture in fixtures
+        ):
+            return jsonify({'error': 'Missing fixture data'}), 400
+            
+        # Score every fixture with a single model call
+        predictions = predict_matches(model, fixtures, custom_elos, snapshot=elo_snapshot)
+        if predictions is None:
+            return jsonify({'error': 'Failed to generate predictions'}), 500
+            
+        return jsonify({'predictions': predictions})
+        
+    except Exception as e:
+        logger.error(f"Error in predict_batch route: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def simulation_options(data):
+    """
+    Validate a season simulation request.
+    
+    Returns:
+        (keyword arguments for simulate_season, None) or (None, error message)
+    """
+    if not isinstance(data, dict):
+        return None, 'Missing fixture data'
+    fixtures = data.get('fixtures')
+    if not isinstance(fixtures, list) or not fixtures or not all(
+        isinstance(fixture, dict) and fixture.get('home_team') and fixture.get('away_team')
+        for fixture in fixtures
+    ):
+        return None, 'Missing fixture data'
+    try:
+        n_sims = int(data.get('n_sims', app.config['SIMULATION_DEFAULT_SIMS']))
+    except (TypeError, ValueError):
+        return None, 'n_sims must be an integer'
+    if not 1 <= n_sims <= app.config['SIMULATION_MAX_SIMS']:
+        return None, f"n_sims must be between 1 and {app.config['SIMULATION_MAX_SIMS']}"
+    seed = data.get('seed')
+    if seed is not None:
+        try:
+            seed = int(seed)
+        except (TypeError, ValueError):
+            return None, 'seed must be an integer'
+        if seed < 0:
+            return None, 'seed must not be negative'
+    table = data.get('table')
+    if table is not None:
+        try:
+            table = {
+                team: {field: float(row.get(field, 0)) for field in ('points', 'goal_diff', 'goals_for')}
+                for team, row in table.items()
+            }
+        except (AttributeError, TypeError, ValueError):
+            return None, 'table must map teams to numeric points, goal_diff and goals_for'
+    return {
+        'fixtures': fixtures,
+        'table': table,
+        'n_sims': n_sims,
+        'seed': seed,
+        'processes': app.config['SIMULATION_PROCESSES']
+    }, None
+
+@app.route('/simulate', methods=['POST'])
+def simulate():
+    """Handle season simulation requests for a list of remaining fixtures"""
+    try:
+        options, error = simulation_options(request.get_json(silent=True))
+        if error:
+            return jsonify({'error': error}), 400
+            
+        result = simulate_season(model, snapshot=elo_snapshot, **options)
+        if result is None:
+            return jsonify({'error': 'Failed to simulate season'}), 500
+            
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error in simulate route: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/update_elo', methods=['POST'])
 def update_elo():
     """Handle ELO update requests"""
     try:
-        # Get new ELO data
-        new_elo_data = get_elo_data()
-        if new_elo_data is None:
-            return jsonify({'error': 'Failed to update ELO data'}), 500
-            
-        # Update global variable
-        global elo_data
-        elo_data = new_elo_data
+        refreshing = False
+        if elo_refresher is not None:
+            # Let the background refresher do the fetch; answer with the
+            # current data if it takes longer than ELO_REFRESH_WAIT
+            before = elo_snapshot.version if elo_snapshot is not None else 0
+            finished = elo_refresher.refresh_now(timeout=app.config['ELO_REFRESH_WAIT'])
+            after = elo_snapshot.version if elo_snapshot is not None else 0
+            refreshing = not finished
+            if finished and after == before:
+                return jsonify({'error': 'Failed to update ELO data'}), 500
+            if elo_snapshot is None:
+                return jsonify({'error': 'ELO data is still loading', 'refreshing': True}), 503
+        else:
+            # Scrape as an elo_refresh job rather than in the request, and
+            # answer with the current data if it takes longer than
+            # ELO_REFRESH_WAIT; the job can be followed under /jobs
+            job = job_queue.submit('elo_refresh')
+            if job is None:
+                return jsonify({'error': 'Too many jobs queued, try again later'}), 429
+            job_id = job['id']
+            finished = job_queue.wait(job_id, timeout=app.config['ELO_REFRESH_WAIT'])
+            refreshing = finished is None
+            if finished is not None and finished['status'] != SUCCEEDED:
+                return jsonify({'error': 'Failed to update ELO data', 'job_id': job_id}), 500
+            if elo_snapshot is None:
+                return jsonify({'error': 'ELO data is still loading', 'refreshing': True, 'job_id': job_id}), 503
         
         # Get updated team list
-        team_list = get_team_list(elo_data)
+        snapshot = elo_snapshot
+        team_list = get_team_list(snapshot.to_dataframe())
         
-        return jsonify({
+        response = {
             'success': True,
+            'refreshing': refreshing,
             'team_list': team_list.to_dict('records'),
-            'last_update': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
+            'elo_version': snapshot.version,
+            'last_update': snapshot.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if elo_refresher is None:
+            response['job_id'] = job_id
+        return jsonify(response)
         
     except Exception as e:
         logger.error(f"Error in update_elo route: {e}")
         return jsonify({'error': str(e)}), 500
 
+def elo_refresh_job(params, progress):
+    """Fetch and publish new ELO data"""
+    progress(0.1, 'Fetching ELO data')
+    before = elo_snapshot.version if elo_snapshot is not None else 0
+    if elo_refresher is not None:
+        # Share the refresher's fetch rather than scraping twice
+        elo_refresher.refresh_now()
+    else:
+        new_elo_data = get_elo_data()
+        if new_elo_data is None:
+            raise RuntimeError('Failed to fetch ELO data')
+        progress(0.6, 'Publishing ELO data')
+        publish_elo_data(new_elo_data)
+    snapshot = elo_snapshot
+    if snapshot is None or snapshot.version == before:
+        raise RuntimeError('Failed to update ELO data')
+    return {
+        'elo_version': snapshot.version,
+        'teams': len(snapshot),
+        'last_update': snapshot.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def simulation_job(params, progress):
+    """Season simulation, as /simulate"""
+    options, error = simulation_options(params)
+    if error:
+        raise ValueError(error)
+    progress(0.1, f"Simulating {options['n_sims']} seasons")
+    result = simulate_season(model, snapshot=elo_snapshot, **options)
+    if result is None:
+        raise RuntimeError('Failed to simulate season')
+    return result
+
+job_queue.register('elo_refresh', elo_refresh_job)
+# CPU-bound: each runs in its own child process, away from request threads
+job_queue.register('retrain', partial(retrain_job, registry_dir=app.config['MODEL_REGISTRY_DIR'],
+                                      workers=app.config['JOB_PROCESSES']), process=True)
+job_queue.register('backtest', partial(backtest_job, registry_dir=app.config['MODEL_REGISTRY_DIR'],
+                                       model_path=app.config['LINEAR_MODEL_PATH'],
+                                       workers=app.config['JOB_PROCESSES']), process=True)
+job_queue.register('simulation', simulation_job)
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Start a long-running job and return its ID straight away"""
+    try:
+        data = request.get_json(silent=True) or {}
+        kind = data.get('kind')
+        params = data.get('params') or {}
+        if kind not in job_queue.kinds():
+            return jsonify({'error': f"kind must be one of: {', '.join(job_queue.kinds())}"}), 400
+        if not isinstance(params, dict):
+            return jsonify({'error': 'params must be an object'}), 400
+            
+        job = job_queue.submit(kind, params)
+        if job is None:
+            return jsonify({'error': 'Too many jobs queued, try again later'}), 429
+            
+        return jsonify({
+            'job_id': job['id'],
+            'status': job['status'],
+            'status_url': url_for('job_status', job_id=job['id']),
+            'result_url': url_for('job_result', job_id=job['id'])
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error in submit_job route: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """Recently submitted jobs, newest first"""
+    return jsonify({'jobs': job_queue.recent(), 'queue': job_queue.stats()})
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Status and progress of a job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Result of a finished job (202 while it is still queued or running)"""
+    job = job_queue.get(job_id, with_result=True)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] not in FINISHED:
+        return jsonify({'job_id': job_id, 'status': job['status'], 'progress': job['progress']}), 202
+    if job['status'] != SUCCEEDED:
+        return jsonify({'job_id': job_id, 'status': job['status'], 'error': job['error']}), 500
+    return jsonify({'job_id': job_id, 'status': job['status'], 'result': job['result']})
+
 if __name__ == '__main__':
     app.run(debug=True)
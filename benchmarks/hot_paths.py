@@ -0,0 +1,325 @@
+"""
+Offline benchmark suite for the prediction hot paths.
+
+Times the prediction, data loading and ELO parsing functions (the fast
+parser and exported model next to the BeautifulSoup and scikit-learn
+versions they replaced) and the /predict and /update_elo routes (through
+the Flask test client, with the clubelo.com fetch replaced by the
+checked-in HTML fixtures), so no network is needed. Results are per-call
+times in microseconds; the best of several repeats is compared against a
+JSON baseline and anything slower than the threshold is flagged as a
+regression.
+
+Every run also times a fixed reference workload. Baseline times are scaled
+by how much faster or slower that workload ran, so a busy or slower machine
+does not show up as a regression everywhere (--raw compares unscaled times).
+
+Usage:
+    python benchmarks/hot_paths.py                  # run and compare with the baseline
+    python benchmarks/hot_paths.py --save           # run and store the results as the baseline
+    python benchmarks/hot_paths.py --only predict --threshold 0.1
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Import the app without its warm-up; the suite sets up its own state
+os.environ['APP_WARMUP'] = 'off'
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baselines', 'hot_paths.json')
+# Flag a benchmark when its best time is this fraction slower than the baseline
+DEFAULT_THRESHOLD = 0.25
+# Each repeat runs the benchmark for at least this many seconds
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_REPEAT = 5
+
+ENG_FIXTURE = os.path.join(ROOT, 'data', 'fixtures', 'clubelo_ENG.html')
+RANKING_FIXTURE = os.path.join(ROOT, 'data', 'fixtures', 'clubelo_Ranking.html')
+HOME_TEAM = 'Liverpool'
+AWAY_TEAM = 'Arsenal'
+
+class FixtureFetcher:
+    """Stands in for HttpFetcher, answering every request with a saved page"""
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            self.text = f.read()
+
+    def get(self, url):
+        from src.http_fetch import FetchResult
+        return FetchResult(url, 200, self.text)
+
+def build_benchmarks(workdir):
+    """
+    Load the app state the benchmarks run against (model, ELO snapshot,
+    match data) with every file the app writes redirected to workdir.
+
+    Returns:
+        List of (name, func, setup): setup, if not None, runs once before
+        func is timed
+    """
+    import warnings
+    import joblib
+    import pandas as pd
+    import app as app_module
+    from src.data_loading import load_match_data, merge_data
+    from src.data_scraping import get_elo_data, parse_elo_html
+    from src.head_to_head import build_head_to_head
+    from src.jobs import JobQueue
+    from src.linear_model import LinearGoalsModel
+    from src.model_registry import ModelRegistry
+    from src.prediction import get_team_list, predict_match, print_betting_odds, print_previous_matchups
+    from src.shared_elo import SharedEloStore
+
+    sklearn_model = joblib.load(app_module.app.config['MODEL_PATH'])
+    # sklearn warns on every call about the missing feature names
+    warnings.filterwarnings('ignore', category=UserWarning, module='sklearn')
+
+    eng_fetcher = FixtureFetcher(ENG_FIXTURE)
+    ranking_fetcher = FixtureFetcher(RANKING_FIXTURE)
+    ranking_html = ranking_fetcher.text
+
+    # What warm_up() loads, without clubelo.com and without touching the
+    # real shared ELO store, job database or model registry
+    app_module.elo_store = SharedEloStore(os.path.join(workdir, 'elo_snapshot.json'))
+    app_module.elo_store_stamp = None
+    job_queue = JobQueue(os.path.join(workdir, 'jobs.sqlite3'))
+    for kind in app_module.job_queue.kinds():
+        job_queue.register(kind, app_module.job_queue._handlers[kind],
+                           process=kind in app_module.job_queue._in_process)
+    app_module.job_queue = job_queue
+    app_module.model_registry = ModelRegistry(os.path.join(workdir, 'registry'))
+    app_module.model_registry_stamp = app_module.model_registry.stamp()
+    app_module.model = LinearGoalsModel.load(app_module.app.config['LINEAR_MODEL_PATH'])
+    app_module.model_version = 'benchmark'
+    app_module.get_elo_data = lambda: get_elo_data(fetcher=eng_fetcher)
+    app_module.publish_elo_data(app_module.get_elo_data())
+    app_module.match_data = load_match_data()
+    app_module.head_to_head = build_head_to_head(app_module.match_data)
+    app_module.warmup_state = 'ready'
+
+    model = app_module.model
+    snapshot = app_module.elo_snapshot
+    head_to_head = app_module.head_to_head
+    elo_df = snapshot.to_dataframe()
+    elo_diff = snapshot.get(HOME_TEAM) - snapshot.get(AWAY_TEAM)
+    history = load_match_data(seasons=None)
+    merge_elo = pd.DataFrame({
+        'team': elo_df['Team'].str.strip().str.replace(' ', '').str.lower(),
+        'elorating': elo_df['Elo']
+    })
+
+    client = app_module.app.test_client()
+    fixture = {'home_team': HOME_TEAM, 'away_team': AWAY_TEAM}
+
+    def use_prediction_cache():
+        app_module.prediction_cache.invalidate((app_module.elo_snapshot.version, app_module.model_version))
+
+    def bypass_prediction_cache():
+        # Lookups for any other generation miss, so every request is computed
+        app_module.prediction_cache.invalidate(('benchmark', time.time()))
+
+    def post(path, **kwargs):
+        response = client.post(path, **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.get_data(as_text=True)}")
+
+    features = [[snapshot.get(HOME_TEAM), snapshot.get(AWAY_TEAM)]]
+
+    return [
+        ('model.predict (numpy)', lambda: model.predict(features), None),
+        ('model.predict (sklearn)', lambda: sklearn_model.predict(features), None),
+        ('predict_match', lambda: predict_match(model, HOME_TEAM, AWAY_TEAM, snapshot=snapshot), None),
+        ('print_previous_matchups', lambda: print_previous_matchups(head_to_head, HOME_TEAM, AWAY_TEAM), None),
+        ('print_betting_odds', lambda: print_betting_odds(elo_diff), None),
+        ('load_match_data', load_match_data, None),
+        ('load_match_data (all seasons)', lambda: load_match_data(seasons=None), None),
+        ('get_team_list', lambda: get_team_list(elo_df), None),
+        ('merge_data (all seasons)', lambda: merge_data(history, merge_elo), None),
+        ('get_elo_data (ENG page)', lambda: get_elo_data(fetcher=eng_fetcher), None),
+        ('get_elo_data (ranking page)', lambda: get_elo_data(fetcher=ranking_fetcher), None),
+        ('parse_elo_html (fast)', lambda: parse_elo_html(ranking_html, parser='fast'), None),
+        ('parse_elo_html (soup)', lambda: parse_elo_html(ranking_html, parser='soup'), None),
+        ('POST /predict (cached)', lambda: post('/predict', json=fixture), use_prediction_cache),
+        ('POST /predict (uncached)', lambda: post('/predict', json=fixture), bypass_prediction_cache),
+        ('POST /update_elo', lambda: post('/update_elo'), None),
+    ]
+
+def measure(func, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    """
+    Time func in repeat batches of at least min_time seconds each.
+
+    Returns:
+        Dictionary with best and median per-call time in microseconds and
+        the number of calls per batch
+    """
+    func()  # warm caches and lazy imports outside the timing
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+    times = [elapsed / number] + [t / number for t in timer.repeat(repeat - 1, number)]
+    return {
+        'best_us': min(times) * 1e6,
+        'median_us': statistics.median(times) * 1e6,
+        'number': number,
+        'repeat': repeat
+    }
+
+def reference_workload():
+    """Fixed interpreter-bound work used to calibrate for machine speed"""
+    total = 0
+    for i in range(2000):
+        total += i * i % 7
+    return json.loads(json.dumps({'values': list(range(200)), 'total': total}))
+
+def run_benchmarks(only=None, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    """
+    Run every benchmark whose name contains one of only (all by default).
+
+    Returns:
+        {name: result from measure()} in suite order
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, func, setup in build_benchmarks(workdir):
+            if only and not any(part in name for part in only):
+                continue
+            if setup is not None:
+                setup()
+            results[name] = measure(func, min_time, repeat)
+    return results
+
+def environment():
+    """Where the numbers were taken; baselines only compare like with like"""
+    import numpy as np
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count()
+    }
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_baseline(path, results, reference):
+    """Write results as the baseline (temp file + rename)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    baseline = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': environment(),
+        'reference': reference,
+        'results': results
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, reference=None):
+    """
+    Compare best times against a baseline.
+
+    Args:
+        reference: This run's reference workload result; if given, baseline
+            times are scaled by its speed relative to the baseline's
+
+    Returns:
+        List of (name, baseline_us, current_us, change, status) where change
+        is the relative difference and status is 'regression', 'faster',
+        'ok' or 'new'
+    """
+    previous = baseline.get('results', {}) if baseline else {}
+    scale = 1.0
+    if reference and baseline and baseline.get('reference'):
+        scale = reference['best_us'] / baseline['reference']['best_us']
+    rows = []
+    for name, result in results.items():
+        if name not in previous:
+            rows.append((name, None, result['best_us'], None, 'new'))
+            continue
+        before = previous[name]['best_us'] * scale
+        change = result['best_us'] / before - 1
+        status = 'regression' if change > threshold else 'faster' if change < -threshold else 'ok'
+        rows.append((name, before, result['best_us'], change, status))
+    return rows
+
+def format_time(us):
+    if us is None:
+        return '-'
+    if us >= 1e6:
+        return f"{us / 1e6:.2f} s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f} ms"
+    return f"{us:.1f} us"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown flagged as a regression (default %(default)s)")
+    parser.add_argument('--only', action='append', help="run benchmarks whose name contains this (repeatable)")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--raw', action='store_true', help="compare without scaling for machine speed")
+    args = parser.parse_args()
+
+    # The timed functions log every call; keep the report readable
+    logging.disable(logging.INFO)
+    reference = measure(reference_workload, args.min_time, args.repeat)
+    results = run_benchmarks(args.only, args.min_time, args.repeat)
+
+    if args.output:
+        save_baseline(args.output, results, reference)
+    if args.save:
+        save_baseline(args.baseline, results, reference)
+        print(f"Saved {len(results)} results to {args.baseline}")
+
+    baseline = None if args.save else load_baseline(args.baseline)
+    rows = compare(results, baseline, args.threshold, None if args.raw else reference)
+    if baseline and baseline.get('reference') and not args.raw:
+        speed = baseline['reference']['best_us'] / reference['best_us']
+        print(f"Machine speed relative to the baseline: {speed:.2f}x (baseline times scaled to match)\n")
+    print(f"{'benchmark':<32} {'baseline':>10} {'best':>10} {'median':>10} {'change':>8}")
+    for name, before, best, change, status in rows:
+        flag = {'regression': '  REGRESSION', 'faster': '  faster'}.get(status, '')
+        change_text = f"{change * 100:+7.1f}%" if change is not None else '       -'
+        print(f"{name:<32} {format_time(before):>10} {format_time(best):>10} "
+              f"{format_time(results[name]['median_us']):>10} {change_text}{flag}")
+
+    if baseline is None:
+        return 0
+    if baseline.get('environment') != environment():
+        print("\nNote: baseline was recorded in a different environment; compare with care")
+    regressions = [row[0] for row in rows if row[4] == 'regression']
+    if regressions:
+        print(f"\nFAIL: {len(regressions)} regression(s) over {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+        return 1
+    print("\nOK")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Import-time benchmark for the web app.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter with the
+warm-up disabled, prints the slowest modules and fails if importing the app
+takes longer than the budget. The warm-up (model, ELO and match data) is
+not part of the import and is reported by /readyz instead.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 500] [--top 15] [--module app]
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+# Cumulative import time of `app` we aim to stay under, in milliseconds
+DEFAULT_BUDGET_MS = 500
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def measure_imports(module='app'):
+    """
+    Import module in a fresh interpreter under -X importtime.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in import order
+    """
+    env = dict(os.environ, APP_WARMUP='off')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+def total_ms(rows, module='app'):
+    """Cumulative import time of the top-level module, in milliseconds"""
+    for name, _, cumulative_us, depth in rows:
+        if name == module and depth == 0:
+            return cumulative_us / 1000
+    raise ValueError(f"{module} not found in importtime output")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--module', default='app')
+    args = parser.parse_args()
+
+    rows = measure_imports(args.module)
+    total = total_ms(rows, args.module)
+
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:8.1f}  {'  ' * depth}{name}")
+
+    heavy = [name for name in ('pandas', 'sklearn', 'bs4', 'requests', 'flask_sqlalchemy')
+             if any(row[0] == name for row in rows)]
+    print(f"\nimport {args.module}: {total:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if heavy:
+        print(f"heavy modules imported eagerly: {', '.join(heavy)}")
+    if total > args.budget_ms:
+        print("FAIL: over budget")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,6 +6,12 @@ load_dotenv()
 class Config:
     # Model path - use absolute path for Heroku
     MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'elo_model.pkl')
+    # Exported coefficients of the same model, served without sklearn when present
+    LINEAR_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'elo_model.npz')
+    # Versioned models published by src/model_training.register_model; the
+    # active version takes precedence over the two files above
+    MODEL_REGISTRY_DIR = os.environ.get(
+        'MODEL_REGISTRY_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'registry'))
     
     # Static files path
     STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
@@ -13,6 +19,69 @@ class Config:
     # Data directory
     DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
     
+    # Startup - model and data are loaded by a warm-up phase after import:
+    # 'background' (serve /healthz meanwhile), 'sync' (block the import) or
+    # 'off' (the caller runs app.warm_up())
+    APP_WARMUP = os.environ.get('APP_WARMUP', 'background')
+    
+    # Database - Heroku still hands out postgres:// URLs, which SQLAlchemy rejects
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', '').replace('postgres://', 'postgresql://', 1) or None
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # ELO refresh - ratings are refetched in the background once older than the TTL
+    # (0 disables the background refresher)
+    ELO_REFRESH_TTL = int(os.environ.get('ELO_REFRESH_TTL', 3600))
+    ELO_REFRESH_RETRY = int(os.environ.get('ELO_REFRESH_RETRY', 30))
+    ELO_REFRESH_MAX_BACKOFF = int(os.environ.get('ELO_REFRESH_MAX_BACKOFF', 1800))
+    # Seconds /update_elo waits for a refresh before answering with current data
+    ELO_REFRESH_WAIT = float(os.environ.get('ELO_REFRESH_WAIT', 5))
+    
+    # clubelo.com fetching - conditional GETs revalidate against this response cache
+    HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'cache', 'http')
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 3.05))
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 10))
+    HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', 3))
+    
+    # Last good ELO data, shared by all workers and used to start up without
+    # waiting on clubelo.com
+    ELO_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'cache', 'elo_snapshot.json')
+    
+    # Season simulation (/simulate)
+    SIMULATION_DEFAULT_SIMS = int(os.environ.get('SIMULATION_DEFAULT_SIMS', 10000))
+    SIMULATION_MAX_SIMS = int(os.environ.get('SIMULATION_MAX_SIMS', 200000))
+    SIMULATION_PROCESSES = int(os.environ.get('SIMULATION_PROCESSES', 1))
+    
+    # /predict result cache - cleared whenever the ELO snapshot or model changes
+    # (TTL in seconds, 0 for no expiry)
+    PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 1024))
+    PREDICTION_CACHE_TTL = int(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+    
+    # Prometheus metrics at /metrics - request and per-stage latency histograms
+    # plus cache, scrape and data version counters (0 disables the timers)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') not in ('0', 'false', 'False', '')
+    
+    # Request profiling - when enabled, requests sent with the X-Profile header
+    # or ?profile=1 (equal to PROFILE_TOKEN if one is set) and one in every
+    # PROFILE_SAMPLE_RATE requests (0 for none) run under cProfile, and the
+    # newest PROFILE_KEEP profiles are kept in PROFILE_DIR
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') not in ('0', 'false', 'False', '')
+    PROFILE_SAMPLE_RATE = int(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN') or None
+    PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'profiles')
+    PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 200))
+    
+    # Background jobs (/jobs) - ELO refresh, retraining, backtests and simulations
+    # run on JOB_WORKERS threads per worker process with at most JOB_MAX_PENDING
+    # queued; the job table is shared by all workers and finished jobs are
+    # kept for JOB_RETENTION seconds. Retraining and backtests each run in a
+    # child process of their own, which spreads its folds over JOB_PROCESSES
+    # processes.
+    JOB_DB_PATH = os.environ.get('JOB_DB_PATH', os.path.join(DATA_DIR, 'cache', 'jobs.sqlite3'))
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', 16))
+    JOB_RETENTION = int(os.environ.get('JOB_RETENTION', 86400))
+    JOB_PROCESSES = int(os.environ.get('JOB_PROCESSES', 1))
+    
     # Heroku specific settings
     SESSION_COOKIE_SECURE = True
     REMEMBER_COOKIE_SECURE = True
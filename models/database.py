@@ -1,33 +1,103 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import insert, select, func, and_
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.dialects import postgresql, sqlite
 
 db = SQLAlchemy()
 migrate = Migrate()
 
+def utcnow():
+    """
+    Current time as naive UTC. Timestamp columns are naive DateTimes that
+    always hold UTC, so every write and every age comparison uses this.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class Team(db.Model):
     __tablename__ = 'teams'
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
     elo_ratings = db.relationship('EloRating', backref='team', lazy=True)
     
     def __repr__(self):
         return f'<Team {self.name}>'
+    
+    @classmethod
+    def get_or_create_ids(cls, names):
+        """
+        Return {name: id} for the given team names, inserting any missing
+        teams in a single statement.
+        """
+        names = list(dict.fromkeys(names))
+        ids = dict(db.session.execute(select(cls.name, cls.id).where(cls.name.in_(names))).all())
+        missing = [name for name in names if name not in ids]
+        if missing:
+            rows = [{'name': name, 'created_at': utcnow()} for name in missing]
+            dialect = db.session.get_bind().dialect.name
+            if dialect == 'postgresql':
+                stmt = postgresql.insert(cls).on_conflict_do_nothing(index_elements=['name'])
+            elif dialect == 'sqlite':
+                stmt = sqlite.insert(cls).on_conflict_do_nothing(index_elements=['name'])
+            else:
+                stmt = insert(cls)
+            db.session.execute(stmt, rows)
+            # Another writer may have inserted some of them first; read back all new IDs
+            ids.update(db.session.execute(select(cls.name, cls.id).where(cls.name.in_(missing))).all())
+        return ids
 
 class EloRating(db.Model):
     __tablename__ = 'elo_ratings'
+    __table_args__ = (
+        db.Index('ix_elo_ratings_team_id_last_update', 'team_id', 'last_update'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
-    last_update = db.Column(db.DateTime, default=datetime.utcnow)
+    last_update = db.Column(db.DateTime, default=utcnow)
     
     def __repr__(self):
         return f'<EloRating {self.rating} for {self.team.name}>'
     
     @classmethod
-    def get_latest_ratings(cls):
-        """Get the most recent rating for each team"""
-        return cls.query.order_by(cls.team_id, cls.last_update.desc()).distinct(cls.team_id).all() 
\ No newline at end of file
+    def get_latest_ratings(cls, team_ids=None):
+        """
+        Get the most recent rating for each team, with its team loaded.
+        
+        Works on SQLite and Postgres: a per-team MAX(last_update) subquery
+        (served by the (team_id, last_update) index) joined back to the
+        ratings and teams in one query. Pass team_ids to limit the teams.
+        """
+        latest = select(cls.team_id, func.max(cls.last_update).label('last_update'))
+        if team_ids is not None:
+            latest = latest.where(cls.team_id.in_(list(team_ids)))
+        latest = latest.group_by(cls.team_id).subquery()
+        query = (
+            select(cls)
+            .join(latest, and_(cls.team_id == latest.c.team_id, cls.last_update == latest.c.last_update))
+            .join(cls.team)
+            .options(contains_eager(cls.team))
+            .order_by(cls.team_id, cls.id.desc())
+        )
+        # Ratings written with the same timestamp tie; keep the last inserted
+        ratings = {}
+        for rating in db.session.execute(query).scalars():
+            ratings.setdefault(rating.team_id, rating)
+        return list(ratings.values())
+    
+    @classmethod
+    def get_rating_history(cls, team_id, start=None, end=None):
+        """
+        Get a team's ratings between start and end (inclusive) in time order,
+        as (last_update, rating) rows. Served by the (team_id, last_update) index.
+        """
+        query = select(cls.last_update, cls.rating).where(cls.team_id == team_id)
+        if start is not None:
+            query = query.where(cls.last_update >= start)
+        if end is not None:
+            query = query.where(cls.last_update <= end)
+        return db.session.execute(query.order_by(cls.last_update, cls.id)).all()
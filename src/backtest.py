@@ -0,0 +1,243 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.linear_model import LinearGoalsModel
+from src.model_registry import ModelRegistry
+from src.model_search import (
+    FEATURE_CACHE_DIR, build_feature_cache, load_feature_array, default_candidates,
+    fit_candidate, compile_candidate, outcome_probabilities, match_outcomes, log_loss, brier_score
+)
+from src.prediction import betting_odds
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Width of the calibration buckets is 1 / CALIBRATION_BINS
+CALIBRATION_BINS = 10
+DEFAULT_CANDIDATE = 'linear()/raw_elo'
+
+def score_season(expected, goals, ratings, stake=1.0, min_edge=0.0):
+    """
+    Score one season of predictions in a single vectorised pass.
+
+    Args:
+        expected: (n, 2) expected goals
+        goals: (n, 2) actual goals
+        ratings: (n, 2) pre-match home/away ELO, which price the
+            print_betting_odds market the bets are placed against
+        stake: Stake per bet
+        min_edge: Minimum expected value (probability * odds - 1) to bet
+
+    Returns:
+        Dictionary of sums (log loss, Brier, bets, profit, calibration
+        counts) so seasons can be combined exactly
+    """
+    n = len(goals)
+    probs = outcome_probabilities(expected)
+    outcome = match_outcomes(goals)
+
+    # Bookmaker prices and their normalised implied probabilities as a baseline
+    odds = np.column_stack(betting_odds(ratings[:, 0] - ratings[:, 1]))
+    with np.errstate(divide='ignore'):
+        implied = np.where(np.isfinite(odds), 1 / odds, 0.0)
+    implied = implied / implied.sum(axis=1, keepdims=True)
+
+    # One bet per match on the outcome with the best expected value, if above the edge
+    with np.errstate(invalid='ignore'):
+        value = np.where(np.isfinite(odds), probs * odds - 1, -np.inf)
+    pick = value.argmax(axis=1)
+    rows = np.arange(n)
+    bet = value[rows, pick] > min_edge
+    won = bet & (pick == outcome)
+    profit = np.where(won, stake * (odds[rows, pick] - 1), -stake)[bet].sum()
+
+    bins = np.minimum((probs * CALIBRATION_BINS).astype(int), CALIBRATION_BINS - 1).ravel()
+    observed = np.eye(3)[outcome].ravel()
+    return {
+        'matches': int(n),
+        'log_loss': float(log_loss(probs, outcome).sum()),
+        'brier': float(brier_score(probs, outcome).sum()),
+        'baseline_log_loss': float(log_loss(implied, outcome).sum()),
+        'bets': int(bet.sum()),
+        'bets_won': int(won.sum()),
+        'staked': float(stake * bet.sum()),
+        'profit': float(profit),
+        'calibration': {
+            'count': np.bincount(bins, minlength=CALIBRATION_BINS).tolist(),
+            'predicted': np.bincount(bins, weights=probs.ravel(), minlength=CALIBRATION_BINS).tolist(),
+            'observed': np.bincount(bins, weights=observed, minlength=CALIBRATION_BINS).tolist()
+        }
+    }
+
+def _summarise(sums):
+    """Turn summed season scores into means and rates"""
+    matches = max(sums['matches'], 1)
+    return {
+        'matches': sums['matches'],
+        'log_loss': sums['log_loss'] / matches,
+        'brier': sums['brier'] / matches,
+        'baseline_log_loss': sums['baseline_log_loss'] / matches,
+        'bets': sums['bets'],
+        'hit_rate': sums['bets_won'] / sums['bets'] if sums['bets'] else None,
+        'profit': sums['profit'],
+        'roi': sums['profit'] / sums['staked'] if sums['staked'] else None
+    }
+
+def backtest_season(feature_dir, season, candidate=None, model=None, stake=1.0, min_edge=0.0):
+    """
+    Predict and score one season. A candidate is trained on every earlier
+    season only; a fixed model is used as it is.
+    """
+    season_index = load_feature_array(feature_dir, 'season')
+    rows = season_index == season
+    if candidate is not None:
+        train = season_index < season
+        X = load_feature_array(feature_dir, f"X_{candidate['features']}")
+        y = load_feature_array(feature_dir, 'y')
+        model = compile_candidate(candidate, *fit_candidate(candidate, X[train], y[train]))
+    ratings = load_feature_array(feature_dir, 'raw')[rows]
+    goals = load_feature_array(feature_dir, 'y')[rows]
+    return season, score_season(model.predict(ratings), goals, ratings, stake, min_edge)
+
+def run_backtest(data, candidate=None, model=None, min_train_seasons=5, workers=None,
+                 stake=1.0, min_edge=0.0, cache_dir=FEATURE_CACHE_DIR, progress=None):
+    """
+    Walk-forward backtest over every season of the match history, using the
+    pre-match ELO ratings in data (see src.historical_elo). Seasons run in
+    parallel across processes.
+
+    Args:
+        data: Training frame from historical_elo_features
+        candidate: Model search candidate retrained before each season on
+            earlier seasons only (leakage-free)
+        model: Fixed model to evaluate instead, e.g. a registry version;
+            it may have been trained on the seasons it is scored on
+        min_train_seasons: Seasons used for training before the first
+            scored season (0 scores every season with a fixed model)
+        progress: Called as progress(done, total) as seasons finish
+
+    Returns:
+        Report with per-season and overall log loss, Brier score, bookmaker
+        baseline log loss, betting hit rate, profit and ROI, and calibration
+        buckets
+    """
+    if (candidate is None) == (model is None):
+        raise ValueError("Pass exactly one of candidate or model")
+    feature_dir, seasons = build_feature_cache(data, cache_dir)
+    test_seasons = list(range(min_train_seasons, len(seasons)))
+    tasks = [(feature_dir, season, candidate, model, stake, min_edge) for season in test_seasons]
+
+    workers = workers or os.cpu_count() or 1
+    results = []
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            for result in pool.map(backtest_season, *zip(*tasks)):
+                results.append(result)
+                if progress is not None:
+                    progress(len(results), len(tasks))
+    else:
+        for task in tasks:
+            results.append(backtest_season(*task))
+            if progress is not None:
+                progress(len(results), len(tasks))
+
+    totals = {key: 0 for key in ('matches', 'log_loss', 'brier', 'baseline_log_loss', 'bets', 'bets_won', 'staked', 'profit')}
+    calibration = {key: np.zeros(CALIBRATION_BINS) for key in ('count', 'predicted', 'observed')}
+    per_season = []
+    for season, sums in results:
+        for key in totals:
+            totals[key] += sums[key]
+        for key in calibration:
+            calibration[key] += sums['calibration'][key]
+        per_season.append(dict(_summarise(sums), season=seasons[season]))
+
+    buckets = []
+    for i in range(CALIBRATION_BINS):
+        count = int(calibration['count'][i])
+        buckets.append({
+            'range': [i / CALIBRATION_BINS, (i + 1) / CALIBRATION_BINS],
+            'count': count,
+            'predicted': calibration['predicted'][i] / count if count else None,
+            'observed': calibration['observed'][i] / count if count else None
+        })
+    return {
+        'model': candidate['name'] if candidate is not None else 'fixed',
+        'seasons': per_season,
+        'overall': _summarise(totals),
+        'calibration': buckets
+    }
+
+def format_report(report):
+    """Render a backtest report as text"""
+    def pct(value):
+        return f"{value * 100:7.2f}%" if value is not None else '      -'
+    lines = [f"Backtest of {report['model']}", "",
+             f"{'season':<9} {'matches':>7} {'log loss':>9} {'book':>7} {'brier':>7} {'bets':>5} {'hit':>8} {'roi':>8}"]
+    for row in report['seasons'] + [dict(report['overall'], season='overall')]:
+        lines.append(
+            f"{row['season']:<9} {row['matches']:>7} {row['log_loss']:9.4f} {row['baseline_log_loss']:7.4f} "
+            f"{row['brier']:7.4f} {row['bets']:>5} {pct(row['hit_rate'])} {pct(row['roi'])}"
+        )
+    lines += ["", f"{'bucket':<11} {'count':>6} {'predicted':>10} {'observed':>9}"]
+    for bucket in report['calibration']:
+        low, high = bucket['range']
+        lines.append(f"{low:.1f}-{high:.1f}    {bucket['count']:>6} {pct(bucket['predicted']):>10} {pct(bucket['observed']):>9}")
+    return '\n'.join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest over the full match history")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--candidate', default=None,
+                        help=f"model search candidate retrained each season (default {DEFAULT_CANDIDATE})")
+    source.add_argument('--model', help="fixed LinearGoalsModel .npz to evaluate")
+    source.add_argument('--registry-version', help="fixed registry version to evaluate")
+    parser.add_argument('--registry', default='models/registry')
+    parser.add_argument('--min-train-seasons', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--min-edge', type=float, default=0.0, help="minimum expected value to place a bet")
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    candidate = model = None
+    if args.model:
+        model = LinearGoalsModel.load(args.model)
+    elif args.registry_version:
+        arrays, metadata = ModelRegistry(args.registry).load(args.registry_version, mmap=False)
+        if arrays is None:
+            print(f"Unknown model version {args.registry_version}")
+            return 1
+        model = LinearGoalsModel.from_arrays(arrays, metadata['features'], metadata.get('link', 'identity'))
+    else:
+        name = args.candidate or DEFAULT_CANDIDATE
+        candidate = next((c for c in default_candidates() if c['name'] == name), None)
+        if candidate is None:
+            print(f"Unknown candidate {name}; choose from: {', '.join(c['name'] for c in default_candidates())}")
+            return 1
+
+    from src.historical_elo import historical_elo_features
+    started = time.perf_counter()
+    data = historical_elo_features()
+    if data is None:
+        print("Could not build match data")
+        return 1
+    report = run_backtest(data, candidate=candidate, model=model, min_train_seasons=args.min_train_seasons,
+                          workers=args.workers, min_edge=args.min_edge)
+    print(format_report(report))
+    print(f"\nBacktested {len(report['seasons'])} seasons in {time.perf_counter() - started:.1f}s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,45 @@
+import os
 import sys
+import numpy as np
 import pandas as pd
 import logging
 
+from src.match_cache import load_compiled_matches
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def load_match_data():
+# Match results and their compiled columnar copy, relative to the project
+# root so the cache is shared whatever the working directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MATCH_CSV = os.path.join(ROOT, 'data', 'raw', 'englandcsv.csv')
+MATCH_CACHE_DIR = os.path.join(ROOT, 'data', 'cache', 'matches')
+
+def load_match_data(seasons=('2023/24', '2024/25')):
     """
     Load and preprocess match data from CSV file.
+    Pass seasons=None to keep the full match history.
+    
+    The CSV is compiled once into int-coded NumPy columns under
+    data/cache/matches and reloaded from there until the CSV changes.
     """
     try:
-        datafile = 'data/raw/england.csv'
-        df = pd.read_csv(datafile)
-        # Rename columns for consistency
-        df = df.rename(columns={
-            'Date': 'date',
-            'FTHG': 'fth_goals',
-            'FTAG': 'fta_goals',
-            'FTR': 'ft_result',
-            'Season': 'season',
-            'HomeTeam': 'home_team',
-            'AwayTeam': 'away_team'
+        arrays, teams, all_seasons = load_compiled_matches(MATCH_CSV, MATCH_CACHE_DIR)
+        
+        # Filter for the requested seasons (2023/24 and 2024/25 by default)
+        if seasons is not None:
+            wanted = [code for code, season in enumerate(all_seasons) if season in seasons]
+            rows = np.flatnonzero(np.isin(arrays['season'], wanted))
+            arrays = {name: values[rows] for name, values in arrays.items()}
+        
+        # Keep only necessary columns: team names (already standardized), season, scores
+        df = pd.DataFrame({
+            'season': pd.Categorical.from_codes(arrays['season'], categories=all_seasons),
+            'home_team': pd.Categorical.from_codes(arrays['home_team'], categories=teams),
+            'away_team': pd.Categorical.from_codes(arrays['away_team'], categories=teams),
+            'fth_goals': np.asarray(arrays['fth_goals']),
+            'fta_goals': np.asarray(arrays['fta_goals'])
         })
-        # Filter for seasons 2023/24 and 2024/25
-        df = df[(df['season'] == '2023/24') | (df['season'] == '2024/25')]
-        # Keep only necessary columns: team names, season, scores
-        df = df[['season', 'home_team', 'away_team', 'fth_goals', 'fta_goals']]
-        # Standardize team names
-        df['home_team'] = df['home_team'].str.strip().str.replace(' ', '').str.lower()
-        df['away_team'] = df['away_team'].str.strip().str.replace(' ', '').str.lower()
         return df
     except Exception as e:
         logger.error(f"Error in load_match_data: {e}")
@@ -55,6 +66,10 @@ def load_elo_data():
 def merge_data(match_df, elo_df):
     """
     Merge match data with Elo data for home and away teams.
+    
+    Every match gets today's rating, which postdates it; for training use
+    src.historical_elo.historical_elo_features, which gives each match the
+    ratings from before kick-off.
     """
     try:
         if match_df is None or elo_df is None:
@@ -1,6 +1,4 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from html import unescape
 import re
 from datetime import datetime
 import os
@@ -14,75 +12,210 @@ logger = logging.getLogger(__name__)
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.database import db, Team, EloRating
 from config import Config
-from flask import Flask
+from src import metrics
 
-def get_elo_data():
+# pandas, requests, BeautifulSoup and the database stack are imported where
+# they are used, so importing this module (and the app) stays cheap
+
+ELO_URL = "http://clubelo.com/ENG"
+
+# Shared fetcher (pooled session + response cache) and the last parsed
+# DataFrame per URL, reused when the server answers 304 Not Modified
+_fetcher = None
+_parsed = {}
+
+def get_fetcher():
+    """Return the process-wide HttpFetcher, creating it on first use"""
+    global _fetcher
+    if _fetcher is None:
+        from src.http_fetch import HttpFetcher
+        _fetcher = HttpFetcher(
+            cache_dir=Config.HTTP_CACHE_DIR,
+            timeout=(Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT),
+            retries=Config.HTTP_RETRIES
+        )
+    return _fetcher
+
+def get_elo_data(url=ELO_URL, fetcher=None):
     """
     Scrape ELO data from clubelo.com and return as DataFrame
     """
-    url = "http://clubelo.com/ENG"
+    stage = 'fetch'
     try:
         logger.info("Fetching data from clubelo.com...")
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        logger.info("Parsing HTML content...")
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all table rows
-        rows = soup.find_all('tr')
+        started = metrics.start()
+        response = (fetcher or get_fetcher()).get(url)
+        started = metrics.lap('scrape_fetch', started)
         
-        teams = []
-        elos = []
-        seen_teams = set()  # Keep track of teams we've already processed
+        # Nothing changed since the last fetch: skip parsing entirely
+        if response.not_modified and url in _parsed:
+            logger.info("ELO page not modified, reusing parsed data")
+            return _parsed[url].copy()
         
-        # Loop through rows to find team data
-        for row in rows:
-            # Check if row contains team data (has a small tag with a number)
-            small_tag = row.find('small')
-            if small_tag and small_tag.text.strip().isdigit():
-                # Get team name from the first link in the row
-                team_link = row.find('a')
-                if team_link:
-                    team_name = team_link.text.strip()
-                    # Skip if we've already seen this team
-                    if team_name in seen_teams:
-                        continue
-                    seen_teams.add(team_name)
-                    # Get ELO score from the right-aligned cell
-                    elo_td = row.find('td', class_='r')
-                    if elo_td:
-                        elo_score = elo_td.text.strip()
-                        teams.append(team_name)
-                        elos.append(elo_score)
-                        logger.info(f"Found team: {team_name} with ELO: {elo_score}")
-        
-        if not teams or not elos:
-            logger.error("No team data found in the table")
-            raise ValueError("No team data found in the table.")
-            
-        df_elo = pd.DataFrame({
-            "Team": teams,
-            "Elo": elos
-        })
-        
-        # Clean up ELO scores
-        df_elo["Elo"] = df_elo["Elo"].apply(lambda x: int(re.sub(r"[^\d]", "", x)))
-        logger.info("Successfully created DataFrame with ELO data")
-        return df_elo
+        stage = 'parse'
+        df_elo = parse_elo_html(response.text)
+        metrics.lap('scrape_parse', started)
+        _parsed[url] = df_elo
+        return df_elo.copy()
         
     except Exception as e:
+        metrics.registry.inc('scrape_failures_total', (('stage', stage),))
         logger.error(f"Error scraping ELO data: {str(e)}")
         return None
 
+# Tokens for the fast ranking-page parser
+_SKIP_RE = re.compile(r'<!--.*?-->|<(script|style)\b.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+# Quoted attribute values may contain '>', so they are consumed whole
+_TAG_RE = re.compile(r'<(/?)([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+# One attribute per match, name then optional value, so a name is only ever
+# matched at the start of an attribute (never inside data-class or a value)
+_ATTR_RE = re.compile(r'([^\s"\'>/=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+# Elements looked up in each row: first <small>, first <a>, first <td class="r">
+_ROW_TARGETS = {'small': 0, 'a': 1, 'td': 2}
+
+def _classes(attrs):
+    """Return the classes in a tag's attribute string; the last class attribute wins, as in BeautifulSoup"""
+    classes = ''
+    for name, double, single, bare in _ATTR_RE.findall(attrs):
+        if name.lower() == 'class':
+            classes = double or single or bare
+    return classes.split()
+
+def _fast_rows(html):
+    """
+    Streaming tokenizer for clubelo ranking pages.
+    
+    For every <tr> it records the text of the first <small>, the first <a>
+    and the first <td class="r"> inside it - the same elements the
+    BeautifulSoup parser looks up - without building a document tree.
+    Returns (small, a, td.r) text per row, None where the element is missing.
+    """
+    html = _SKIP_RE.sub('', html)
+    rows = []
+    open_rows = []
+    capturing = 0  # number of (row, element) pairs currently collecting text
+    pos = 0
+    for match in _TAG_RE.finditer(html):
+        if capturing:
+            data = html[pos:match.start()]
+            if data:
+                for text, depth, _ in open_rows:
+                    for slot in range(3):
+                        if depth[slot]:
+                            text[slot].append(data)
+        pos = match.end()
+        
+        closing, tag, attrs = match.groups()
+        tag = tag.lower()
+        if tag == 'tr':
+            if closing:
+                if open_rows:
+                    _, depth, _ = open_rows.pop()
+                    capturing -= sum(1 for d in depth if d)
+            else:
+                row = ([None, None, None], [0, 0, 0], None)
+                rows.append(row[0])
+                open_rows.append(row)
+            continue
+        slot = _ROW_TARGETS.get(tag)
+        if slot is None or not open_rows:
+            continue
+        for text, depth, _ in open_rows:
+            if closing:
+                if depth[slot]:
+                    depth[slot] -= 1
+                    if not depth[slot]:
+                        capturing -= 1
+            elif depth[slot]:
+                depth[slot] += 1
+            elif text[slot] is None:
+                if slot == 2 and 'r' not in _classes(attrs):
+                    continue
+                text[slot] = []
+                depth[slot] = 1
+                capturing += 1
+    
+    return [
+        tuple(unescape(''.join(text)) if text is not None else None for text in row)
+        for row in rows
+    ]
+
+def _soup_rows(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    # Find all table rows
+    for row in soup.find_all('tr'):
+        small_tag = row.find('small')
+        team_link = row.find('a')
+        elo_td = row.find('td', class_='r')
+        rows.append((
+            small_tag.text if small_tag else None,
+            team_link.text if team_link else None,
+            elo_td.text if elo_td else None
+        ))
+    return rows
+
+def parse_elo_html(html, parser='fast'):
+    """
+    Parse a clubelo.com ranking page into a DataFrame with 'Team' and 'Elo' columns
+    
+    Args:
+        html: Page source
+        parser: 'fast' for the streaming tokenizer, 'soup' for BeautifulSoup;
+            both produce the same DataFrame
+    """
+    import pandas as pd
+    logger.info("Parsing HTML content...")
+    rows = _fast_rows(html) if parser == 'fast' else _soup_rows(html)
+    
+    teams = []
+    elos = []
+    seen_teams = set()  # Keep track of teams we've already processed
+    
+    # Loop through rows to find team data
+    for small_text, link_text, elo_text in rows:
+        # Check if row contains team data (has a small tag with a number)
+        if small_text is not None and small_text.strip().isdigit():
+            # Get team name from the first link in the row
+            if link_text is not None:
+                team_name = link_text.strip()
+                # Skip if we've already seen this team
+                if team_name in seen_teams:
+                    continue
+                seen_teams.add(team_name)
+                # Get ELO score from the right-aligned cell
+                if elo_text is not None:
+                    elo_score = elo_text.strip()
+                    teams.append(team_name)
+                    elos.append(elo_score)
+                    logger.debug(f"Found team: {team_name} with ELO: {elo_score}")
+    
+    if not teams or not elos:
+        logger.error("No team data found in the table")
+        raise ValueError("No team data found in the table.")
+        
+    df_elo = pd.DataFrame({
+        "Team": teams,
+        "Elo": elos
+    })
+    
+    # Clean up ELO scores
+    df_elo["Elo"] = df_elo["Elo"].apply(lambda x: int(re.sub(r"[^\d]", "", x)))
+    logger.info(f"Successfully created DataFrame with ELO data for {len(df_elo)} teams")
+    return df_elo
+
 def save_elo_data(elo_df):
     """
     Save ELO data to database
     """
+    from flask import Flask
+    from sqlalchemy import insert
+    from models.database import db, Team, EloRating, utcnow
     try:
         logger.info("Saving ELO data to database...")
+        started = metrics.start()
         
         # Create Flask app context
         app = Flask(__name__)
@@ -90,28 +223,34 @@ def save_elo_data(elo_df):
         db.init_app(app)
         
         with app.app_context():
-            # Start a transaction
-            for _, row in elo_df.iterrows():
-                team_name = row['Team']
-                rating = row['Elo']
-                
-                # Get or create team
-                team = Team.query.filter_by(name=team_name).first()
-                if not team:
-                    team = Team(name=team_name)
-                    db.session.add(team)
-                    db.session.flush()  # Get the team ID without committing
-                
-                # Create new ELO rating
-                elo_rating = EloRating(team_id=team.id, rating=rating)
-                db.session.add(elo_rating)
+            # Resolve every team ID, creating missing teams in one statement
+            team_ids = Team.get_or_create_ids(elo_df['Team'].tolist())
+            
+            # Only write ratings that changed since the latest stored one
+            latest = {
+                rating.team_id: rating.rating
+                for rating in EloRating.get_latest_ratings(team_ids=team_ids.values())
+            }
+            
+            # Insert all ratings with a single executemany, stamped with one time
+            last_update = utcnow()
+            rows = []
+            for team_name, rating in zip(elo_df['Team'], elo_df['Elo']):
+                team_id = team_ids[team_name]
+                if latest.get(team_id) != int(rating):
+                    rows.append({'team_id': team_id, 'rating': int(rating), 'last_update': last_update})
+                    latest[team_id] = int(rating)
+            if rows:
+                db.session.execute(insert(EloRating), rows)
             
             # Commit all changes at once
             db.session.commit()
-            logger.info("Successfully saved ELO data to database")
+            metrics.lap('db_write', started)
+            logger.info(f"Successfully saved ELO data to database ({len(rows)} changed ratings)")
             
     except Exception as e:
         db.session.rollback()
+        metrics.registry.inc('db_write_failures_total')
         logger.error(f"Error saving ELO data: {str(e)}")
         raise
 
@@ -119,6 +258,9 @@ def load_latest_elo_data():
     """
     Load the latest ELO data from the database
     """
+    import pandas as pd
+    from flask import Flask
+    from models.database import db, EloRating
     try:
         # Create Flask app and initialize database
         app = Flask(__name__)
@@ -157,6 +299,8 @@ def update_elo_data():
     Main function to update ELO data
     Scrapes new data and saves it to database
     """
+    from flask import Flask
+    from models.database import db
     try:
         # Create Flask app and initialize database
         app = Flask(__name__)
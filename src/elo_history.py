@@ -0,0 +1,104 @@
+import os
+import sys
+import logging
+from datetime import timedelta
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.database import db, Team, EloRating, utcnow
+from config import Config
+from flask import Flask
+from sqlalchemy import select, delete
+
+def _db_app():
+    """Create a Flask app bound to the configured database"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+    return app
+
+def _bucket(last_update, now, daily_after, weekly_after):
+    """
+    Return the downsampling bucket for a rating, or None if it is recent
+    enough to keep at full resolution.
+    """
+    age = now - last_update
+    if age > weekly_after:
+        year, week, _ = last_update.isocalendar()
+        return ('week', year, week)
+    if age > daily_after:
+        return ('day', last_update.date())
+    return None
+
+def compact_elo_history(now=None, daily_after_days=30, weekly_after_days=365, batch_size=1000):
+    """
+    Downsample old ELO history: keep the last rating per team per day once
+    it is older than daily_after_days, and per ISO week once older than
+    weekly_after_days. Rows are deleted in batches of batch_size, one
+    transaction per batch. A team's latest rating is always kept.
+    Times are naive UTC, like the stored timestamps.
+
+    Returns:
+        Number of rows deleted
+    """
+    now = now or utcnow()
+    daily_after = timedelta(days=daily_after_days)
+    weekly_after = timedelta(days=weekly_after_days)
+    cutoff = now - daily_after
+
+    app = _db_app()
+    with app.app_context():
+        try:
+            # Newest first within each team, so the first row seen per bucket is kept
+            query = (
+                select(EloRating.id, EloRating.team_id, EloRating.last_update)
+                .where(EloRating.last_update < cutoff)
+                .order_by(EloRating.team_id, EloRating.last_update.desc(), EloRating.id.desc())
+            )
+            kept = set()
+            doomed = []
+            for rating_id, team_id, last_update in db.session.execute(query).yield_per(batch_size):
+                key = (team_id, _bucket(last_update, now, daily_after, weekly_after))
+                if key in kept:
+                    doomed.append(rating_id)
+                else:
+                    kept.add(key)
+
+            for start in range(0, len(doomed), batch_size):
+                batch = doomed[start:start + batch_size]
+                db.session.execute(delete(EloRating).where(EloRating.id.in_(batch)))
+                db.session.commit()
+
+            logger.info(f"Compacted ELO history: deleted {len(doomed)} rows, kept {len(kept)} buckets")
+            return len(doomed)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error compacting ELO history: {str(e)}")
+            raise
+
+def load_rating_history(team_name, start=None, end=None):
+    """
+    Load a team's rating trajectory between start and end as a DataFrame
+    with 'last_update' and 'Elo' columns, or None if the team is unknown.
+    """
+    try:
+        app = _db_app()
+        with app.app_context():
+            team_id = db.session.execute(select(Team.id).where(Team.name == team_name)).scalar()
+            if team_id is None:
+                logger.info(f"No ELO history for {team_name}")
+                return None
+            rows = EloRating.get_rating_history(team_id, start, end)
+            return pd.DataFrame(rows, columns=['last_update', 'Elo'])
+    except Exception as e:
+        logger.error(f"Error loading ELO history for {team_name}: {str(e)}")
+        return None
+
+if __name__ == "__main__":
+    deleted = compact_elo_history()
+    print(f"\nDeleted {deleted} old ELO ratings.")
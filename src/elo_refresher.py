@@ -0,0 +1,139 @@
+import time
+import random
+import logging
+import threading
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class EloRefresher:
+    """
+    Keeps ELO data fresh from a background thread.
+
+    The current snapshot keeps being served while a refresh runs; a new one
+    is only published once a fetch succeeds. Failed fetches are retried with
+    jittered exponential backoff.
+
+    With a SharedEloStore, refreshes in different worker processes are
+    serialised on the store's refresh lock. A worker that finds the store was
+    refreshed recently adopts that version instead of fetching again, so
+    one fetch serves every worker.
+    """
+    def __init__(self, fetch, publish, ttl, store=None,
+                 retry_delay=30, max_backoff=1800, last_refresh=None):
+        """
+        Args:
+            fetch: Callable returning a Team/Elo DataFrame or None on failure
+            publish: Callable receiving (elo_df, version, fetched_at) for each
+                new snapshot; version is None when there is no store
+            ttl: Seconds a successful refresh stays fresh
+            store: SharedEloStore persisting the last good data, if any
+            retry_delay: First retry delay after a failure, in seconds
+            max_backoff: Upper bound on the retry delay, in seconds
+            last_refresh: Epoch time the current data was fetched, if known
+        """
+        self.fetch = fetch
+        self.publish = publish
+        self.ttl = ttl
+        self.store = store
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+
+        self.last_success = last_refresh
+        self.last_error = None
+        self.failures = 0
+
+        # refresh_now() bumps _requested; the refresher thread snapshots it
+        # when an attempt starts and stores it in _served when it ends, so a
+        # caller waits for a forced attempt that began after its request
+        self._requested = 0
+        self._served = 0
+        self._wake = threading.Event()
+        self._attempt_done = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start the refresher thread (a daemon, so it never blocks shutdown)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='elo-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def refresh_now(self, timeout=None):
+        """
+        Ask for an immediate refresh and wait up to timeout seconds for it.
+
+        Returns:
+            True if a forced refresh attempt started after this call and
+            finished within the timeout
+        """
+        with self._attempt_done:
+            self._requested += 1
+            target = self._requested
+            self._wake.set()
+            return self._attempt_done.wait_for(lambda: self._served >= target, timeout)
+
+    def next_delay(self):
+        """Seconds until the next scheduled refresh attempt"""
+        if self.failures:
+            backoff = min(self.max_backoff, self.retry_delay * 2 ** (self.failures - 1))
+            return backoff * random.uniform(0.5, 1.0)
+        if self.last_success is None:
+            return 0
+        return max(0, self.ttl - (time.time() - self.last_success))
+
+    def refresh_once(self, force=False):
+        """
+        Fetch and publish new ELO data once; returns True on success.
+        Unless forced, a store refreshed within the TTL is adopted as is.
+        """
+        requested_at = time.time()
+        try:
+            if self.store is None:
+                elo_df = self._fetch()
+                version = None
+                fetched_at = time.time()
+            else:
+                # The fetch runs under the refresh lock only; the store's
+                # write lock is held just for the write itself
+                with self.store.refresh_lock():
+                    elo_df, version, fetched_at = self.store.read()
+                    fresh_after = requested_at if force else requested_at - self.ttl
+                    if elo_df is None or fetched_at < fresh_after:
+                        elo_df = self._fetch()
+                        fetched_at = time.time()
+                        with self.store.lock():
+                            version = self.store.write(elo_df, fetched_at)
+                    else:
+                        logger.info(f"Adopting ELO data version {version} refreshed by another worker")
+            self.publish(elo_df, version, fetched_at)
+            self.last_success = fetched_at
+            self.last_error = None
+            self.failures = 0
+            logger.info("ELO data refreshed")
+            return True
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            logger.error(f"ELO refresh failed (attempt {self.failures}): {e}")
+            return False
+
+    def _fetch(self):
+        elo_df = self.fetch()
+        if elo_df is None or elo_df.empty:
+            raise ValueError("fetch returned no ELO data")
+        return elo_df
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.next_delay())
+            self._wake.clear()
+            with self._attempt_done:
+                requested = self._requested
+                force = requested > self._served
+            try:
+                self.refresh_once(force=force)
+            finally:
+                with self._attempt_done:
+                    self._served = requested
+                    self._attempt_done.notify_all()
@@ -0,0 +1,56 @@
+import logging
+from datetime import datetime
+from types import MappingProxyType
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class EloSnapshot:
+    """
+    Immutable set of ELO ratings taken at one point in time.
+
+    Holds a team -> rating mapping for lookups plus parallel NumPy arrays
+    for vectorised work, stamped with a version number and timestamp.
+    """
+    __slots__ = ('ratings', 'teams', 'elos', 'version', 'timestamp')
+
+    def __init__(self, teams, elos, version, timestamp=None):
+        teams = np.array(teams, dtype=object)
+        elos = np.array(elos, dtype=float)
+        teams.flags.writeable = False
+        elos.flags.writeable = False
+        object.__setattr__(self, 'teams', teams)
+        object.__setattr__(self, 'elos', elos)
+        object.__setattr__(self, 'ratings', MappingProxyType(dict(zip(teams.tolist(), elos.tolist()))))
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'timestamp', timestamp or datetime.now())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("EloSnapshot is immutable")
+
+    def __len__(self):
+        return len(self.teams)
+
+    def __repr__(self):
+        return f'<EloSnapshot v{self.version} ({len(self)} teams) at {self.timestamp:%Y-%m-%d %H:%M:%S}>'
+
+    def get(self, team):
+        """Return the rating for a team, or None if it is not in the snapshot"""
+        return self.ratings.get(team)
+
+    def to_dataframe(self):
+        """Return the ratings as a DataFrame with 'Team' and 'Elo' columns"""
+        import pandas as pd
+        return pd.DataFrame({
+            "Team": self.teams.tolist(),
+            "Elo": self.elos.astype(int)
+        })
+
+    @classmethod
+    def from_dataframe(cls, elo_df, version, timestamp=None):
+        """
+        Build a snapshot from a DataFrame with 'Team' and 'Elo' columns,
+        as returned by get_elo_data.
+        """
+        return cls(elo_df['Team'].tolist(), elo_df['Elo'].to_numpy(dtype=float), version, timestamp)
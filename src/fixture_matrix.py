@@ -0,0 +1,109 @@
+import logging
+import numpy as np
+
+from src.prediction import get_team_list, outcome_probabilities, market_odds, format_betting_odds
+from src.scorelines import format_markets
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Per-pair values stored in the matrix, in storage order
+FIELDS = (
+    'home_score', 'away_score', 'home_prob', 'draw_prob', 'away_prob',
+    'elo_diff', 'odds_home', 'odds_draw', 'odds_away'
+)
+
+class FixtureMatrix:
+    """
+    Dense table of predictions for every ordered pair of teams.
+    Entry [i, j] holds team i at home to team j, computed for one ELO version;
+    markets[i][j] holds the rendered scoreline markets for the same pair.
+    """
+    def __init__(self, teams, values, version, markets=None):
+        self.teams = list(teams)
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.values = values
+        self.version = version
+        self.markets = markets
+
+    def lookup(self, home_team, away_team, version):
+        """
+        Return the prediction for a fixture, or None if either team is unknown
+        or the matrix was built for a different ELO version.
+        """
+        if version != self.version:
+            return None
+        i = self.index.get(home_team)
+        j = self.index.get(away_team)
+        if i is None or j is None or i == j:
+            return None
+
+        row = self.values[i, j]
+        (home_score, away_score, home_prob, draw_prob, away_prob,
+         elo_diff, odds_home, odds_draw, odds_away) = row.tolist()
+        result = {
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_score': home_score,
+            'away_score': away_score,
+            'home_prob': home_prob,
+            'draw_prob': draw_prob,
+            'away_prob': away_prob,
+            'elo_diff': elo_diff,
+            'betting_odds': format_betting_odds(odds_home, odds_draw, odds_away)
+        }
+        if self.markets is not None:
+            result['markets'] = self.markets[i][j]
+        return result
+
+def build_fixture_matrix(model, snapshot):
+    """
+    Precompute predictions for all ordered pairs of Premier League teams.
+
+    Args:
+        model: The trained model
+        snapshot: EloSnapshot the matrix is built from; its version is
+            stamped on the matrix
+
+    Returns:
+        FixtureMatrix, or None if it could not be built
+    """
+    try:
+        version = snapshot.version
+        # Team selection comes from the DataFrame view, but the ratings are
+        # read from snapshot.ratings (unrounded), as predict_match does
+        teams = get_team_list(snapshot.to_dataframe())['Team'].tolist()
+        elos = np.array([snapshot.ratings[team] for team in teams], dtype=float)
+        n = len(teams)
+        if n < 2:
+            logger.error("Not enough teams to build fixture matrix")
+            return None
+
+        # Every (home, away) combination as one feature matrix
+        home_elo = np.repeat(elos, n)
+        away_elo = np.tile(elos, n)
+        features = np.column_stack([home_elo, away_elo])
+
+        prediction = np.asarray(model.predict(features))
+        home_score = np.round(prediction[:, 0], 1)
+        away_score = np.round(prediction[:, 1], 1)
+        home_prob, draw_prob, away_prob, markets = outcome_probabilities(prediction[:, 0], prediction[:, 1])
+        elo_diff = home_elo - away_elo
+        odds_home, odds_draw, odds_away = market_odds(markets)
+
+        values = np.stack([
+            home_score, away_score, home_prob, draw_prob, away_prob,
+            elo_diff, odds_home, odds_draw, odds_away
+        ], axis=1).reshape(n, n, len(FIELDS))
+        # A team never plays itself
+        values[np.arange(n), np.arange(n)] = np.nan
+        market_table = [
+            [format_markets(markets, i * n + j) if i != j else None for j in range(n)]
+            for i in range(n)
+        ]
+
+        logger.info(f"Built fixture matrix for {n} teams (ELO version {version})")
+        return FixtureMatrix(teams, values, version, market_table)
+    except Exception as e:
+        logger.error(f"Error building fixture matrix: {str(e)}")
+        return None
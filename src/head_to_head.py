@@ -0,0 +1,104 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from src.match_cache import TEAM_ALIASES
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# One row per match: season code, home team code, away team code, goals
+MATCH_DTYPE = np.dtype([
+    ('season', np.int16),
+    ('home', np.int16),
+    ('away', np.int16),
+    ('home_goals', np.int8),
+    ('away_goals', np.int8)
+])
+
+def canonical_team(name):
+    """
+    Standardise a team name the same way load_match_data does.
+    """
+    name = name.strip().replace(' ', '').lower()
+    return TEAM_ALIASES.get(name, name)
+
+class HeadToHeadIndex:
+    """
+    Previous matches grouped by unordered team pair.
+
+    Teams and seasons are stored once as lookup lists; each pair maps to a
+    compact structured array of its matches in the original data order.
+    """
+    def __init__(self, teams, seasons, pairs):
+        self.teams = teams
+        self.seasons = seasons
+        self.pairs = pairs
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def lookup(self, home_team, away_team):
+        """Return the matches played between two teams, in either direction"""
+        key = tuple(sorted((canonical_team(home_team), canonical_team(away_team))))
+        return self.pairs.get(key)
+
+    def render(self, home_team, away_team):
+        """
+        Return the previous matchups between two teams as display lines.
+        """
+        matches = self.lookup(home_team, away_team)
+        if matches is None or len(matches) == 0:
+            return ["No previous matchups found between these teams."]
+
+        teams = self.teams
+        seasons = self.seasons
+        results = ["--- Previous Matchups ---"]
+        for season, home, away, home_goals, away_goals in matches.tolist():
+            results.append(
+                f"Season: {seasons[season]}, {teams[home].title()} {home_goals} - {away_goals} {teams[away].title()}"
+            )
+        return results
+
+def build_head_to_head(match_df):
+    """
+    Build a HeadToHeadIndex from the DataFrame returned by load_match_data.
+    """
+    try:
+        season_codes, seasons = pd.factorize(match_df['season'])
+        team_codes, teams = pd.factorize(
+            pd.concat([match_df['home_team'], match_df['away_team']], ignore_index=True)
+        )
+        n = len(match_df)
+        home_codes = team_codes[:n]
+        away_codes = team_codes[n:]
+
+        if n == 0:
+            return HeadToHeadIndex(teams.tolist(), seasons.tolist(), {})
+
+        matches = np.empty(n, dtype=MATCH_DTYPE)
+        matches['season'] = season_codes
+        matches['home'] = home_codes
+        matches['away'] = away_codes
+        matches['home_goals'] = match_df['fth_goals'].to_numpy()
+        matches['away_goals'] = match_df['fta_goals'].to_numpy()
+
+        # Group rows by unordered pair, keeping the original order within each pair
+        teams = teams.tolist()
+        pair_keys = np.minimum(home_codes, away_codes) * len(teams) + np.maximum(home_codes, away_codes)
+        order = np.argsort(pair_keys, kind='stable')
+        sorted_keys = pair_keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], n]
+
+        pairs = {}
+        for start, end in zip(starts, ends):
+            group = matches[order[start:end]]
+            key = tuple(sorted((teams[group['home'][0]], teams[group['away'][0]])))
+            pairs[key] = group
+
+        logger.info(f"Built head-to-head index with {len(pairs)} team pairs from {n} matches")
+        return HeadToHeadIndex(teams, seasons.tolist(), pairs)
+    except Exception as e:
+        logger.error(f"Error building head-to-head index: {e}")
+        return None
@@ -0,0 +1,245 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+
+from src.data_loading import ROOT, MATCH_CSV, MATCH_CACHE_DIR
+from src.match_cache import load_compiled_matches
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Replay state: ratings after the last processed match plus every pre-match rating
+ELO_STATE_PATH = os.path.join(ROOT, 'data', 'cache', 'historical_elo.npz')
+
+DEFAULT_K = 20
+DEFAULT_HOME_ADVANTAGE = 60
+INITIAL_RATING = 1500
+
+def chronological_matches(csv_path=MATCH_CSV, cache_dir=MATCH_CACHE_DIR):
+    """
+    Load every match in date order. Matches on the same day are ordered by
+    team names, so the order does not depend on where rows sit in the CSV.
+
+    Returns:
+        Dictionary of arrays: 'date' (yyyymmdd), 'season', 'home_team' and
+        'away_team' (names), 'fth_goals' and 'fta_goals'
+    """
+    arrays, teams, seasons = load_compiled_matches(csv_path, cache_dir)
+    teams = np.array(teams)
+    home = teams[arrays['home_team']]
+    away = teams[arrays['away_team']]
+    order = np.lexsort((away, home, arrays['date']))
+    return {
+        'date': np.asarray(arrays['date'])[order],
+        'season': np.array(seasons)[arrays['season']][order],
+        'home_team': home[order],
+        'away_team': away[order],
+        'fth_goals': np.asarray(arrays['fth_goals'])[order],
+        'fta_goals': np.asarray(arrays['fta_goals'])[order]
+    }
+
+def _fingerprint(matches, n):
+    """SHA-1 of the first n matches, used to check a saved state still applies"""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(matches['date'][:n]).tobytes())
+    digest.update('\0'.join(matches['home_team'][:n].tolist()).encode('utf-8'))
+    digest.update('\0'.join(matches['away_team'][:n].tolist()).encode('utf-8'))
+    digest.update(np.ascontiguousarray(matches['fth_goals'][:n]).tobytes())
+    digest.update(np.ascontiguousarray(matches['fta_goals'][:n]).tobytes())
+    return digest.hexdigest()
+
+def replay(home_teams, away_teams, home_goals, away_goals, ratings, k=DEFAULT_K,
+           home_advantage=DEFAULT_HOME_ADVANTAGE, margin=True, initial_rating=INITIAL_RATING):
+    """
+    Apply matches in order to ratings (a {team: rating} dict, updated in place).
+
+    Each match moves both teams by k * (result - expected), where expected
+    includes home_advantage points for the home side. With margin, wins by
+    two goals count 1.5 times and bigger wins (11 + margin) / 8 times.
+
+    Returns:
+        (home_pre, away_pre, squared_error): pre-match ratings for every
+        match and the summed squared error of the expected results
+    """
+    n = len(home_teams)
+    home_pre = [0.0] * n
+    away_pre = [0.0] * n
+    squared_error = 0.0
+    get = ratings.get
+    # Plain Python lists and floats: each match depends on the one before,
+    # and per-element NumPy access would be slower than this loop
+    home_teams = home_teams.tolist() if hasattr(home_teams, 'tolist') else home_teams
+    away_teams = away_teams.tolist() if hasattr(away_teams, 'tolist') else away_teams
+    home_goals = home_goals.tolist() if hasattr(home_goals, 'tolist') else home_goals
+    away_goals = away_goals.tolist() if hasattr(away_goals, 'tolist') else away_goals
+    for i in range(n):
+        home = home_teams[i]
+        away = away_teams[i]
+        home_rating = get(home, initial_rating)
+        away_rating = get(away, initial_rating)
+        home_pre[i] = home_rating
+        away_pre[i] = away_rating
+
+        expected = 1.0 / (1.0 + 10.0 ** ((away_rating - home_rating - home_advantage) / 400.0))
+        goal_diff = home_goals[i] - away_goals[i]
+        result = 1.0 if goal_diff > 0 else 0.5 if goal_diff == 0 else 0.0
+        error = result - expected
+        squared_error += error * error
+
+        change = k * error
+        if margin and goal_diff:
+            goals = abs(goal_diff)
+            if goals == 2:
+                change *= 1.5
+            elif goals > 2:
+                change *= (11 + goals) / 8
+        ratings[home] = home_rating + change
+        ratings[away] = away_rating - change
+    return home_pre, away_pre, squared_error
+
+class HistoricalElo:
+    """
+    ELO ratings replayed from the match history, giving each match the
+    ratings both teams held before it was played (no leakage from later
+    results). The state can be saved and extended with new results without
+    replaying the history again.
+    """
+    def __init__(self, k=DEFAULT_K, home_advantage=DEFAULT_HOME_ADVANTAGE,
+                 margin=True, initial_rating=INITIAL_RATING):
+        self.params = {
+            'k': float(k),
+            'home_advantage': float(home_advantage),
+            'margin': bool(margin),
+            'initial_rating': float(initial_rating)
+        }
+        self.ratings = {}
+        self.n_matches = 0
+        # Fingerprint of an empty history
+        self.fingerprint = hashlib.sha1().hexdigest()
+        self.home_pre = np.zeros(0)
+        self.away_pre = np.zeros(0)
+
+    def update(self, matches):
+        """
+        Bring the ratings up to date with matches (as from chronological_matches).
+        Only matches after the saved state are replayed; if earlier history
+        changed, everything is replayed from scratch.
+
+        Returns:
+            Number of matches replayed
+        """
+        n = len(matches['date'])
+        if n < self.n_matches or _fingerprint(matches, self.n_matches) != self.fingerprint:
+            if self.n_matches:
+                logger.info("Match history changed, replaying ELO from scratch")
+            self.ratings = {}
+            self.n_matches = 0
+            self.home_pre = np.zeros(0)
+            self.away_pre = np.zeros(0)
+
+        start = self.n_matches
+        home_pre, away_pre, _ = replay(
+            matches['home_team'][start:], matches['away_team'][start:],
+            matches['fth_goals'][start:], matches['fta_goals'][start:],
+            self.ratings, **self.params
+        )
+        self.home_pre = np.concatenate([self.home_pre, home_pre])
+        self.away_pre = np.concatenate([self.away_pre, away_pre])
+        self.n_matches = n
+        self.fingerprint = _fingerprint(matches, n)
+        return n - start
+
+    def save(self, path=ELO_STATE_PATH):
+        """Write the state as one .npz archive (temp file + rename)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        teams = sorted(self.ratings)
+        header = dict(self.params, n_matches=self.n_matches, fingerprint=self.fingerprint)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, header=np.array(json.dumps(header)), teams=np.array(teams, dtype=str),
+                     ratings=np.array([self.ratings[team] for team in teams], dtype=float),
+                     home_pre=self.home_pre, away_pre=self.away_pre)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=ELO_STATE_PATH):
+        """Load a saved state, or None if there is none"""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                header = json.loads(str(data['header']))
+                engine = cls(header['k'], header['home_advantage'], header['margin'], header['initial_rating'])
+                engine.ratings = dict(zip(data['teams'].tolist(), data['ratings'].tolist()))
+                engine.n_matches = header['n_matches']
+                engine.fingerprint = header['fingerprint']
+                engine.home_pre = data['home_pre']
+                engine.away_pre = data['away_pre']
+                return engine
+        except FileNotFoundError:
+            return None
+
+def historical_elo_features(state_path=ELO_STATE_PATH, csv_path=MATCH_CSV, **params):
+    """
+    Match history with leakage-free ELO features: every match with the
+    home_elo and away_elo the teams held before kick-off. The replay state
+    is kept at state_path and only extended when new results appear.
+
+    Returns:
+        DataFrame with date, season, home_team, away_team, home_elo,
+        away_elo, fth_goals and fta_goals, oldest first
+    """
+    import pandas as pd
+    try:
+        matches = chronological_matches(csv_path)
+        engine = HistoricalElo.load(state_path) if state_path else None
+        if engine is None or engine.params != HistoricalElo(**params).params:
+            engine = HistoricalElo(**params)
+        replayed = engine.update(matches)
+        if replayed and state_path:
+            engine.save(state_path)
+        logger.info(f"Historical ELO up to date ({replayed} of {engine.n_matches} matches replayed)")
+
+        dates = pd.to_datetime(matches['date'].astype(str), format='%Y%m%d')
+        return pd.DataFrame({
+            'date': dates,
+            'season': matches['season'],
+            'home_team': matches['home_team'],
+            'away_team': matches['away_team'],
+            'home_elo': engine.home_pre,
+            'away_elo': engine.away_pre,
+            'fth_goals': matches['fth_goals'],
+            'fta_goals': matches['fta_goals']
+        })
+    except Exception as e:
+        logger.error(f"Error building historical ELO features: {e}")
+        return None
+
+def tune_parameters(matches, k_values=(10, 15, 20, 25, 30, 40), home_advantages=(0, 30, 60, 90, 120),
+                    margin=True):
+    """
+    Grid-search K-factor and home advantage by replaying the full history
+    for each pair, scored by the mean squared error of the expected results.
+
+    Returns:
+        List of (mse, k, home_advantage), best first
+    """
+    home_teams = matches['home_team'].tolist()
+    away_teams = matches['away_team'].tolist()
+    home_goals = matches['fth_goals'].tolist()
+    away_goals = matches['fta_goals'].tolist()
+    results = []
+    for k in k_values:
+        for home_advantage in home_advantages:
+            _, _, squared_error = replay(home_teams, away_teams, home_goals, away_goals, {},
+                                         k=k, home_advantage=home_advantage, margin=margin)
+            results.append((squared_error / max(len(home_teams), 1), k, home_advantage))
+    return sorted(results)
+
+if __name__ == "__main__":
+    import time
+    matches = chronological_matches()
+    started = time.perf_counter()
+    for mse, k, home_advantage in tune_parameters(matches)[:5]:
+        print(f"k={k:<3} home_advantage={home_advantage:<4} mse={mse:.5f}")
+    print(f"\nTuned over {len(matches['date'])} matches in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class FetchResult:
+    """
+    Outcome of a fetch.
+
+    not_modified is True when the server answered 304; text then holds the
+    cached body and callers can reuse whatever they derived from it before.
+    """
+    __slots__ = ('url', 'status_code', 'text', 'etag', 'last_modified', 'not_modified')
+
+    def __init__(self, url, status_code, text, etag=None, last_modified=None, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
+
+class HttpFetcher:
+    """
+    HTTP GET with a pooled session, timeouts, bounded jittered retries and
+    conditional requests backed by an on-disk response cache.
+    """
+    def __init__(self, cache_dir=None, timeout=(3.05, 10), retries=3,
+                 backoff=0.5, max_backoff=8, pool_size=4, session=None):
+        """
+        Args:
+            cache_dir: Directory for cached bodies and validators (None disables)
+            timeout: (connect, read) timeout in seconds
+            retries: Retries after the first attempt for transient failures
+            backoff: Base delay before the first retry, in seconds
+            max_backoff: Upper bound on any retry delay, in seconds
+            pool_size: Connections kept alive per host
+            session: Existing requests.Session to use instead of a new one
+        """
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def _cache_paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return (os.path.join(self.cache_dir, f"{key}.json"),
+                os.path.join(self.cache_dir, f"{key}.body"))
+
+    def _read_cache(self, url):
+        if not self.cache_dir:
+            return None
+        meta_path, body_path = self._cache_paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, encoding='utf-8') as f:
+                meta['text'] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, url, text, etag, last_modified):
+        if not self.cache_dir or not (etag or last_modified):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            meta_path, body_path = self._cache_paths(url)
+            for path, write in ((body_path, lambda f: f.write(text)),
+                                (meta_path, lambda f: json.dump({'etag': etag, 'last_modified': last_modified}, f))):
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    write(f)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache response for {url}: {e}")
+
+    def _retry_delay(self, attempt):
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.5)
+
+    def get(self, url):
+        """
+        Fetch a URL, revalidating any cached copy with ETag / If-Modified-Since.
+
+        Returns:
+            FetchResult
+
+        Raises:
+            requests.RequestException once retries are exhausted
+        """
+        cached = self._read_cache(url)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self._request(url, headers)
+        if response.status_code == 304:
+            if cached and cached.get('text'):
+                return FetchResult(url, 304, cached['text'], cached.get('etag'),
+                                   cached.get('last_modified'), not_modified=True)
+            # Nothing cached to reuse: treat it as a miss and ask for the full body
+            logger.warning(f"{url} answered 304 without a usable cached copy; refetching")
+            response = self._request(url, {})
+            if response.status_code == 304:
+                raise requests.HTTPError(f"304 from {url} for an unconditional request", response=response)
+
+        response.raise_for_status()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        self._write_cache(url, response.text, etag, last_modified)
+        return FetchResult(url, response.status_code, response.text, etag, last_modified)
+
+    def _request(self, url, headers):
+        """GET with bounded retries on transient failures; returns the last response"""
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                    raise requests.HTTPError(f"{response.status_code} from {url}", response=response)
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                if attempt >= self.retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"Fetching {url} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+        return response
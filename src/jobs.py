@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+FINISHED = (SUCCEEDED, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    pid INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+_COLUMNS = ('id', 'kind', 'params', 'status', 'progress', 'message', 'error',
+            'pid', 'created_at', 'started_at', 'finished_at')
+
+# Process jobs run in a spawned child rather than a forked one: a fork of a
+# worker with request, refresher and job threads running copies whatever
+# locks those threads hold at that moment, and the child can deadlock on them
+_SPAWN = multiprocessing.get_context('spawn')
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class JobQueue:
+    """
+    Long-running operations (ELO refresh, retraining, backtests,
+    simulations) run as jobs on a bounded thread pool instead of inside the
+    request. Jobs are recorded in a SQLite table shared by every worker
+    process, so any worker can answer status and result requests for a job
+    another one is running.
+
+    Each process runs at most `workers` jobs at a time and queues at most
+    `max_pending` more; submit() refuses new jobs beyond that. Jobs left
+    queued or running by a process that has exited are marked failed.
+    Finished jobs are deleted after `retention` seconds.
+
+    CPU-bound kinds are registered with process=True: each such job runs
+    in its own freshly spawned child process, so it never competes for the
+    GIL with the threads serving requests. The child shares no state with
+    the worker; its handler rebuilds what it needs from disk.
+    """
+    def __init__(self, path, workers=2, max_pending=16, retention=86400):
+        self.path = path
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self._handlers = {}
+        self._in_process = set()
+        self._executor = None
+        self._active = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Condition()
+        self._ready = False
+
+    def register(self, kind, handler, process=False):
+        """
+        Register handler(params, progress) for a job kind. It returns a
+        JSON-serialisable result or raises; progress(fraction, message)
+        reports how far it has got. With process, the handler runs in a
+        spawned child process: it must be picklable (a module-level function
+        or a functools.partial of one) and must not rely on this process's
+        globals.
+        """
+        self._handlers[kind] = handler
+        if process:
+            self._in_process.add(kind)
+        else:
+            self._in_process.discard(kind)
+
+    def kinds(self):
+        return sorted(self._handlers)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    connection.execute('PRAGMA journal_mode=WAL')
+                    connection.execute(_SCHEMA)
+                    self._recover(connection)
+                    connection.commit()
+                    self._ready = True
+        return connection
+
+    def _execute(self, sql, args=()):
+        connection = self._connect()
+        try:
+            with connection:
+                return connection.execute(sql, args).fetchall()
+        finally:
+            connection.close()
+
+    def _recover(self, connection):
+        """Fail jobs whose process has exited before finishing them"""
+        rows = connection.execute(
+            'SELECT id, pid FROM jobs WHERE status IN (?, ?)', (QUEUED, RUNNING)).fetchall()
+        for row in rows:
+            if row['pid'] != os.getpid() and not _pid_alive(row['pid']):
+                connection.execute(
+                    'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                    (FAILED, 'Worker process exited before the job finished', time.time(), row['id']))
+                logger.warning(f"Job {row['id']} was abandoned by process {row['pid']}")
+
+    def submit(self, kind, params=None):
+        """
+        Queue a job.
+
+        Returns:
+            The job (as from get()), or None if the queue is full
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind {kind}")
+        params = params or {}
+        with self._lock:
+            if self._active >= self.workers + self.max_pending:
+                return None
+            self._active += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+        try:
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._execute(
+                'INSERT INTO jobs (id, kind, params, status, pid, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, json.dumps(params), QUEUED, os.getpid(), now))
+            if self.retention:
+                self._execute('DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?',
+                              FINISHED + (now - self.retention,))
+            self._executor.submit(self._run, job_id, kind, params)
+        except Exception:
+            with self._lock:
+                self._active -= 1
+            raise
+        logger.info(f"Queued {kind} job {job_id}")
+        return self.get(job_id)
+
+    def _progress(self, job_id):
+        def progress(fraction, message=None):
+            self._execute('UPDATE jobs SET progress = ?, message = ? WHERE id = ?',
+                          (max(0.0, min(1.0, float(fraction))), message, job_id))
+        return progress
+
+    def _run(self, job_id, kind, params):
+        try:
+            self._execute('UPDATE jobs SET status = ?, started_at = ? WHERE id = ?',
+                          (RUNNING, time.time(), job_id))
+            started = time.perf_counter()
+            handler = self._handlers[kind]
+            if kind in self._in_process:
+                # A fresh child per job, so nothing outlives it
+                with ProcessPoolExecutor(max_workers=1, mp_context=_SPAWN) as pool:
+                    result = pool.submit(_run_in_child, self.path, job_id, handler, params).result()
+            else:
+                result = handler(params, self._progress(job_id))
+            self._execute(
+                'UPDATE jobs SET status = ?, progress = 1, message = NULL, result = ?, finished_at = ? WHERE id = ?',
+                (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id))
+            logger.info(f"{kind} job {job_id} finished in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logger.error(f"Error in {kind} job {job_id}: {e}")
+            try:
+                self._execute('UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                              (FAILED, str(e) or type(e).__name__, time.time(), job_id))
+            except Exception as db_error:
+                logger.error(f"Error recording failure of job {job_id}: {db_error}")
+        finally:
+            with self._lock:
+                self._active -= 1
+            with self._finished:
+                self._finished.notify_all()
+
+    def get(self, job_id, with_result=False):
+        """
+        Look up a job.
+
+        Returns:
+            Dictionary with id, kind, params, status, progress, message,
+            error, timestamps (and result, if with_result), or None
+        """
+        columns = _COLUMNS + (('result',) if with_result else ())
+        rows = self._execute(f"SELECT {', '.join(columns)} FROM jobs WHERE id = ?", (job_id,))
+        return self._job(rows[0]) if rows else None
+
+    def recent(self, limit=50):
+        """The most recently submitted jobs, newest first"""
+        rows = self._execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [self._job(row) for row in rows]
+
+    def stats(self):
+        """Jobs running or queued in this process, and the limits"""
+        return {'active': self._active, 'workers': self.workers, 'max_pending': self.max_pending}
+
+    @staticmethod
+    def _job(row):
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        if 'result' in job:
+            job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def wait(self, job_id, timeout=None, interval=0.05):
+        """Poll until a job finishes; returns the job with its result, or None on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id, with_result=True)
+            if job is None or job['status'] in FINISHED:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            # Woken as soon as a job in this process finishes; jobs run by
+            # other processes are picked up by polling
+            with self._finished:
+                self._finished.wait(interval)
+
+def _run_in_child(path, job_id, handler, params):
+    """Run a process job's handler, reporting progress through the job table"""
+    return handler(params, JobQueue(path)._progress(job_id))
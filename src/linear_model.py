@@ -0,0 +1,98 @@
+import os
+import logging
+import warnings
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class LinearGoalsModel:
+    """
+    Compiled form of the fitted LinearRegression goals model: a coefficient
+    matrix and intercept applied with plain NumPy, so serving never imports
+    sklearn. predict() computes X @ coef.T + intercept exactly as
+    LinearRegression.predict does, and returns identical results.
+
+    With link='log' the linear predictor is exponentiated, which serves
+    Poisson regression models in the same form.
+    """
+    LINKS = ('identity', 'log')
+
+    def __init__(self, coef, intercept, feature_names=('home_elo', 'away_elo'), link='identity'):
+        if link not in self.LINKS:
+            raise ValueError(f"Unknown link {link!r}")
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = np.ascontiguousarray(intercept, dtype=np.float64)
+        self.feature_names = tuple(feature_names)
+        self.link = link
+        self._coef_t = self.coef.T
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Compile a fitted sklearn LinearRegression"""
+        feature_names = getattr(model, 'feature_names_in_', None)
+        if feature_names is None:
+            feature_names = ('home_elo', 'away_elo')
+        return cls(model.coef_, model.intercept_, [str(name) for name in feature_names])
+
+    @classmethod
+    def load(cls, path):
+        """Load a model written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            link = str(data['link']) if 'link' in data.files else 'identity'
+            return cls(data['coef'], data['intercept'], data['feature_names'].tolist(), link)
+
+    def save(self, path):
+        """Write the coefficients as an .npz archive (atomically)"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, coef=self.coef, intercept=self.intercept,
+                     feature_names=np.array(self.feature_names), link=np.array(self.link))
+        os.replace(tmp_path, path)
+
+    def to_arrays(self):
+        """Parameters as {name: array}, the form stored in the model registry"""
+        return {'coef': self.coef, 'intercept': self.intercept}
+
+    @classmethod
+    def from_arrays(cls, arrays, feature_names, link='identity'):
+        """Build from registry arrays; memory-mapped float64 arrays are used without copying"""
+        return cls(arrays['coef'], arrays['intercept'], feature_names, link)
+
+    def predict(self, features):
+        """
+        Predict expected goals.
+
+        Args:
+            features: (n, n_features) array-like of [home_elo, away_elo] rows
+
+        Returns:
+            (n, 2) array of [home_goals, away_goals]
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != self.coef.shape[1]:
+            raise ValueError(f"Expected features of shape (n, {self.coef.shape[1]}), got {features.shape}")
+        linear = features @ self._coef_t + self.intercept
+        return np.exp(linear) if self.link == 'log' else linear
+
+    def predict_one(self, home_elo, away_elo):
+        """Expected (home_goals, away_goals) for a single fixture"""
+        home_goals, away_goals = self.predict([[home_elo, away_elo]])[0]
+        return home_goals, away_goals
+
+def matches_model(compiled, model, features):
+    """
+    Check the compiled model reproduces model.predict exactly on features.
+    Both are given the same float64 array, so any difference is a real bug.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    with warnings.catch_warnings():
+        # Models fitted on a DataFrame warn about the missing feature names
+        warnings.simplefilter('ignore', UserWarning)
+        expected = np.asarray(model.predict(features))
+    actual = compiled.predict(features)
+    if not np.array_equal(expected, actual):
+        diff = np.abs(expected - actual).max()
+        logger.error(f"Compiled model differs from model.predict (max difference {diff})")
+        return False
+    return True
@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes so old caches are rebuilt
+CACHE_FORMAT = 3
+
+# Standardised names some rows use for a club, mapped to the name the rest
+# of the data uses, so every club has one key
+TEAM_ALIASES = {
+    'brighton&hovealbion': 'brighton',
+    'ipswichtown': 'ipswich'
+}
+
+# Source columns read from the CSV and the arrays they are compiled into
+CSV_COLUMNS = ['Date', 'Season', 'HomeTeam', 'AwayTeam', 'FTH Goals', 'FTA Goals']
+ARRAYS = {
+    'date': np.int32,
+    'season': np.int16,
+    'home_team': np.int16,
+    'away_team': np.int16,
+    'fth_goals': np.int8,
+    'fta_goals': np.int8
+}
+
+def _file_hash(path):
+    """Return the SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _standardize_team(name):
+    """Standardise a team name as load_match_data always has, then resolve aliases"""
+    name = name.strip().replace(' ', '').lower()
+    return TEAM_ALIASES.get(name, name)
+
+def compile_match_csv(csv_path):
+    """
+    Parse the match CSV into int-coded column arrays.
+
+    Returns:
+        (arrays, teams, seasons) where arrays maps column name to a NumPy
+        array and teams/seasons are the lookup lists for the codes
+    """
+    df = pd.read_csv(
+        csv_path,
+        usecols=CSV_COLUMNS,
+        dtype={'Date': str, 'Season': str, 'HomeTeam': str, 'AwayTeam': str, 'FTH Goals': 'int8', 'FTA Goals': 'int8'},
+        encoding='utf-8-sig'
+    )
+    n = len(df)
+
+    season_codes, seasons = pd.factorize(df['Season'])
+    # Standardise each distinct name once, then re-code in case names merge
+    raw_codes, raw_teams = pd.factorize(pd.concat([df['HomeTeam'], df['AwayTeam']], ignore_index=True))
+    team_names = [_standardize_team(name) for name in raw_teams]
+    remap, teams = pd.factorize(pd.Index(team_names))
+    team_codes = remap[raw_codes]
+
+    # Dates as yyyymmdd integers, which sort chronologically
+    dates = pd.to_datetime(df['Date'], format='%d/%m/%Y')
+    arrays = {
+        'date': (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).to_numpy(dtype=ARRAYS['date']),
+        'season': season_codes.astype(ARRAYS['season']),
+        'home_team': team_codes[:n].astype(ARRAYS['home_team']),
+        'away_team': team_codes[n:].astype(ARRAYS['away_team']),
+        'fth_goals': df['FTH Goals'].to_numpy(dtype=ARRAYS['fth_goals']),
+        'fta_goals': df['FTA Goals'].to_numpy(dtype=ARRAYS['fta_goals'])
+    }
+    return arrays, list(teams), list(seasons)
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_meta(cache_dir, meta):
+    path = os.path.join(cache_dir, 'meta.json')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, path)
+
+def _write_cache(cache_dir, arrays, meta):
+    """Write every column then the metadata, each via temp file + rename"""
+    os.makedirs(cache_dir, exist_ok=True)
+    for name, values in arrays.items():
+        path = os.path.join(cache_dir, f"{name}.npy")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, values)
+        os.replace(tmp_path, path)
+    _write_meta(cache_dir, meta)
+
+def _load_arrays(cache_dir):
+    return {
+        name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode='r')
+        for name in ARRAYS
+    }
+
+def load_compiled_matches(csv_path, cache_dir):
+    """
+    Return compiled match arrays, rebuilding the cache only when the CSV changed.
+
+    The cache is reused while the CSV's size and mtime match. If the mtime
+    changed but the content hash did not (e.g. after a fresh checkout),
+    the cache is kept and only its recorded mtime is refreshed.
+
+    Returns:
+        (arrays, teams, seasons); arrays are memory-mapped when read from cache
+    """
+    stat = os.stat(csv_path)
+    meta = _read_meta(cache_dir)
+
+    if meta is not None and meta.get('format') == CACHE_FORMAT:
+        try:
+            if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+                return _load_arrays(cache_dir), meta['teams'], meta['seasons']
+            if meta['size'] == stat.st_size and meta['sha1'] == _file_hash(csv_path):
+                meta['mtime_ns'] = stat.st_mtime_ns
+                _write_meta(cache_dir, meta)
+                return _load_arrays(cache_dir), meta['teams'], meta['seasons']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable match cache: {e}")
+
+    logger.info(f"Compiling match cache from {csv_path}...")
+    arrays, teams, seasons = compile_match_csv(csv_path)
+    meta = {
+        'format': CACHE_FORMAT,
+        'source': os.path.basename(csv_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': _file_hash(csv_path),
+        'rows': len(arrays['season']),
+        'teams': teams,
+        'seasons': seasons
+    }
+    try:
+        _write_cache(cache_dir, arrays, meta)
+    except OSError as e:
+        # A read-only filesystem should not stop the app from loading data
+        logger.warning(f"Could not write match cache to {cache_dir}: {e}")
+    return arrays, teams, seasons
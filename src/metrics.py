@@ -0,0 +1,150 @@
+import time
+import bisect
+import logging
+import threading
+import contextvars
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Latency histogram buckets in seconds, from 50us to 10s
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = 'epl_'
+
+# Route the current request is serving, attached to stage timings; code
+# running outside a request (background refresher, scripts) is 'background'
+_route = contextvars.ContextVar('metrics_route', default='background')
+
+class MetricsRegistry:
+    """
+    In-process counters and latency histograms rendered in the Prometheus
+    text format. Disabled by default, when start() returns 0 and lap() and
+    the counters return straight away, so instrumented code costs a few
+    function calls. Each worker process keeps its own numbers.
+    """
+    def __init__(self, enabled=False, buckets=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # {(name, labels): [bucket counts..., sum, count]}
+        self._histograms = {}
+        # {(name, labels): value}
+        self._counters = {}
+        self._help = {
+            'request_duration_seconds': 'Request latency by route, method and status',
+            'stage_duration_seconds': 'Latency of the steps inside a request by route and stage',
+            'scrape_failures_total': 'Failed ELO scrapes by stage (fetch or parse)',
+            'db_write_failures_total': 'Failed ELO database writes'
+        }
+        self._collectors = []
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def add_collector(self, collector):
+        """
+        Register collector() -> iterable of (name, type, help, samples), with
+        samples a list of (labels, value), read each time metrics are rendered.
+        Used for values kept elsewhere (cache stats, data versions).
+        """
+        self._collectors.append(collector)
+
+    def observe(self, name, labels, seconds):
+        """Add a latency observation; labels is a tuple of (key, value) pairs"""
+        if not self.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.get((name, labels))
+            if series is None:
+                series = self._histograms[(name, labels)] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    def inc(self, name, labels=(), amount=1):
+        """Increment a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = {key: list(series) for key, series in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        for name in sorted({key[0] for key in histograms}):
+            self._header(lines, name, 'histogram')
+            for (series_name, labels), series in sorted(histograms.items()):
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', '+Inf'),))} {series[-1]}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {series[-2]!r}")
+                lines.append(f"{PREFIX}{name}_count{_labels(labels)} {series[-1]}")
+
+        for name in sorted({key[0] for key in counters}):
+            self._header(lines, name, 'counter')
+            for (series_name, labels), value in sorted(counters.items()):
+                if series_name == name:
+                    lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+
+        for collector in self._collectors:
+            try:
+                for name, kind, help_text, samples in collector():
+                    lines.append(f"# HELP {PREFIX}{name} {help_text}")
+                    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                    for labels, value in samples:
+                        lines.append(f"{PREFIX}{name}{_labels(tuple(labels))} {value}")
+            except Exception as e:
+                logger.error(f"Error collecting metrics: {e}")
+        return '\n'.join(lines) + '\n'
+
+    def _header(self, lines, name, kind):
+        if name in self._help:
+            lines.append(f"# HELP {PREFIX}{name} {self._help[name]}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+# Process-wide registry; the app enables it from Config.METRICS_ENABLED
+registry = MetricsRegistry()
+
+def start():
+    """Start a stopwatch for lap() (0 while metrics are disabled)"""
+    return time.perf_counter() if registry.enabled else 0
+
+def lap(stage, started):
+    """
+    Record the time since started as one stage of the current route and
+    return the time to start the next stage from:
+
+        started = start()
+        ...
+        started = lap('model', started)
+    """
+    if not started:
+        return 0
+    now = time.perf_counter()
+    registry.observe('stage_duration_seconds', (('route', _route.get()), ('stage', stage)), now - started)
+    return now
+
+def set_route(route):
+    """Attribute stages timed in this context to route"""
+    _route.set(route)
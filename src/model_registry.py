@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# File naming the active version, replaced atomically on activation
+CURRENT_FILE = 'CURRENT'
+METADATA_FILE = 'metadata.json'
+
+class ModelRegistry:
+    """
+    Directory of immutable, versioned model artifacts:
+
+        <root>/<version>/metadata.json   features, training data hash, metrics
+        <root>/<version>/<name>.npy      one uncompressed array per parameter
+        <root>/CURRENT                   name of the active version
+
+    A version directory is written under a temporary name and renamed into
+    place, and CURRENT is swapped with os.replace, so readers never see a
+    partial model. Arrays are plain .npy files loaded with mmap_mode='r',
+    letting every worker share the same pages of the page cache.
+    """
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def versions(self):
+        """All published versions, oldest first"""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names
+                      if not name.startswith('.') and os.path.isfile(self._path(name, METADATA_FILE)))
+
+    def current(self):
+        """The active version, or None if nothing has been activated"""
+        try:
+            with open(self._path(CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def stamp(self):
+        """Cheap change marker for CURRENT (None if missing)"""
+        try:
+            st = os.stat(self._path(CURRENT_FILE))
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def publish(self, arrays, metadata, activate=True):
+        """
+        Write a new version.
+
+        Args:
+            arrays: {name: array} of model parameters
+            metadata: JSON-serialisable description (features, data hash, metrics...)
+            activate: Make the new version current
+
+        Returns:
+            The version name
+        """
+        digest = hashlib.sha1()
+        for name in sorted(arrays):
+            digest.update(name.encode('utf-8'))
+            digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+        version = f"{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{digest.hexdigest()[:8]}"
+
+        if not os.path.isdir(self._path(version)):
+            os.makedirs(self.root, exist_ok=True)
+            tmp_dir = self._path(f".tmp-{version}-{os.getpid()}")
+            os.makedirs(tmp_dir)
+            try:
+                for name, values in arrays.items():
+                    np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(values))
+                metadata = dict(metadata, version=version, arrays=sorted(arrays),
+                                created_at=metadata.get('created_at') or time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
+                with open(os.path.join(tmp_dir, METADATA_FILE), 'w') as f:
+                    json.dump(metadata, f, indent=2, sort_keys=True)
+                os.rename(tmp_dir, self._path(version))
+            except Exception:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+            logger.info(f"Published model version {version}")
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version):
+        """Point CURRENT at an existing version (also used to roll back)"""
+        if not os.path.isfile(self._path(version, METADATA_FILE)):
+            raise ValueError(f"Unknown model version {version}")
+        tmp_path = self._path(f".{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(CURRENT_FILE))
+        logger.info(f"Activated model version {version}")
+
+    def metadata(self, version):
+        with open(self._path(version, METADATA_FILE)) as f:
+            return json.load(f)
+
+    def load(self, version=None, mmap=True):
+        """
+        Load a version (the current one by default).
+
+        Returns:
+            (arrays, metadata), or (None, None) if there is no such version
+        """
+        version = version or self.current()
+        if version is None or not os.path.isfile(self._path(version, METADATA_FILE)):
+            return None, None
+        metadata = self.metadata(version)
+        arrays = {
+            name: np.load(self._path(version, f"{name}.npy"), mmap_mode='r' if mmap else None, allow_pickle=False)
+            for name in metadata['arrays']
+        }
+        return arrays, metadata
+
+if __name__ == "__main__":
+    # python src/model_registry.py [list | activate <version>] [--root DIR]
+    args = sys.argv[1:]
+    root = 'models/registry'
+    if '--root' in args:
+        i = args.index('--root')
+        root = args[i + 1]
+        del args[i:i + 2]
+    registry = ModelRegistry(root)
+    if args[:1] == ['activate'] and len(args) == 2:
+        registry.activate(args[1])
+    elif args[:1] in ([], ['list']):
+        current = registry.current()
+        for version in registry.versions():
+            metrics = registry.metadata(version).get('metrics', {})
+            marker = '*' if version == current else ' '
+            print(f"{marker} {version}  {json.dumps(metrics, sort_keys=True)}")
+    else:
+        print("Usage: model_registry.py [list | activate <version>] [--root DIR]")
+        sys.exit(1)
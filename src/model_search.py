@@ -0,0 +1,340 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Add the parent directory to the Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.linear_model import LinearGoalsModel
+from src.model_registry import ModelRegistry
+from src.scorelines import score_grids, grid_markets, MIN_EXPECTED_GOALS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Feature matrices per training-data hash, shared by every fold and worker
+FEATURE_CACHE_DIR = os.path.join(ROOT, 'data', 'cache', 'features')
+# Bump when the cached arrays change so old caches are rebuilt
+FEATURE_CACHE_FORMAT = 2
+LEADERBOARD_PATH = os.path.join(ROOT, 'models', 'leaderboard.json')
+REGISTRY_DIR = os.path.join(ROOT, 'models', 'registry')
+
+RAW_FEATURES = ['home_elo', 'away_elo']
+TARGETS = ['fth_goals', 'fta_goals']
+
+# Feature sets are affine maps of the served [home_elo, away_elo] row,
+# features = raw @ A.T + b, so any fitted candidate folds back into a
+# LinearGoalsModel on raw ratings and is served without sklearn
+ELO_SCALE = 400.0
+ELO_CENTRE = 1500.0
+FEATURE_SETS = {
+    'raw_elo': (np.eye(2) / ELO_SCALE, np.full(2, -ELO_CENTRE / ELO_SCALE)),
+    'elo_diff': (np.array([[1.0, -1.0]]) / ELO_SCALE, np.zeros(1))
+}
+
+def shift_invariant(feature_set):
+    """
+    Whether adding the same amount to both ratings leaves a feature set
+    unchanged. Candidates are trained on replayed ratings, which start at
+    1500, but served on clubelo.com ratings, which sit a few hundred points
+    higher; only shift-invariant candidates see the same inputs in both.
+    """
+    A, _ = FEATURE_SETS[feature_set]
+    return bool(np.allclose(A.sum(axis=1), 0))
+
+def default_candidates():
+    """Every model family and regularisation strength crossed with every feature set"""
+    models = [
+        ('linear', {}),
+        ('ridge', {'alpha': 0.1}),
+        ('ridge', {'alpha': 1.0}),
+        ('ridge', {'alpha': 10.0}),
+        ('poisson', {'alpha': 1e-4}),
+        ('poisson', {'alpha': 1e-2})
+    ]
+    candidates = []
+    for feature_set in FEATURE_SETS:
+        for kind, params in models:
+            args = ', '.join(f"{key}={value:g}" for key, value in params.items())
+            candidates.append({
+                'name': f"{kind}({args})/{feature_set}",
+                'kind': kind,
+                'params': params,
+                'features': feature_set
+            })
+    return candidates
+
+def data_hash(data):
+    """SHA-1 of the training columns, naming the feature cache and artifacts"""
+    import pandas as pd
+    row_hashes = pd.util.hash_pandas_object(data[RAW_FEATURES + TARGETS + ['season']], index=False)
+    return hashlib.sha1(row_hashes.to_numpy().tobytes()).hexdigest()
+
+def build_feature_cache(data, cache_dir=FEATURE_CACHE_DIR):
+    """
+    Write the feature matrix of every feature set, the targets and the season
+    index once per distinct training data. Workers memory-map these files
+    instead of receiving copies of the data.
+
+    Returns:
+        (feature_dir, seasons) with seasons in chronological order
+    """
+    seasons = sorted(data['season'].unique().tolist())
+    feature_dir = os.path.join(cache_dir, f"{data_hash(data)}-v{FEATURE_CACHE_FORMAT}")
+    if os.path.isfile(os.path.join(feature_dir, 'meta.json')):
+        return feature_dir, seasons
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = f"{feature_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    raw = data[RAW_FEATURES].to_numpy(dtype=np.float64)
+    arrays = {
+        'raw': raw,
+        'y': data[TARGETS].to_numpy(dtype=np.float64),
+        'season': np.searchsorted(seasons, data['season'].to_numpy()).astype(np.int16)
+    }
+    for name, (A, b) in FEATURE_SETS.items():
+        arrays[f"X_{name}"] = raw @ A.T + b
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(values))
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump({'format': FEATURE_CACHE_FORMAT, 'seasons': seasons, 'rows': int(len(data))}, f)
+    try:
+        os.rename(tmp_dir, feature_dir)
+    except OSError:
+        # Another process built the same cache first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return feature_dir, seasons
+
+def load_feature_array(feature_dir, name):
+    """Memory-map one cached array ('raw', 'y', 'season' or 'X_<feature set>')"""
+    return np.load(os.path.join(feature_dir, f"{name}.npy"), mmap_mode='r')
+
+def _load_features(feature_dir, feature_set):
+    return (load_feature_array(feature_dir, f"X_{feature_set}"),
+            load_feature_array(feature_dir, 'y'), load_feature_array(feature_dir, 'season'))
+
+def fit_candidate(candidate, X, y):
+    """
+    Fit a candidate on a feature matrix.
+
+    Returns:
+        (coef, intercept, link) in feature space, coef of shape (2, n_features)
+    """
+    from sklearn.linear_model import LinearRegression, Ridge, PoissonRegressor
+    kind = candidate['kind']
+    params = candidate['params']
+    if kind == 'poisson':
+        # One regressor per side, stacked into a two-output model
+        fits = [PoissonRegressor(max_iter=1000, **params).fit(X, y[:, side]) for side in range(y.shape[1])]
+        return np.vstack([fit.coef_ for fit in fits]), np.array([fit.intercept_ for fit in fits]), 'log'
+    model = (LinearRegression() if kind == 'linear' else Ridge(**params)).fit(X, y)
+    return np.atleast_2d(model.coef_), np.asarray(model.intercept_), 'identity'
+
+def compile_candidate(candidate, coef, intercept, link):
+    """Fold a feature-space fit back into a LinearGoalsModel on raw ratings"""
+    A, b = FEATURE_SETS[candidate['features']]
+    return LinearGoalsModel(coef @ A, coef @ b + intercept, RAW_FEATURES, link)
+
+def outcome_probabilities(expected):
+    """(n, 3) home/draw/away probabilities from the Poisson scoreline grid of each match"""
+    expected = np.maximum(expected, MIN_EXPECTED_GOALS)
+    markets = grid_markets(score_grids(expected[:, 0], expected[:, 1]))
+    return np.column_stack([markets['home_win'], markets['draw'], markets['away_win']])
+
+def match_outcomes(goals):
+    """Result index per match: 0 home win, 1 draw, 2 away win"""
+    goals = np.asarray(goals)
+    return np.where(goals[:, 0] > goals[:, 1], 0, np.where(goals[:, 0] == goals[:, 1], 1, 2))
+
+def log_loss(probs, outcome):
+    """Per-match log loss of the probability given to the actual result"""
+    return -np.log(np.clip(probs[np.arange(len(outcome)), outcome], 1e-15, 1))
+
+def brier_score(probs, outcome):
+    """Per-match multi-class Brier score"""
+    return ((probs - np.eye(probs.shape[1])[outcome]) ** 2).sum(axis=1)
+
+def score_predictions(expected, goals):
+    """
+    Score expected goals against results.
+
+    Returns:
+        Dictionary of mean metrics: goals MAE per side, Poisson deviance and
+        the log loss and Brier score of the 1X2 probabilities from the
+        Poisson scoreline grid
+    """
+    expected = np.maximum(expected, MIN_EXPECTED_GOALS)
+    goals = np.asarray(goals, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ratio = np.where(goals > 0, goals * np.log(goals / expected), 0.0)
+    deviance = 2 * (log_ratio - (goals - expected))
+
+    probs = outcome_probabilities(expected)
+    outcome = match_outcomes(goals)
+    return {
+        'mae_home': float(np.abs(expected[:, 0] - goals[:, 0]).mean()),
+        'mae_away': float(np.abs(expected[:, 1] - goals[:, 1]).mean()),
+        'poisson_deviance': float(deviance.mean()),
+        'log_loss': float(log_loss(probs, outcome).mean()),
+        'brier': float(brier_score(probs, outcome).mean())
+    }
+
+def evaluate_fold(feature_dir, candidate, test_season):
+    """Train on every season before test_season and score on test_season"""
+    X, y, season = _load_features(feature_dir, candidate['features'])
+    train = season < test_season
+    test = season == test_season
+    coef, intercept, link = fit_candidate(candidate, X[train], y[train])
+    linear = X[test] @ coef.T + intercept
+    expected = np.exp(linear) if link == 'log' else linear
+    metrics = score_predictions(expected, y[test])
+    metrics['matches'] = int(test.sum())
+    return candidate['name'], int(test_season), metrics
+
+def run_search(data, candidates=None, min_train_seasons=5, workers=None, cache_dir=FEATURE_CACHE_DIR,
+               progress=None):
+    """
+    Walk-forward cross-validation: for every season after the first
+    min_train_seasons, each candidate is trained on all earlier seasons and
+    scored on that season. (candidate, season) folds run across a process pool,
+    and progress(done, total), if given, is called as they finish.
+
+    Returns:
+        Leaderboard: one entry per candidate with match-weighted mean
+        metrics over the folds, best (lowest 1X2 log loss) first
+    """
+    candidates = candidates or default_candidates()
+    feature_dir, seasons = build_feature_cache(data, cache_dir)
+    test_seasons = list(range(min_train_seasons, len(seasons)))
+    if not test_seasons:
+        raise ValueError(f"Need more than {min_train_seasons} seasons for walk-forward validation")
+    tasks = [(feature_dir, candidate, season) for candidate in candidates for season in test_seasons]
+
+    workers = workers or os.cpu_count() or 1
+    results = []
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(evaluate_fold, *zip(*tasks), chunksize=max(1, len(tasks) // (workers * 4))):
+                results.append(result)
+                if progress is not None:
+                    progress(len(results), len(tasks))
+    else:
+        for task in tasks:
+            results.append(evaluate_fold(*task))
+            if progress is not None:
+                progress(len(results), len(tasks))
+
+    by_candidate = {candidate['name']: [] for candidate in candidates}
+    for name, _, metrics in results:
+        by_candidate[name].append(metrics)
+
+    leaderboard = []
+    for candidate in candidates:
+        folds = by_candidate[candidate['name']]
+        weights = np.array([fold['matches'] for fold in folds], dtype=float)
+        entry = dict(candidate, folds=len(folds), matches=int(weights.sum()))
+        for metric in ('log_loss', 'brier', 'poisson_deviance', 'mae_home', 'mae_away'):
+            entry[metric] = float(np.average([fold[metric] for fold in folds], weights=weights))
+        leaderboard.append(entry)
+    leaderboard.sort(key=lambda entry: entry['log_loss'])
+    for rank, entry in enumerate(leaderboard, start=1):
+        entry['rank'] = rank
+    return leaderboard
+
+def servable_best(leaderboard):
+    """The best-ranked leaderboard entry with a shift-invariant feature set, or None"""
+    return next((entry for entry in leaderboard if shift_invariant(entry['features'])), None)
+
+def train_best(data, candidate, cache_dir=FEATURE_CACHE_DIR):
+    """Refit a candidate on all the data and compile it for serving"""
+    feature_dir, _ = build_feature_cache(data, cache_dir)
+    X, y, _ = _load_features(feature_dir, candidate['features'])
+    coef, intercept, link = fit_candidate(candidate, np.asarray(X), np.asarray(y))
+    return compile_candidate(candidate, coef, intercept, link)
+
+def register_best(data, leaderboard, registry_dir=REGISTRY_DIR, activate=False, cache_dir=FEATURE_CACHE_DIR):
+    """
+    Refit the best servable candidate (see shift_invariant) on all the data
+    and publish it to the model registry with its walk-forward metrics.
+
+    Returns:
+        The registered version
+
+    Raises:
+        ValueError if no candidate on the leaderboard is servable
+    """
+    best = servable_best(leaderboard)
+    if best is None:
+        raise ValueError("No shift-invariant candidate on the leaderboard to register")
+    compiled = train_best(data, best, cache_dir)
+    metadata = {
+        'model_type': best['name'],
+        'rank': best['rank'],
+        'features': list(compiled.feature_names),
+        'link': compiled.link,
+        'targets': TARGETS,
+        'training_data_hash': data_hash(data),
+        'training_rows': int(len(data)),
+        'metrics': {metric: best[metric] for metric in ('log_loss', 'brier', 'poisson_deviance', 'mae_home', 'mae_away')},
+        'validation': f"walk-forward by season, {best['folds']} folds"
+    }
+    return ModelRegistry(registry_dir).publish(compiled.to_arrays(), metadata, activate=activate)
+
+def format_leaderboard(leaderboard):
+    """Render the leaderboard as a text table"""
+    lines = [f"{'rank':>4}  {'candidate':<32} {'log loss':>9} {'brier':>7} {'deviance':>9} {'mae h':>6} {'mae a':>6}"]
+    for entry in leaderboard:
+        lines.append(
+            f"{entry['rank']:>4}  {entry['name']:<32} {entry['log_loss']:9.4f} {entry['brier']:7.4f} "
+            f"{entry['poisson_deviance']:9.4f} {entry['mae_home']:6.3f} {entry['mae_away']:6.3f}"
+        )
+    return '\n'.join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward model search over the match history")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--min-train-seasons', type=int, default=5)
+    parser.add_argument('--leaderboard', default=LEADERBOARD_PATH)
+    parser.add_argument('--registry', default=REGISTRY_DIR)
+    parser.add_argument('--activate', action='store_true', help="make the best model the served version")
+    parser.add_argument('--no-register', action='store_true', help="only print the leaderboard")
+    args = parser.parse_args(argv)
+
+    from src.historical_elo import historical_elo_features
+    started = time.perf_counter()
+    data = historical_elo_features()
+    if data is None:
+        print("Could not build training data")
+        return 1
+
+    leaderboard = run_search(data, min_train_seasons=args.min_train_seasons, workers=args.workers)
+    print(format_leaderboard(leaderboard))
+    print(f"\n{len(leaderboard)} candidates x {leaderboard[0]['folds']} folds in {time.perf_counter() - started:.1f}s")
+
+    os.makedirs(os.path.dirname(args.leaderboard) or '.', exist_ok=True)
+    tmp_path = f"{args.leaderboard}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(leaderboard, f, indent=2)
+    os.replace(tmp_path, args.leaderboard)
+
+    if not args.no_register:
+        best = servable_best(leaderboard)
+        if best is None:
+            print("No shift-invariant candidate to register")
+            return 1
+        version = register_best(data, leaderboard, args.registry, activate=args.activate)
+        print(f"Best servable model {best['name']} (rank {best['rank']}) registered as version {version}"
+              + (" (active)" if args.activate else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,20 @@
 import os
 import pickle
 import sys
+import hashlib
 import numpy as np
+import pandas as pd
 
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score, mean_absolute_error
 
 from error_reporting import log_error
+from linear_model import LinearGoalsModel, matches_model
+from model_registry import ModelRegistry
+
+FEATURES = ['home_elo', 'away_elo']
+TARGETS = ['fth_goals', 'fta_goals']
 
 # When splitting files, uncomment the next line:
 # from error_reporting import log_error
@@ -17,34 +24,54 @@ def train_model(data):
     Train a linear regression model to predict [fth_goals, fta_goals] from [home_elo, away_elo].
     """
     try:
-        X = data[['home_elo', 'away_elo']]
-        y = data[['fth_goals', 'fta_goals']].values
+        X = data[FEATURES]
+        y = data[TARGETS].values
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         model = LinearRegression()
         model.fit(X_train, y_train)
         # Evaluate performance (for logging purposes)
-        y_pred = model.predict(X_test)
-        r2 = r2_score(y_test, y_pred, multioutput='uniform_average')
-        mae_home = mean_absolute_error(y_test[:, 0], y_pred[:, 0])
-        mae_away = mean_absolute_error(y_test[:, 1], y_pred[:, 1])
+        metrics = evaluate_model(model, X_test, y_test)
         print("\n--- Model Performance on Test Data (Unrounded) ---")
-        print(f"R² Score (overall): {r2:.4f}")
-        print(f"MAE Home Goals: {mae_home:.4f}, MAE Away Goals: {mae_away:.4f}")
+        print(f"R² Score (overall): {metrics['r2']:.4f}")
+        print(f"MAE Home Goals: {metrics['mae_home']:.4f}, MAE Away Goals: {metrics['mae_away']:.4f}")
         return model, X_train, X_test, y_train, y_test, data
     except Exception as e:
         log_error(f"Error in train_model: {e}")
         sys.exit(1)
 
+def evaluate_model(model, X_test, y_test):
+    """
+    Return test-set metrics: overall R² and per-side mean absolute error.
+    """
+    y_pred = model.predict(X_test)
+    return {
+        'r2': float(r2_score(y_test, y_pred, multioutput='uniform_average')),
+        'mae_home': float(mean_absolute_error(y_test[:, 0], y_pred[:, 0])),
+        'mae_away': float(mean_absolute_error(y_test[:, 1], y_pred[:, 1]))
+    }
+
+def hash_training_data(data, columns=FEATURES + TARGETS):
+    """
+    Return a SHA-1 of the training columns, recorded with each registered model.
+    """
+    row_hashes = pd.util.hash_pandas_object(data[columns], index=False)
+    return hashlib.sha1(row_hashes.to_numpy().tobytes()).hexdigest()
+
 def pickle_model(model, filename="models/elo_model.pkl"):
     """
-    Pickle the trained model to disk.
+    Pickle the trained model to disk (written to a temporary file and
+    renamed, so a worker never loads a half-written pickle).
     """
     try:
         os.makedirs("models", exist_ok=True)
-        with open(filename, "wb") as f:
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "wb") as f:
             pickle.dump(model, f)
+        os.replace(tmp_filename, filename)
         print(f"Model pickled to {filename}")
+        # Keep the sklearn-free export in step with the pickle the app falls back to
+        export_linear_model(model, filename=os.path.splitext(filename)[0] + ".npz")
     except Exception as e:
         log_error(f"Error in pickle_model: {e}")
 
@@ -58,4 +85,56 @@ def load_model(filename="models/elo_model.pkl"):
         return model
     except Exception as e:
         log_error(f"Error in load_model: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+def compile_model(model, X_check=None):
+    """
+    Compile a trained model for sklearn-free inference, checking the result
+    reproduces model.predict exactly on X_check (by default a grid of ELO
+    ratings from 1000 to 2300).
+    """
+    if X_check is None:
+        elos = np.arange(1000, 2301, 10, dtype=float)
+        X_check = np.array(np.meshgrid(elos, elos)).reshape(2, -1).T
+    compiled = LinearGoalsModel.from_sklearn(model)
+    if not matches_model(compiled, model, X_check):
+        raise ValueError("exported coefficients do not reproduce model.predict")
+    return compiled
+
+def export_linear_model(model, X_check=None, filename="models/elo_model.npz"):
+    """
+    Export the coefficients of a trained model for sklearn-free inference.
+    """
+    try:
+        compiled = compile_model(model, X_check)
+        os.makedirs("models", exist_ok=True)
+        compiled.save(filename)
+        print(f"Model coefficients exported to {filename}")
+        return compiled
+    except Exception as e:
+        log_error(f"Error in export_linear_model: {e}")
+        sys.exit(1)
+
+def register_model(model, data, X_test, y_test, registry_dir="models/registry", activate=True):
+    """
+    Publish a trained model to the model registry with its features,
+    training data hash and test metrics. Running workers swap it in
+    between requests once it is activated.
+    """
+    try:
+        compiled = compile_model(model)
+        metadata = {
+            'model_type': type(model).__name__,
+            'features': list(compiled.feature_names),
+            'link': compiled.link,
+            'targets': TARGETS,
+            'training_data_hash': hash_training_data(data),
+            'training_rows': int(len(data)),
+            'metrics': evaluate_model(model, X_test, y_test)
+        }
+        version = ModelRegistry(registry_dir).publish(compiled.to_arrays(), metadata, activate=activate)
+        print(f"Model registered as version {version}")
+        return version
+    except Exception as e:
+        log_error(f"Error in register_model: {e}")
+        sys.exit(1)
@@ -1,8 +1,14 @@
 import math
 import sys
-import pandas as pd
+import logging
+import numpy as np
 
+from src import metrics
 from src.error_reporting import log_error
+from src.scorelines import fixture_markets, format_markets
+
+# Configure logging
+logger = logging.getLogger(__name__)
 
 def get_team_list(elo_df):
     """
@@ -39,7 +45,19 @@ def prompt_user_for_teams(team_list):
         log_error(f"Error in prompt_user_for_teams: {e}")
         sys.exit(1)
 
-def predict_match(model, home_team, away_team, custom_elos=None):
+def resolve_elos(home_team, away_team, custom_elos, ratings):
+    """
+    Return the (home_elo, away_elo) a prediction uses: the custom ratings if
+    both teams have one, otherwise the current ratings (None if missing).
+    """
+    if custom_elos:
+        home_elo = custom_elos.get(home_team)
+        away_elo = custom_elos.get(away_team)
+        if home_elo is not None and away_elo is not None:
+            return home_elo, away_elo
+    return ratings.get(home_team), ratings.get(away_team)
+
+def predict_match(model, home_team, away_team, custom_elos=None, snapshot=None):
     """
     Predict match outcome using the trained model and ELO ratings.
     
@@ -48,107 +66,182 @@ def predict_match(model, home_team, away_team, custom_elos=None):
         home_team: Name of the home team
         away_team: Name of the away team
         custom_elos: Dictionary of custom ELO ratings {team_name: rating}
+        snapshot: EloSnapshot holding the current ELO ratings
     
     Returns:
         Dictionary containing prediction results
     """
     try:
-        # Load ELO data
-        elo_data = load_elo_data()
-        if elo_data is None or elo_data.empty:
+        if snapshot is None or len(snapshot) == 0:
+            logger.error("No ELO snapshot available for prediction")
             return None
             
-        # Get ELO ratings
-        home_elo = None
-        away_elo = None
-        
-        # Check for custom ELO ratings first
-        if custom_elos:
-            home_elo = custom_elos.get(home_team)
-            away_elo = custom_elos.get(away_team)
-        
-        # If no custom ratings, use database values
+        # Get ELO ratings, custom ratings first
+        started = metrics.start()
+        home_elo, away_elo = resolve_elos(home_team, away_team, custom_elos, snapshot.ratings)
+        started = metrics.lap('elo_lookup', started)
         if home_elo is None or away_elo is None:
-            home_row = elo_data[elo_data['Team'] == home_team]
-            away_row = elo_data[elo_data['Team'] == away_team]
-            
-            if home_row.empty or away_row.empty:
-                return None
-                
-            home_elo = home_row['Elo'].iloc[0]
-            away_elo = away_row['Elo'].iloc[0]
+            return None
         
         # Prepare features for prediction
         features = [[home_elo, away_elo]]
         
         # Get prediction
         prediction = model.predict(features)[0]
+        started = metrics.lap('model', started)
         
         # Calculate expected goals
         home_score = round(prediction[0], 1)
         away_score = round(prediction[1], 1)
         
-        # Calculate probabilities based on expected goals
-        total_goals = home_score + away_score
-        if total_goals > 0:
-            home_prob = round((home_score / total_goals) * 100, 1)
-            away_prob = round((away_score / total_goals) * 100, 1)
-            draw_prob = round(100 - home_prob - away_prob, 1)
-        else:
-            home_prob = 33.3
-            away_prob = 33.3
-            draw_prob = 33.4
-        
-        # Get betting odds and previous matchups
-        odds = print_betting_odds({
-            'home_prob': home_prob,
-            'draw_prob': draw_prob,
-            'away_prob': away_prob
-        })
+        # Calculate probabilities from the Poisson scoreline grid
+        home_prob, draw_prob, away_prob, markets = outcome_probabilities([prediction[0]], [prediction[1]])
+        started = metrics.lap('probabilities', started)
         
-        matchups = print_previous_matchups(home_team, away_team)
+        # Price the outcomes from the same grid (previous matchups are attached by the caller)
+        odds = format_betting_odds(*(float(o[0]) for o in market_odds(markets)))
+        metrics.lap('odds', started)
         
         return {
             'home_team': home_team,
             'away_team': away_team,
             'home_score': home_score,
             'away_score': away_score,
-            'home_prob': home_prob,
-            'draw_prob': draw_prob,
-            'away_prob': away_prob,
+            'home_prob': float(home_prob[0]),
+            'draw_prob': float(draw_prob[0]),
+            'away_prob': float(away_prob[0]),
             'elo_diff': home_elo - away_elo,
             'betting_odds': odds,
-            'previous_matchups': matchups
+            'markets': format_markets(markets, 0)
         }
         
     except Exception as e:
         logger.error(f"Error in predict_match: {str(e)}")
         return None
 
+def predict_matches(model, fixtures, custom_elos=None, snapshot=None):
+    """
+    Predict a batch of fixtures with a single model call.
+    
+    Args:
+        model: The trained model
+        fixtures: List of fixtures, each a dict with 'home_team' and 'away_team'
+            keys (and optionally its own 'custom_elos') or a (home, away) pair
+        custom_elos: Dictionary of custom ELO ratings {team_name: rating}
+            applied to every fixture
+        snapshot: EloSnapshot holding the current ELO ratings
+    
+    Returns:
+        List of prediction dictionaries in fixture order, with None for any
+        fixture whose ELO ratings could not be found
+    """
+    try:
+        if snapshot is None or len(snapshot) == 0:
+            logger.error("No ELO snapshot available for prediction")
+            return None
+        ratings = snapshot.ratings
+        
+        # Resolve ELO ratings for every fixture up front
+        started = metrics.start()
+        teams = []
+        rows = []
+        for fixture in fixtures:
+            if isinstance(fixture, dict):
+                home_team = fixture.get('home_team')
+                away_team = fixture.get('away_team')
+                fixture_elos = fixture.get('custom_elos') or custom_elos
+            else:
+                home_team, away_team = fixture
+                fixture_elos = custom_elos
+            
+            home_elo, away_elo = resolve_elos(home_team, away_team, fixture_elos, ratings)
+            teams.append((home_team, away_team))
+            rows.append(None if home_elo is None or away_elo is None else (home_elo, away_elo))
+        
+        resolved = [i for i, row in enumerate(rows) if row is not None]
+        results = [None] * len(rows)
+        started = metrics.lap('elo_lookup', started)
+        if not resolved:
+            return results
+        
+        # One model call over the whole feature matrix
+        features = np.array([rows[i] for i in resolved], dtype=float)
+        prediction = np.asarray(model.predict(features))
+        started = metrics.lap('model', started)
+        home_score = np.round(prediction[:, 0], 1)
+        away_score = np.round(prediction[:, 1], 1)
+        home_prob, draw_prob, away_prob, markets = outcome_probabilities(prediction[:, 0], prediction[:, 1])
+        started = metrics.lap('probabilities', started)
+        
+        elo_diff = features[:, 0] - features[:, 1]
+        odds_home, odds_draw, odds_away = market_odds(markets)
+        started = metrics.lap('odds', started)
+        
+        for row, i in enumerate(resolved):
+            home_team, away_team = teams[i]
+            results[i] = {
+                'home_team': home_team,
+                'away_team': away_team,
+                'home_score': float(home_score[row]),
+                'away_score': float(away_score[row]),
+                'home_prob': float(home_prob[row]),
+                'draw_prob': float(draw_prob[row]),
+                'away_prob': float(away_prob[row]),
+                'elo_diff': float(elo_diff[row]),
+                'betting_odds': format_betting_odds(odds_home[row], odds_draw[row], odds_away[row]),
+                'markets': format_markets(markets, row)
+            }
+        metrics.lap('format', started)
+        return results
+        
+    except Exception as e:
+        logger.error(f"Error in predict_matches: {str(e)}")
+        return None
+
+def outcome_probabilities(home_xg, away_xg):
+    """
+    Win/draw/loss probabilities from the Poisson scoreline grid of each fixture.
+    Returns (home_prob, draw_prob, away_prob, markets): percent arrays plus the
+    full market arrays from src.scorelines.
+    """
+    markets = fixture_markets(home_xg, away_xg)
+    home_prob = np.round(markets['home_win'] * 100, 1)
+    draw_prob = np.round(markets['draw'] * 100, 1)
+    away_prob = np.round(markets['away_win'] * 100, 1)
+    return home_prob, draw_prob, away_prob, markets
+
+def market_odds(markets):
+    """
+    Fair decimal odds (1 / probability, no margin) for each outcome, priced
+    from the same scoreline grid as outcome_probabilities.
+    Returns (home, draw, away) arrays.
+    """
+    with np.errstate(divide='ignore'):
+        return tuple(np.where(markets[key] > 0, 1 / markets[key], np.inf)
+                     for key in ('home_win', 'draw', 'away_win'))
+
 def print_previous_matchups(data, home_team, away_team):
-    results = []
+    """
+    Return previous matchups between two teams as a list of strings.
+    
+    Args:
+        data: HeadToHeadIndex built from the match data
+        home_team: Name of the home team
+        away_team: Name of the away team
+    """
     try:
-        # Ensure both sides are compared in lowercase
-        home_team_lower = home_team.lower()
-        away_team_lower = away_team.lower()
-        matchups = data[
-            ((data['home_team'].str.lower() == home_team_lower) & (data['away_team'].str.lower() == away_team_lower)) |
-            ((data['home_team'].str.lower() == away_team_lower) & (data['away_team'].str.lower() == home_team_lower))
-        ]
-        if matchups.empty:
-            results.append("No previous matchups found between these teams.")
-        else:
-            results.append("--- Previous Matchups ---")
-            for idx, row in matchups.iterrows():
-                season = row['season']
-                results.append(f"Season: {season}, {row['home_team'].title()} {row['fth_goals']} - {row['fta_goals']} {row['away_team'].title()}")
+        started = metrics.start()
+        lines = data.render(home_team, away_team)
+        metrics.lap('head_to_head', started)
+        return lines
     except Exception as e:
-        results.append("Error occurred while retrieving previous matchups.")
-    return results
+        logger.error(f"Error in print_previous_matchups: {e}")
+        return ["Error occurred while retrieving previous matchups."]
 
 def print_betting_odds(elo_diff):
     """
-    Return betting odds (in decimal format) for each outcome as a list of strings.
+    Legacy: betting odds (in decimal format) from the ELO difference alone, as
+    a list of strings. Predictions price their odds with market_odds instead.
     """
     E_home = 1 / (1 + math.pow(10, -elo_diff / 400))
     P_draw = 0.30 * math.exp(-abs(elo_diff) / 400)
@@ -159,6 +252,30 @@ def print_betting_odds(elo_diff):
     odds_draw = 1 / P_draw if P_draw > 0 else float('inf')
     odds_away_win = 1 / P_away_win if P_away_win > 0 else float('inf')
 
+    return format_betting_odds(odds_home_win, odds_draw, odds_away_win)
+
+def betting_odds(elo_diff):
+    """
+    Legacy: vectorised version of print_betting_odds, kept as the
+    model-independent bookmaker market that src.backtest bets against.
+    Returns (home, draw, away) decimal odds arrays for an array of ELO differences.
+    """
+    elo_diff = np.asarray(elo_diff, dtype=float)
+    E_home = 1 / (1 + np.power(10.0, -elo_diff / 400))
+    P_draw = 0.30 * np.exp(-np.abs(elo_diff) / 400)
+    P_home_win = E_home - 0.5 * P_draw
+    P_away_win = 1 - P_home_win - P_draw
+
+    with np.errstate(divide='ignore'):
+        odds_home_win = np.where(P_home_win > 0, 1 / P_home_win, np.inf)
+        odds_draw = np.where(P_draw > 0, 1 / P_draw, np.inf)
+        odds_away_win = np.where(P_away_win > 0, 1 / P_away_win, np.inf)
+    return odds_home_win, odds_draw, odds_away_win
+
+def format_betting_odds(odds_home_win, odds_draw, odds_away_win):
+    """
+    Format decimal odds as the list of strings shown to the user.
+    """
     lines = []
     lines.append("--- Betting Odds (Decimal Format) ---")
     lines.append(f"Home Win Odds: {odds_home_win:.2f}")
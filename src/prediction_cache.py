@@ -0,0 +1,92 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results with an optional TTL.
+
+    Entries belong to a generation (the ELO snapshot and model versions they
+    were computed from). invalidate() with a new generation drops every
+    entry; lookups and stores for any other generation bypass the cache, so
+    a request still holding an old snapshot cannot repopulate it.
+    """
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        Args:
+            maxsize: Maximum number of cached results
+            ttl: Seconds an entry stays valid (None or 0 for no expiry)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        self.generation = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self, generation):
+        """Drop every entry and start caching for a new generation"""
+        with self._lock:
+            if generation == self.generation:
+                return
+            self.generation = generation
+            self._entries.clear()
+            self.invalidations += 1
+        logger.info(f"Prediction cache invalidated for {generation}")
+
+    def get(self, key, generation):
+        """Return the cached result for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key) if generation == self.generation else None
+            if entry is not None:
+                value, expires = entry
+                if expires is not None and expires < time.monotonic():
+                    del self._entries[key]
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value, generation):
+        """Cache a result computed for generation"""
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
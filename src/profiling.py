@@ -0,0 +1,110 @@
+import os
+import io
+import json
+import time
+import logging
+import itertools
+import threading
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rows of the text summary written next to each profile
+SUMMARY_ROWS = 40
+
+class RequestProfiler:
+    """
+    Opt-in cProfile hook for individual requests.
+
+    A request is profiled when its trigger asks for it (a header or query
+    parameter, checked against token if one is set) or, with sample_rate N,
+    for one in every N requests. Each profile is written to directory as
+    <stamp>-<route>.prof (pstats, for snakeviz or pstats.Stats), a .txt
+    summary of the slowest functions and a .json file with the route,
+    timing and data versions. Only the newest keep profiles are kept.
+
+    While disabled, the per-request cost is one attribute check.
+    """
+    def __init__(self, directory, enabled=False, sample_rate=0, token=None, keep=200):
+        self.directory = directory
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.token = token or None
+        self.keep = keep
+        self._requests = itertools.count(1)
+        self._profiles = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def wanted(self, trigger):
+        """
+        Decide whether to profile a request.
+
+        Args:
+            trigger: Value of the profiling header or query parameter, or None
+        """
+        if not self.enabled:
+            return False
+        if trigger and (self.token is None or trigger == self.token):
+            return True
+        return bool(self.sample_rate) and next(self._requests) % self.sample_rate == 0
+
+    def start(self):
+        """Start profiling the current thread; pass the result to finish()"""
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile, time.perf_counter()
+
+    def finish(self, started, route, metadata=None):
+        """
+        Stop a profile from start() and write it out.
+
+        Args:
+            started: Result of start()
+            route: Route the request was served by
+            metadata: Extra JSON-serialisable details (status, data versions...)
+
+        Returns:
+            Name of the written profile (without extension), or None on failure
+        """
+        profile, started_at = started
+        profile.disable()
+        elapsed = time.perf_counter() - started_at
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            slug = route.strip('/').replace('/', '_').replace('<', '').replace('>', '') or 'index'
+            name = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{os.getpid()}-{next(self._profiles)}-{slug}"
+            path = os.path.join(self.directory, name)
+            profile.dump_stats(f"{path}.prof")
+
+            import pstats
+            summary = io.StringIO()
+            stats = pstats.Stats(profile, stream=summary)
+            stats.sort_stats('cumulative').print_stats(SUMMARY_ROWS)
+            with open(f"{path}.txt", 'w') as f:
+                f.write(f"{route} {elapsed * 1000:.2f} ms\n")
+                f.write(summary.getvalue())
+
+            with open(f"{path}.json", 'w') as f:
+                json.dump(dict(metadata or {}, route=route, seconds=elapsed, pid=os.getpid(),
+                               profiled_at=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+                          f, indent=2, default=str)
+            self._prune()
+            logger.info(f"Profiled {route} in {elapsed * 1000:.1f} ms: {path}.prof")
+            return name
+        except Exception as e:
+            logger.error(f"Error writing request profile: {e}")
+            return None
+
+    def _prune(self):
+        """Delete the oldest profiles beyond keep"""
+        if not self.keep:
+            return
+        with self._lock:
+            names = sorted(name[:-len('.json')] for name in os.listdir(self.directory) if name.endswith('.json'))
+            for name in names[:-self.keep]:
+                for extension in ('.prof', '.txt', '.json'):
+                    try:
+                        os.remove(os.path.join(self.directory, name + extension))
+                    except FileNotFoundError:
+                        pass
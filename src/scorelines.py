@@ -0,0 +1,150 @@
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Grids cover 0..MAX_GOALS goals per side; the last row/column holds the tail
+MAX_GOALS = 10
+OVER_UNDER_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+# Number of most likely scorelines reported in the correct-score market
+CORRECT_SCORES = 5
+# Expected goals are rounded to this step before grids are built or cached
+XG_QUANTUM = 0.01
+# Lowest expected goals used for a grid (the linear model can go negative)
+MIN_EXPECTED_GOALS = 0.05
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_HOME_WIN = _GOALS[:, None] > _GOALS[None, :]
+_DRAW = _GOALS[:, None] == _GOALS[None, :]
+_AWAY_WIN = _GOALS[:, None] < _GOALS[None, :]
+_TOTALS = _GOALS[:, None] + _GOALS[None, :]
+_OVER = np.stack([_TOTALS > line for line in OVER_UNDER_LINES])
+
+def quantize_xg(expected_goals):
+    """Clip and round expected goals to the grid/cache resolution"""
+    expected_goals = np.maximum(np.asarray(expected_goals, dtype=float), MIN_EXPECTED_GOALS)
+    return np.round(expected_goals / XG_QUANTUM) * XG_QUANTUM
+
+def poisson_pmf(expected_goals):
+    """
+    Poisson probabilities of 0..MAX_GOALS goals for each expected-goals value,
+    with the mass above MAX_GOALS folded into the last column.
+    """
+    expected_goals = np.asarray(expected_goals, dtype=float)[:, None]
+    log_pmf = _GOALS * np.log(expected_goals) - expected_goals - np.cumsum(np.log(np.maximum(_GOALS, 1)))
+    pmf = np.exp(log_pmf)
+    pmf[:, -1] += np.maximum(0.0, 1.0 - pmf.sum(axis=1))
+    return pmf
+
+def score_grids(home_xg, away_xg):
+    """
+    Independent-Poisson scoreline grids for a batch of fixtures.
+
+    Returns:
+        (n_fixtures, MAX_GOALS + 1, MAX_GOALS + 1) array; [f, h, a] is the
+        probability that fixture f finishes h-a
+    """
+    return poisson_pmf(home_xg)[:, :, None] * poisson_pmf(away_xg)[:, None, :]
+
+class GridCache:
+    """
+    Bounded LRU of scoreline grids keyed by quantized (home_xg, away_xg).
+    Misses in a batch are computed together in one vectorised call.
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._grids = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._grids)
+
+    def grids(self, home_xg, away_xg):
+        """Return grids for a batch of fixtures, computing only uncached ones"""
+        home_xg = quantize_xg(home_xg)
+        away_xg = quantize_xg(away_xg)
+        keys = list(zip(np.rint(home_xg / XG_QUANTUM).astype(int).tolist(),
+                        np.rint(away_xg / XG_QUANTUM).astype(int).tolist()))
+        out = np.empty((len(keys), MAX_GOALS + 1, MAX_GOALS + 1))
+
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                grid = self._grids.get(key)
+                if grid is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._grids.move_to_end(key)
+                    out[i] = grid
+            n_missing = sum(len(positions) for positions in missing.values())
+            self.hits += len(keys) - n_missing
+            self.misses += n_missing
+
+        if missing:
+            rows = [positions[0] for positions in missing.values()]
+            new_grids = score_grids(home_xg[rows], away_xg[rows])
+            with self._lock:
+                for (key, positions), grid in zip(missing.items(), new_grids):
+                    grid.flags.writeable = False
+                    self._grids[key] = grid
+                    out[positions] = grid
+                while len(self._grids) > self.maxsize:
+                    self._grids.popitem(last=False)
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._grids.clear()
+
+# Process-wide grid cache shared by every prediction path
+grid_cache = GridCache()
+
+def grid_markets(grids):
+    """
+    Derive betting markets from a batch of scoreline grids.
+
+    Returns:
+        Dictionary of arrays over fixtures: 'home_win', 'draw', 'away_win',
+        'over' (n_fixtures, len(OVER_UNDER_LINES)), 'btts', and
+        'correct_scores' / 'correct_score_probs' for the most likely scorelines
+    """
+    n = len(grids)
+    flat = grids.reshape(n, -1)
+    top = np.argsort(-flat, axis=1)[:, :CORRECT_SCORES]
+    return {
+        'home_win': flat @ _HOME_WIN.ravel(),
+        'draw': flat @ _DRAW.ravel(),
+        'away_win': flat @ _AWAY_WIN.ravel(),
+        'over': flat @ _OVER.reshape(len(OVER_UNDER_LINES), -1).T,
+        'btts': grids[:, 1:, 1:].sum(axis=(1, 2)),
+        'correct_scores': np.stack(np.divmod(top, MAX_GOALS + 1), axis=-1),
+        'correct_score_probs': np.take_along_axis(flat, top, axis=1)
+    }
+
+def fixture_markets(home_xg, away_xg, cache=grid_cache):
+    """Markets for a batch of fixtures from (cached) scoreline grids"""
+    return grid_markets(cache.grids(home_xg, away_xg))
+
+def format_markets(markets, i):
+    """
+    Render the over/under, both-teams-to-score and correct-score markets of
+    fixture i as percentages.
+    """
+    over = markets['over'][i]
+    btts = float(markets['btts'][i])
+    return {
+        'over_under': {
+            str(line): {'over': round(float(p) * 100, 1), 'under': round((1 - float(p)) * 100, 1)}
+            for line, p in zip(OVER_UNDER_LINES, over)
+        },
+        'btts': {'yes': round(btts * 100, 1), 'no': round((1 - btts) * 100, 1)},
+        'correct_score': [
+            {'score': f"{home}-{away}", 'prob': round(float(p) * 100, 1)}
+            for (home, away), p in zip(markets['correct_scores'][i].tolist(), markets['correct_score_probs'][i])
+        ]
+    }
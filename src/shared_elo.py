@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an unlocked store
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SharedEloStore:
+    """
+    ELO ratings shared between worker processes through one snapshot file.
+
+    The file carries a version number and fetch time alongside the ratings.
+    Writers serialise on a lock file and replace the snapshot atomically, so
+    a reader only ever sees a complete version. Workers detect a new version
+    with a single stat() call.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.refresh_lock_path = f"{path}.refresh.lock"
+
+    def stamp(self):
+        """Cheap change marker for the snapshot file, or None if it is missing"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def read(self):
+        """
+        Read the current snapshot.
+
+        Returns:
+            (elo_df, version, fetched_at) or (None, 0, None) if there is none
+        """
+        import pandas as pd
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            elo_df = pd.DataFrame({"Team": data['teams'], "Elo": data['elos']})
+            if elo_df.empty:
+                return None, 0, None
+            return elo_df, data['version'], data['fetched_at']
+        except FileNotFoundError:
+            return None, 0, None
+        except Exception as e:
+            logger.error(f"Error reading shared ELO snapshot {self.path}: {e}")
+            return None, 0, None
+
+    def read_header(self):
+        """Return (version, fetched_at) of the current snapshot, or (0, None)"""
+        _, version, fetched_at = self.read()
+        return version, fetched_at
+
+    def write(self, elo_df, fetched_at=None):
+        """
+        Publish ELO data as the next version. Call while holding lock().
+
+        Returns:
+            The new version number
+        """
+        version, _ = self.read_header()
+        version += 1
+        data = {
+            'version': version,
+            'fetched_at': fetched_at or time.time(),
+            'teams': elo_df['Team'].tolist(),
+            'elos': [int(elo) for elo in elo_df['Elo']]
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        return version
+
+    def lock(self):
+        """Hold an exclusive cross-process lock while writing the snapshot"""
+        return _flock(self.lock_path)
+
+    def refresh_lock(self):
+        """
+        Hold an exclusive cross-process lock while fetching new data, so one
+        fetch serves every worker. It is separate from lock() so that slow
+        fetches and their retries never hold up writers.
+        """
+        return _flock(self.refresh_lock_path)
+
+@contextmanager
+def _flock(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,183 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from src.scorelines import MIN_EXPECTED_GOALS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Simulations per chunk; chunks are the unit of seeding and of parallel work,
+# so results for a given seed do not depend on the number of processes
+CHUNK_SIZE = 5000
+
+# Teams in the league; relegation is only reported for a whole league
+LEAGUE_SIZE = 20
+
+def poisson_cdf_table(expected_goals, tail=1e-7):
+    """
+    Cumulative Poisson probabilities P(X <= k) for every fixture.
+
+    Returns:
+        (max_goals, n_fixtures) float32 array, with max_goals chosen so the
+        probability mass beyond it is below tail for every fixture
+    """
+    expected_goals = np.asarray(expected_goals, dtype=float)
+    pmf = np.exp(-expected_goals)
+    cdf = [pmf.copy()]
+    k = 0
+    while len(expected_goals) and cdf[-1].min() < 1 - tail:
+        k += 1
+        pmf = pmf * expected_goals / k
+        cdf.append(cdf[-1] + pmf)
+    return np.array(cdf, dtype=np.float32)
+
+def _draw_goals(rng, cdf, n_sims):
+    """Inverse-CDF Poisson draws: goals = number of CDF steps below a uniform"""
+    uniforms = rng.random((n_sims, cdf.shape[1]), dtype=np.float32)
+    goals = np.zeros(uniforms.shape, dtype=np.int8)
+    above = np.empty(uniforms.shape, dtype=bool)
+    for step in cdf:
+        np.greater(uniforms, step, out=above)
+        goals += above
+    return goals
+
+def _simulate_chunk(home_cdf, away_cdf, home_idx, away_idx, base_points, base_gd, base_gf, n_sims, seed):
+    """
+    Simulate n_sims completions of the season.
+
+    Returns:
+        (position_counts, points_sum) where position_counts[t, p] counts the
+        simulations in which team t finished in position p (0 = top)
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_points)
+    n_fixtures = len(home_idx)
+
+    home_goals = _draw_goals(rng, home_cdf, n_sims)
+    away_goals = _draw_goals(rng, away_cdf, n_sims)
+
+    # Fixture -> team incidence matrices turn per-fixture results into table columns
+    home_of = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    away_of = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    home_of[np.arange(n_fixtures), home_idx] = 1
+    away_of[np.arange(n_fixtures), away_idx] = 1
+
+    draws = (home_goals == away_goals).astype(np.float32)
+    home_points = 3 * (home_goals > away_goals).astype(np.float32) + draws
+    away_points = 3 * (away_goals > home_goals).astype(np.float32) + draws
+    home_goals = home_goals.astype(np.float32)
+    away_goals = away_goals.astype(np.float32)
+    points = base_points + home_points @ home_of + away_points @ away_of
+    scored = home_goals @ home_of + away_goals @ away_of
+    conceded = home_goals @ away_of + away_goals @ home_of
+    goals_for = base_gf + scored
+    goal_diff = base_gd + scored - conceded
+
+    # Rank on points, then goal difference, then goals scored, then a coin toss
+    coin = rng.integers(0, 1024, size=points.shape)
+    order = np.lexsort((-coin, -np.rint(goals_for), -np.rint(goal_diff), -np.rint(points)), axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(n_teams)[None, :].repeat(n_sims, axis=0), axis=1)
+
+    flat = (np.arange(n_teams)[None, :] * n_teams + positions).ravel()
+    position_counts = np.bincount(flat, minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+    return position_counts, points.sum(axis=0)
+
+def simulate_season(model, fixtures, snapshot, table=None, n_sims=10000, seed=None,
+                    processes=1, relegation_places=3, league_size=LEAGUE_SIZE):
+    """
+    Monte Carlo simulation of the rest of a season.
+
+    Args:
+        model: The trained goals model
+        fixtures: Remaining fixtures as (home_team, away_team) pairs or dicts
+            with 'home_team' and 'away_team' keys
+        snapshot: EloSnapshot with ratings for every team in the fixtures
+        table: Current standings {team: {'points', 'goal_diff', 'goals_for'}};
+            teams missing from it start from zero
+        n_sims: Number of simulated seasons
+        seed: Seed for reproducible results (the same for any process count)
+        processes: Worker processes to spread the chunks over
+        relegation_places: Number of places relegated
+        league_size: Number of teams in the league
+
+    Returns:
+        Dictionary with per-team expected points, title, top-four and
+        relegation probabilities and finishing-position distributions,
+        sorted by expected points. relegation_prob is None (and
+        complete_league False) unless the simulation covers all league_size
+        teams and starts from either the current table or a full season of
+        fixtures; for anything less the bottom places are not relegation.
+    """
+    try:
+        table = table or {}
+        pairs = [
+            (fixture['home_team'], fixture['away_team']) if isinstance(fixture, dict) else tuple(fixture)
+            for fixture in fixtures
+        ]
+        teams = sorted({team for pair in pairs for team in pair} | set(table))
+        index = {team: i for i, team in enumerate(teams)}
+        n_teams = len(teams)
+        full_season = len(set(pairs)) == n_teams * (n_teams - 1)
+        complete = n_teams == league_size and (bool(table) or full_season)
+
+        missing = sorted({team for pair in pairs for team in pair if snapshot.get(team) is None})
+        if missing:
+            logger.error(f"No ELO rating for: {', '.join(missing)}")
+            return None
+
+        # Expected goals for every fixture from one model call
+        home_idx = np.array([index[home] for home, _ in pairs], dtype=np.intp)
+        away_idx = np.array([index[away] for _, away in pairs], dtype=np.intp)
+        features = np.array([[snapshot.get(home), snapshot.get(away)] for home, away in pairs], dtype=float)
+        expected = np.asarray(model.predict(features)).reshape(-1, 2) if pairs else np.zeros((0, 2))
+        expected = np.maximum(expected, MIN_EXPECTED_GOALS)
+        home_cdf = poisson_cdf_table(expected[:, 0])
+        away_cdf = poisson_cdf_table(expected[:, 1])
+
+        base_points = np.array([table.get(team, {}).get('points', 0) for team in teams], dtype=float)
+        base_gd = np.array([table.get(team, {}).get('goal_diff', 0) for team in teams], dtype=float)
+        base_gf = np.array([table.get(team, {}).get('goals_for', 0) for team in teams], dtype=float)
+
+        # Fixed chunking + spawned seeds keep results independent of process count
+        chunks = [min(CHUNK_SIZE, n_sims - start) for start in range(0, n_sims, CHUNK_SIZE)]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+        args = [
+            (home_cdf, away_cdf, home_idx, away_idx, base_points, base_gd, base_gf, size, chunk_seed)
+            for size, chunk_seed in zip(chunks, seeds)
+        ]
+        if processes > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as pool:
+                results = list(pool.map(_simulate_chunk, *zip(*args)))
+        else:
+            results = [_simulate_chunk(*chunk_args) for chunk_args in args]
+
+        position_counts = sum(counts for counts, _ in results)
+        points_sum = sum(points for _, points in results)
+        position_probs = position_counts / n_sims
+
+        standings = []
+        for team, i in index.items():
+            probs = position_probs[i]
+            relegation = round(float(probs[n_teams - relegation_places:].sum()) * 100, 2) if complete else None
+            standings.append({
+                'team': team,
+                'expected_points': round(float(points_sum[i] / n_sims), 2),
+                'title_prob': round(float(probs[0]) * 100, 2),
+                'top_four_prob': round(float(probs[:4].sum()) * 100, 2),
+                'relegation_prob': relegation,
+                'positions': [round(float(p) * 100, 2) for p in probs]
+            })
+        standings.sort(key=lambda row: row['expected_points'], reverse=True)
+
+        return {
+            'n_sims': n_sims,
+            'seed': seed,
+            'fixtures': len(pairs),
+            'complete_league': complete,
+            'standings': standings
+        }
+    except Exception as e:
+        logger.error(f"Error in simulate_season: {str(e)}")
+        return None
@@ -0,0 +1,103 @@
+import os
+import logging
+import numpy as np
+
+from src.linear_model import LinearGoalsModel
+from src.model_registry import ModelRegistry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Job handlers for retraining and backtests. They run in a spawned child
+# process (see JobQueue.register), so they import nothing from the app and
+# rebuild what they need from disk: the match history, the model registry
+# and the exported model file. Paths and pool sizes are bound by the app
+# with functools.partial.
+
+def _fold_progress(progress, start, end, label):
+    """Map progress(done, total) of a walk-forward run onto [start, end]"""
+    return lambda done, total: progress(start + (end - start) * done / total, f"{label} {done}/{total}")
+
+def _training_data(progress):
+    from src.historical_elo import historical_elo_features
+    progress(0.05, 'Building historical ELO features')
+    data = historical_elo_features()
+    if data is None:
+        raise RuntimeError('Failed to build historical ELO features')
+    return data
+
+def served_model(registry_dir, model_path):
+    """
+    Load the model the app serves: the registry's active version, or the
+    exported coefficients if nothing has been activated.
+
+    Returns:
+        (model, version)
+    """
+    arrays, metadata = ModelRegistry(registry_dir).load(mmap=False)
+    if arrays is not None:
+        return (LinearGoalsModel.from_arrays(arrays, metadata['features'], metadata.get('link', 'identity')),
+                metadata['version'])
+    if not os.path.exists(model_path):
+        raise RuntimeError('No model loaded')
+    return LinearGoalsModel.load(model_path), f"file-{os.stat(model_path).st_mtime_ns}"
+
+def model_shift_invariant(model):
+    """
+    Whether a served model depends on the ratings only through their
+    difference, like the shift_invariant candidates. Only such a model can
+    be scored on replayed ratings, which sit on a lower scale than the
+    clubelo.com ratings it is served with.
+    """
+    if tuple(model.feature_names) != ('home_elo', 'away_elo'):
+        return False
+    return bool(np.allclose(model.coef.sum(axis=1), 0, atol=1e-12))
+
+def retrain_job(params, progress, registry_dir, workers=None):
+    """
+    Walk-forward model search, then register the best servable model
+    (activated only with params['activate'], after which every worker
+    swaps it in).
+    """
+    from src.model_search import default_candidates, run_search, register_best, servable_best
+    candidates = default_candidates()
+    if params.get('candidates'):
+        candidates = [c for c in candidates if c['name'] in params['candidates']]
+        if not candidates:
+            raise ValueError('No known candidates requested')
+    data = _training_data(progress)
+    leaderboard = run_search(data, candidates, min_train_seasons=int(params.get('min_train_seasons', 5)),
+                             workers=workers, progress=_fold_progress(progress, 0.1, 0.9, 'Fold'))
+    progress(0.9, 'Registering the best model')
+    activate = bool(params.get('activate', False))
+    version = register_best(data, leaderboard, registry_dir, activate=activate)
+    return {'version': version, 'model_type': servable_best(leaderboard)['name'], 'activated': activate,
+            'leaderboard': leaderboard[:5]}
+
+def backtest_job(params, progress, registry_dir, model_path, workers=None):
+    """
+    Walk-forward backtest of a model search candidate (params['candidate']),
+    or of the model being served with params['model'] == 'current'. Both
+    score the same seasons unless params['min_train_seasons'] says otherwise.
+    """
+    from src.backtest import DEFAULT_CANDIDATE, run_backtest
+    from src.model_search import default_candidates
+    candidate = current = version = None
+    if params.get('model') == 'current':
+        current, version = served_model(registry_dir, model_path)
+        if not model_shift_invariant(current):
+            raise ValueError(f"Model {version} uses absolute ratings, which are on a different scale "
+                             "in the match history; backtest a candidate instead")
+    else:
+        name = params.get('candidate', DEFAULT_CANDIDATE)
+        candidate = next((c for c in default_candidates() if c['name'] == name), None)
+        if candidate is None:
+            raise ValueError(f"Unknown candidate {name}")
+    data = _training_data(progress)
+    report = run_backtest(data, candidate=candidate, model=current,
+                          min_train_seasons=int(params.get('min_train_seasons', 5)),
+                          workers=workers, min_edge=float(params.get('min_edge', 0.0)),
+                          progress=_fold_progress(progress, 0.1, 1.0, 'Season'))
+    if current is not None:
+        report['model'] = version
+    return report
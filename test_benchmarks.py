@@ -0,0 +1,17 @@
+import sys
+import json
+import subprocess
+
+def test_hot_path_suite_runs_offline(tmp_path):
+    output = tmp_path / 'results.json'
+    result = subprocess.run([sys.executable, 'benchmarks/hot_paths.py', '--min-time', '0.001', '--repeat', '1',
+                             '--threshold', '1000', '--output', str(output)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    with open('benchmarks/baselines/hot_paths.json') as f:
+        baseline = json.load(f)
+    with open(output) as f:
+        results = json.load(f)
+    # Every benchmark in the suite has a committed baseline
+    assert set(results['results']) == set(baseline['results'])
+    assert all(entry['best_us'] > 0 for entry in results['results'].values())
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+from flask import Flask
+
+from config import Config
+from models.database import db, Team, EloRating
+from src.data_scraping import save_elo_data
+from src.elo_history import compact_elo_history, load_rating_history
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A fresh SQLite database that save_elo_data and the models write to"""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'elo.db'}")
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+def ratings(**elos):
+    return pd.DataFrame({'Team': list(elos), 'Elo': list(elos.values())})
+
+def test_get_or_create_ids(database):
+    ids = Team.get_or_create_ids(['Liverpool', 'Arsenal', 'Liverpool'])
+    db.session.commit()
+    assert set(ids) == {'Liverpool', 'Arsenal'} and len(set(ids.values())) == 2
+
+    # Existing teams keep their IDs; only the new one is inserted
+    again = Team.get_or_create_ids(['Arsenal', 'Chelsea', 'Liverpool'])
+    db.session.commit()
+    assert again['Arsenal'] == ids['Arsenal'] and again['Liverpool'] == ids['Liverpool']
+    assert again['Chelsea'] not in ids.values()
+    assert db.session.query(Team).count() == 3
+
+def test_save_elo_data_creates_and_reuses_teams(database):
+    save_elo_data(ratings(Liverpool=2015, Arsenal=1990))
+    ids = dict(db.session.query(Team.name, Team.id).all())
+    assert set(ids) == {'Liverpool', 'Arsenal'}
+
+    # A new team is added alongside the existing ones
+    save_elo_data(ratings(Liverpool=2020, Arsenal=1990, Chelsea=1875))
+    db.session.expire_all()
+    assert dict(db.session.query(Team.name, Team.id).filter(Team.name != 'Chelsea').all()) == ids
+    assert db.session.query(Team).count() == 3
+
+    # Rerunning with the same data adds no teams
+    save_elo_data(ratings(Liverpool=2020, Arsenal=1990, Chelsea=1875))
+    assert db.session.query(Team).count() == 3
+    latest = {rating.team.name: rating.rating for rating in EloRating.get_latest_ratings()}
+    assert latest == {'Liverpool': 2020, 'Arsenal': 1990, 'Chelsea': 1875}
+
+def add_ratings(rows):
+    """Insert (team, rating, last_update) rows in order; returns {team: id}"""
+    ids = Team.get_or_create_ids([team for team, _, _ in rows])
+    for team, rating, last_update in rows:
+        db.session.add(EloRating(team_id=ids[team], rating=rating, last_update=last_update))
+        db.session.flush()
+    db.session.commit()
+    return ids
+
+def test_get_latest_ratings(database):
+    ids = add_ratings([
+        ('Liverpool', 1990, datetime(2025, 1, 1)),
+        ('Liverpool', 2015, datetime(2025, 2, 1)),
+        ('Liverpool', 2001, datetime(2025, 1, 15)),
+        ('Arsenal', 1980, datetime(2025, 2, 1)),
+        # Same timestamp: the last inserted wins
+        ('Chelsea', 1870, datetime(2025, 3, 1)),
+        ('Chelsea', 1875, datetime(2025, 3, 1)),
+    ])
+    latest = {rating.team.name: rating.rating for rating in EloRating.get_latest_ratings()}
+    assert latest == {'Liverpool': 2015, 'Arsenal': 1980, 'Chelsea': 1875}
+
+    filtered = EloRating.get_latest_ratings(team_ids=[ids['Liverpool'], ids['Chelsea']])
+    assert sorted((rating.team.name, rating.rating) for rating in filtered) == [('Chelsea', 1875), ('Liverpool', 2015)]
+    assert EloRating.get_latest_ratings(team_ids=[]) == []
+
+def test_unchanged_ratings_are_not_reinserted(database):
+    save_elo_data(ratings(Liverpool=2015, Arsenal=1990))
+    save_elo_data(ratings(Liverpool=2015, Arsenal=1990))
+    assert db.session.query(EloRating).count() == 2
+
+    save_elo_data(ratings(Liverpool=2015, Arsenal=1995))
+    assert db.session.query(EloRating).count() == 3
+    history = load_rating_history('Arsenal')
+    assert history['Elo'].tolist() == [1990, 1995]
+    assert load_rating_history('Nowhere') is None
+
+def test_compact_elo_history(database):
+    now = datetime(2025, 6, 30, 12)
+    rows = [
+        # Within 30 days: every rating kept
+        ('Liverpool', 2015, now - timedelta(days=1, hours=2)),
+        ('Liverpool', 2014, now - timedelta(days=1, hours=1)),
+        # Older than 30 days: the last rating of each day
+        ('Liverpool', 2001, datetime(2025, 4, 2, 9)),
+        ('Liverpool', 2002, datetime(2025, 4, 2, 18)),
+        ('Liverpool', 2003, datetime(2025, 4, 3, 9)),
+        # Older than a year: the last rating of each ISO week (2024 week 10 is 4-10 March)
+        ('Liverpool', 1950, datetime(2024, 3, 4)),
+        ('Liverpool', 1955, datetime(2024, 3, 8)),
+        ('Liverpool', 1960, datetime(2024, 3, 11)),
+        # A team whose latest rating is old keeps it
+        ('Arsenal', 1900, datetime(2024, 3, 4)),
+        ('Arsenal', 1905, datetime(2024, 3, 5)),
+    ]
+    ids = add_ratings(rows)
+    before = db.session.query(EloRating).count()
+
+    # One row per batch so the deletes span several transactions
+    deleted = compact_elo_history(now=now, batch_size=1)
+    db.session.expire_all()
+    assert deleted == 3 and db.session.query(EloRating).count() == before - 3
+    history = {
+        team: [rating for _, rating in EloRating.get_rating_history(ids[team])]
+        for team in ids
+    }
+    assert history == {'Liverpool': [1955, 1960, 2002, 2003, 2015, 2014], 'Arsenal': [1905]}
+
+    # Compacting again finds nothing left to delete
+    assert compact_elo_history(now=now, batch_size=1) == 0
@@ -0,0 +1,43 @@
+import pytest
+
+from src.data_scraping import parse_elo_html
+
+FIXTURES = ['data/fixtures/clubelo_ENG.html', 'data/fixtures/clubelo_Ranking.html']
+
+ROW = '<tr><td class="l"><small>{rank}</small> <a href="/{team}"{link_attrs}>{team}</a></td>{cells}</tr>'
+# Markup the tokenizer has to get right: '>' inside quoted attribute values,
+# attributes whose names end in "class", class values that mention "r"
+EDGE_CASE_ROWS = [
+    ROW.format(rank=1, team='Liverpool', link_attrs=' title="a>b"', cells='<td class="r">2015</td>'),
+    ROW.format(rank=2, team='Arsenal', link_attrs=" title='x > y' data-n=\"1\"", cells='<td class="r">1990</td>'),
+    ROW.format(rank=3, team='Chelsea', link_attrs='',
+               cells='<td data-class="r">1</td><td title="class=r">2</td><td class="r">1875</td>'),
+    ROW.format(rank=4, team='Everton', link_attrs='', cells='<td CLASS = r>1700</td>'),
+    ROW.format(rank=5, team='Wolves', link_attrs='', cells='<td class="l r" title="<r>">1650</td>'),
+    ROW.format(rank=6, team='Fulham', link_attrs='', cells='<td data-class="r" class="right">9</td><td class=\'r\'>1720</td>'),
+]
+
+def read_fixture(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+@pytest.mark.parametrize('path', FIXTURES)
+def test_fast_parser_matches_soup(path):
+    html = read_fixture(path)
+    fast = parse_elo_html(html, parser='fast')
+    soup = parse_elo_html(html, parser='soup')
+    assert fast.equals(soup)
+    assert fast['Elo'].dtype == soup['Elo'].dtype
+
+def test_eng_fixture_contents():
+    df_elo = parse_elo_html(read_fixture(FIXTURES[0]))
+    assert len(df_elo) == 20
+    assert df_elo['Team'].is_unique
+    assert df_elo.iloc[0].tolist() == ['Liverpool', 2015]
+
+def test_fast_parser_matches_soup_on_edge_cases():
+    html = '<table>' + ''.join(EDGE_CASE_ROWS) + '</table>'
+    fast = parse_elo_html(html, parser='fast')
+    soup = parse_elo_html(html, parser='soup')
+    assert fast.equals(soup)
+    assert fast['Elo'].tolist() == [2015, 1990, 1875, 1700, 1650, 1720]
@@ -0,0 +1,111 @@
+import time
+import threading
+import pandas as pd
+from src.elo_refresher import EloRefresher
+from src.shared_elo import SharedEloStore
+
+class StubScraper:
+    """Stands in for get_elo_data, counting calls and failing on request"""
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            return None
+        return pd.DataFrame({'Team': ['Liverpool', 'Arsenal'], 'Elo': [2000 + self.calls, 1990]})
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_periodic_refresh(tmp_path):
+    scraper = StubScraper()
+    published = []
+    store = SharedEloStore(str(tmp_path / 'elo.json'))
+    refresher = EloRefresher(scraper, lambda *args: published.append(args), ttl=0.05, store=store).start()
+    wait_until(lambda: len(published) >= 3)
+    versions = [version for _, version, _ in published[:3]]
+    assert versions == sorted(versions) and len(set(versions)) == 3
+    assert refresher.failures == 0 and refresher.last_error is None
+
+def test_forced_refresh_fetches_even_when_fresh(tmp_path):
+    scraper = StubScraper()
+    published = []
+    store = SharedEloStore(str(tmp_path / 'elo.json'))
+    with store.lock():
+        store.write(scraper(), time.time())
+    refresher = EloRefresher(scraper, lambda *args: published.append(args), ttl=3600, store=store,
+                             last_refresh=time.time()).start()
+    assert refresher.refresh_now(timeout=5)
+    assert scraper.calls == 2
+    assert [version for _, version, _ in published] == [2]
+    assert store.read()[1] == 2
+
+def test_forced_refresh_waits_for_a_new_attempt(tmp_path):
+    """An attempt already running when refresh_now is called does not count"""
+    scraper = StubScraper()
+    store = SharedEloStore(str(tmp_path / 'elo.json'))
+    with store.lock():
+        store.write(scraper(), time.time())
+    release = threading.Event()
+    published = []
+    def publish(*args):
+        published.append(args)
+        release.wait(5)
+
+    # The first, unforced attempt adopts the fresh store and blocks in publish
+    refresher = EloRefresher(scraper, publish, ttl=3600, store=store).start()
+    wait_until(lambda: len(published) == 1)
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(refresher.refresh_now(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    waiter.join()
+    assert result == [True]
+    # The forced attempt fetched rather than adopting the stored version
+    assert scraper.calls == 2
+    assert [version for _, version, _ in published] == [1, 2]
+
+def test_failed_refresh_keeps_current_data(tmp_path):
+    scraper = StubScraper()
+    published = []
+    store = SharedEloStore(str(tmp_path / 'elo.json'))
+    refresher = EloRefresher(scraper, lambda *args: published.append(args), ttl=3600, store=store,
+                             retry_delay=60).start()
+    wait_until(lambda: len(published) == 1)
+
+    scraper.fail = True
+    assert refresher.refresh_now(timeout=5)
+    assert len(published) == 1
+    assert refresher.failures == 1 and 'no ELO data' in refresher.last_error
+    assert store.read()[1] == 1
+    # Backoff after a failure: between half and the whole retry delay
+    assert 30 <= refresher.next_delay() <= 60
+
+    scraper.fail = False
+    assert refresher.refresh_now(timeout=5)
+    assert refresher.failures == 0 and refresher.last_error is None
+    assert [version for _, version, _ in published] == [1, 2]
+
+def test_fetch_does_not_hold_the_write_lock(tmp_path):
+    store = SharedEloStore(str(tmp_path / 'elo.json'))
+    fetching = threading.Event()
+    release = threading.Event()
+    def slow_fetch():
+        fetching.set()
+        release.wait(5)
+        return StubScraper()()
+
+    refresher = EloRefresher(slow_fetch, lambda *args: None, ttl=3600, store=store).start()
+    assert fetching.wait(5)
+    # Another worker can still publish while the fetch (and its retries) run
+    with store.lock():
+        assert store.write(StubScraper()()) == 1
+    release.set()
+    assert refresher.refresh_now(timeout=5)
+    assert store.read()[1] >= 2
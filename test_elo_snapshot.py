@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.elo_snapshot import EloSnapshot
+
+def make_snapshot():
+    frame = pd.DataFrame({'Team': ['Liverpool', 'Arsenal'], 'Elo': [2015.6, 1990.4]})
+    return EloSnapshot.from_dataframe(frame, version=7)
+
+def test_attributes_cannot_be_reassigned():
+    snapshot = make_snapshot()
+    for name in ('ratings', 'teams', 'elos', 'version', 'timestamp'):
+        with pytest.raises(AttributeError):
+            setattr(snapshot, name, None)
+    with pytest.raises(AttributeError):
+        snapshot.extra = 1
+    assert snapshot.version == 7
+
+def test_contents_cannot_be_modified():
+    snapshot = make_snapshot()
+    with pytest.raises(TypeError):
+        snapshot.ratings['Liverpool'] = 1500
+    with pytest.raises(ValueError):
+        snapshot.elos[0] = 1500
+    with pytest.raises(ValueError):
+        snapshot.teams[0] = 'Everton'
+    assert snapshot.get('Liverpool') == 2015.6
+
+def test_independent_of_its_source():
+    teams = ['Liverpool', 'Arsenal']
+    elos = np.array([2015.6, 1990.4])
+    snapshot = EloSnapshot(teams, elos, version=1)
+    teams[0] = 'Everton'
+    elos[0] = 1500
+    assert snapshot.get('Liverpool') == 2015.6 and snapshot.get('Everton') is None
+
+    # The DataFrame view is a copy; changing it leaves the snapshot alone
+    frame = snapshot.to_dataframe()
+    frame.loc[0, 'Elo'] = 1
+    assert snapshot.elos[0] == 2015.6
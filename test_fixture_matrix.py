@@ -0,0 +1,35 @@
+import pytest
+from src.elo_snapshot import EloSnapshot
+from src.fixture_matrix import build_fixture_matrix
+from src.linear_model import LinearGoalsModel
+from src.prediction import predict_match
+
+TEAMS = ['Liverpool', 'Arsenal', 'Chelsea', 'Wolves', 'Ipswich']
+
+def build(version=3):
+    model = LinearGoalsModel.load('models/elo_model.npz')
+    # Fractional ratings, as scraped, so rounding differences would show
+    snapshot = EloSnapshot(TEAMS, [2015.6, 1990.4, 1875.25, 1702.7, 1650.0], version)
+    return model, snapshot, build_fixture_matrix(model, snapshot)
+
+def test_matrix_matches_predict_match():
+    model, snapshot, matrix = build()
+    # Ipswich is not in the Premier League team list
+    assert sorted(matrix.teams) == sorted(TEAMS[:4])
+    for home in matrix.teams:
+        for away in matrix.teams:
+            if home == away:
+                assert matrix.lookup(home, away, snapshot.version) is None
+                continue
+            expected = predict_match(model, home, away, snapshot=snapshot)
+            result = matrix.lookup(home, away, snapshot.version)
+            assert result['elo_diff'] == pytest.approx(expected['elo_diff'])
+            for key in ('home_score', 'away_score', 'home_prob', 'draw_prob', 'away_prob', 'betting_odds'):
+                assert result[key] == expected[key], key
+
+def test_lookup_misses():
+    _, snapshot, matrix = build(version=3)
+    assert matrix.lookup('Liverpool', 'Arsenal', 4) is None
+    assert matrix.lookup('Liverpool', 'Nowhere', 3) is None
+    assert matrix.lookup('Ipswich', 'Arsenal', 3) is None
+    assert matrix.lookup('Liverpool', 'Arsenal', 3)['markets'] is not None
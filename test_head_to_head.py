@@ -0,0 +1,36 @@
+from src.data_loading import load_match_data
+from src.head_to_head import build_head_to_head, canonical_team
+
+def dataframe_scan(data, home_team, away_team):
+    """The original iterrows scan over the whole match DataFrame"""
+    home_team_lower = home_team.lower()
+    away_team_lower = away_team.lower()
+    matchups = data[
+        ((data['home_team'].str.lower() == home_team_lower) & (data['away_team'].str.lower() == away_team_lower)) |
+        ((data['home_team'].str.lower() == away_team_lower) & (data['away_team'].str.lower() == home_team_lower))
+    ]
+    if matchups.empty:
+        return ["No previous matchups found between these teams."]
+    results = ["--- Previous Matchups ---"]
+    for _, row in matchups.iterrows():
+        results.append(f"Season: {row['season']}, {row['home_team'].title()} {row['fth_goals']} - {row['fta_goals']} {row['away_team'].title()}")
+    return results
+
+def test_index_matches_dataframe_scan():
+    data = load_match_data(seasons=None)
+    index = build_head_to_head(data)
+    pairs = [('Liverpool', 'Arsenal'), ('Arsenal', 'Liverpool'), ('Man City', 'Man United'),
+             ('Tottenham', 'Brighton'), ('Wolves', 'Ipswich'), ('Liverpool', 'Nowhere Rovers')]
+    for home, away in pairs:
+        expected = dataframe_scan(data, canonical_team(home), canonical_team(away))
+        assert index.render(home, away) == expected, (home, away)
+    # Every pair in the data, in both directions
+    for home, away in data[['home_team', 'away_team']].drop_duplicates().head(200).itertuples(index=False):
+        assert index.render(home, away) == dataframe_scan(data, home, away)
+        assert index.render(away, home) == dataframe_scan(data, away, home)
+
+def test_empty_data():
+    data = load_match_data(seasons=None).iloc[:0]
+    index = build_head_to_head(data)
+    assert len(index) == 0
+    assert index.render('Liverpool', 'Arsenal') == ["No previous matchups found between these teams."]
@@ -0,0 +1,59 @@
+import os
+import numpy as np
+
+from src.historical_elo import ELO_STATE_PATH, HistoricalElo, chronological_matches, historical_elo_features, replay
+from src.match_cache import TEAM_ALIASES
+
+def test_replay_uses_pre_match_ratings():
+    ratings = {}
+    home_pre, away_pre, _ = replay(['a', 'b', 'a'], ['b', 'c', 'c'], [3, 0, 1], [0, 0, 1], ratings,
+                                   k=20, home_advantage=0, initial_rating=1500)
+    # Nobody has played before the first match; a's rating moves only after it
+    assert home_pre[0] == away_pre[0] == 1500
+    # A three-goal win from level ratings: 20 * 0.5 * (11 + 3) / 8
+    assert home_pre[2] - 1500 == 20 * 0.5 * 14 / 8
+    # c's first match is a draw with the weakened b, which costs c points
+    assert away_pre[1] == 1500 and away_pre[2] < 1500
+
+def test_incremental_update_matches_full_replay(tmp_path):
+    matches = chronological_matches()
+    assert np.all(np.diff(matches['date']) >= 0)
+
+    full = HistoricalElo()
+    assert full.update(matches) == len(matches['date'])
+
+    partial = HistoricalElo()
+    partial.update({name: values[:-50] for name, values in matches.items()})
+    partial.save(tmp_path / 'state.npz')
+    resumed = HistoricalElo.load(tmp_path / 'state.npz')
+    assert resumed.update(matches) == 50
+    assert resumed.ratings == full.ratings
+    assert np.array_equal(resumed.home_pre, full.home_pre)
+    assert np.array_equal(resumed.away_pre, full.away_pre)
+
+    # Changing an old result invalidates the saved state
+    edited = {name: values.copy() for name, values in matches.items()}
+    edited['fth_goals'][10] += 1
+    assert resumed.update(edited) == len(matches['date'])
+
+def test_features_cover_every_match(tmp_path):
+    df = historical_elo_features(state_path=str(tmp_path / 'state.npz'))
+    assert len(df) == len(chronological_matches()['date'])
+    assert df['date'].is_monotonic_increasing
+    assert not df[['home_elo', 'away_elo']].isna().any().any()
+
+def test_one_rating_per_club():
+    matches = chronological_matches()
+    engine = HistoricalElo()
+    engine.update(matches)
+    # 'Brighton & Hove Albion' and 'Ipswich Town' rows rate the same clubs
+    # as 'Brighton' and 'Ipswich'
+    assert not set(TEAM_ALIASES) & set(engine.ratings)
+    assert {'brighton', 'ipswich'} <= set(engine.ratings)
+    assert set(engine.ratings) == set(matches['home_team']) | set(matches['away_team'])
+
+def test_state_path_is_independent_of_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert os.path.isabs(ELO_STATE_PATH)
+    assert historical_elo_features() is not None
+    assert not os.path.exists(tmp_path / 'data')
@@ -0,0 +1,107 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+import src.data_scraping as data_scraping
+from src.http_fetch import HttpFetcher
+
+FIXTURE = 'data/fixtures/clubelo_ENG.html'
+ETAG = '"eng-fixture-1"'
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the saved clubelo page with ETag support, failing on request"""
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.failures > 0:
+            server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == ETAG or server.stray_not_modified > 0:
+            server.stray_not_modified = max(0, server.stray_not_modified - 1)
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = server.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def clubelo_server():
+    """Local stand-in for clubelo.com so the fetch layer can be tested offline"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    with open(FIXTURE, 'rb') as f:
+        server.body = f.read()
+    server.requests = []
+    server.failures = 0
+    server.stray_not_modified = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def server_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/ENG"
+
+def test_not_modified_skips_parsing(clubelo_server, tmp_path, monkeypatch):
+    fetcher = HttpFetcher(cache_dir=str(tmp_path), retries=0)
+    url = server_url(clubelo_server)
+
+    first = data_scraping.get_elo_data(url, fetcher=fetcher)
+    assert len(first) == 20
+    assert first.iloc[0].tolist() == ['Liverpool', 2015]
+
+    parse_calls = []
+    monkeypatch.setattr(data_scraping, 'parse_elo_html', lambda html: parse_calls.append(html))
+    second = data_scraping.get_elo_data(url, fetcher=fetcher)
+    assert clubelo_server.requests[-1].get('If-None-Match') == ETAG
+    assert parse_calls == []
+    assert second.equals(first)
+
+def test_cached_body_survives_restart(clubelo_server, tmp_path):
+    url = server_url(clubelo_server)
+    HttpFetcher(cache_dir=str(tmp_path), retries=0).get(url)
+
+    # A new fetcher (e.g. after a restart) revalidates from the on-disk cache
+    result = HttpFetcher(cache_dir=str(tmp_path), retries=0).get(url)
+    assert result.not_modified
+    assert result.text == clubelo_server.body.decode('utf-8')
+
+def test_transient_errors_are_retried(clubelo_server, tmp_path):
+    clubelo_server.failures = 2
+    fetcher = HttpFetcher(cache_dir=str(tmp_path), retries=2, backoff=0.01)
+    result = fetcher.get(server_url(clubelo_server))
+    assert result.status_code == 200
+    assert len(clubelo_server.requests) == 3
+
+    clubelo_server.failures = 5
+    with pytest.raises(Exception):
+        HttpFetcher(retries=1, backoff=0.01).get(server_url(clubelo_server))
+
+def test_not_modified_without_cached_body_refetches(clubelo_server, tmp_path):
+    url = server_url(clubelo_server)
+    fetcher = HttpFetcher(cache_dir=str(tmp_path), retries=0)
+    fetcher.get(url)
+
+    # Validators survive but the body is lost: the 304 is treated as a miss
+    with open(fetcher._cache_paths(url)[1], 'w'):
+        pass
+    result = fetcher.get(url)
+    assert result.status_code == 200 and not result.not_modified
+    assert result.text == clubelo_server.body.decode('utf-8')
+    assert clubelo_server.requests[-2].get('If-None-Match') == ETAG
+    assert 'If-None-Match' not in clubelo_server.requests[-1]
+
+    # A 304 to a request that was not conditional at all is refetched too
+    clubelo_server.stray_not_modified = 1
+    result = HttpFetcher(retries=0).get(url)
+    assert result.status_code == 200 and len(result.text) == len(clubelo_server.body.decode('utf-8'))
@@ -0,0 +1,117 @@
+import os
+import threading
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src.data_scraping import parse_elo_html
+from src.jobs import JobQueue
+from src.linear_model import LinearGoalsModel
+from src.shared_elo import SharedEloStore
+
+def load_fixture():
+    with open('data/fixtures/clubelo_ENG.html', encoding='utf-8') as f:
+        return parse_elo_html(f.read())
+
+def test_jobs_run_in_the_background(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), workers=1)
+    for kind in app_module.job_queue.kinds():
+        queue.register(kind, app_module.job_queue._handlers[kind], process=kind in app_module.job_queue._in_process)
+    monkeypatch.setattr(app_module, 'job_queue', queue)
+    monkeypatch.setattr(app_module, 'elo_store', SharedEloStore(str(tmp_path / 'elo.json')))
+    monkeypatch.setattr(app_module, 'elo_refresher', None)
+    monkeypatch.setattr(app_module, 'get_elo_data', load_fixture)
+    monkeypatch.setattr(app_module, 'model', LinearGoalsModel.load(app_module.app.config['LINEAR_MODEL_PATH']))
+    monkeypatch.setattr(app_module, 'warmup_state', 'ready')
+    client = app_module.app.test_client()
+
+    response = client.post('/jobs', json={'kind': 'elo_refresh'})
+    assert response.status_code == 202
+    job_id = response.json['job_id']
+    assert queue.wait(job_id, timeout=30)['status'] == 'succeeded'
+    result = client.get(response.json['result_url']).json['result']
+    assert result['elo_version'] == app_module.elo_snapshot.version and result['teams'] == 20
+
+    fixtures = [{'home_team': 'Liverpool', 'away_team': 'Arsenal'}, {'home_team': 'Arsenal', 'away_team': 'Chelsea'}]
+    job_id = client.post('/jobs', json={'kind': 'simulation', 'params': {'fixtures': fixtures, 'n_sims': 200, 'seed': 1}}).json['job_id']
+    job = queue.wait(job_id, timeout=30)
+    assert job['status'] == 'succeeded' and job['progress'] == 1
+    assert client.get(f'/jobs/{job_id}').json['kind'] == 'simulation'
+
+    # Invalid parameters fail the job rather than the request
+    job_id = client.post('/jobs', json={'kind': 'simulation', 'params': {}}).json['job_id']
+    assert queue.wait(job_id, timeout=30)['status'] == 'failed'
+    response = client.get(f'/jobs/{job_id}/result')
+    assert response.status_code == 500 and response.json['error'] == 'Missing fixture data'
+
+    assert client.post('/jobs', json={'kind': 'nope'}).status_code == 400
+    assert client.get('/jobs/unknown').status_code == 404
+
+def test_queue_is_bounded(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), workers=1, max_pending=1)
+    release = threading.Event()
+    queue.register('block', lambda params, progress: release.wait(10))
+    first = queue.submit('block')
+    second = queue.submit('block')
+    assert queue.submit('block') is None
+    release.set()
+    assert queue.wait(first['id'], timeout=10)['status'] == 'succeeded'
+    assert queue.wait(second['id'], timeout=10)['status'] == 'succeeded'
+    assert queue.submit('block') is not None
+
+def report_pid(params, progress):
+    progress(0.5, 'Halfway')
+    return {'pid': os.getpid()}
+
+# Held by a background thread of the test process while a process job runs
+HELD = threading.Lock()
+
+def take_held_lock(params, progress):
+    return {'acquired': HELD.acquire(timeout=5)}
+
+def test_process_jobs_run_in_a_child(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), workers=1)
+    queue.register('pid', report_pid, process=True)
+    assert {'retrain', 'backtest'} <= app_module.job_queue._in_process
+    job = queue.wait(queue.submit('pid')['id'], timeout=30)
+    assert job['status'] == 'succeeded' and job['progress'] == 1
+    assert job['result']['pid'] != os.getpid()
+
+def test_update_elo_without_refresher_runs_a_job(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), workers=1)
+    queue.register('elo_refresh', app_module.job_queue._handlers['elo_refresh'])
+    monkeypatch.setattr(app_module, 'job_queue', queue)
+    monkeypatch.setattr(app_module, 'elo_store', SharedEloStore(str(tmp_path / 'elo.json')))
+    monkeypatch.setattr(app_module, 'elo_refresher', None)
+    monkeypatch.setattr(app_module, 'elo_snapshot', None)
+    monkeypatch.setattr(app_module, 'get_elo_data', load_fixture)
+    monkeypatch.setattr(app_module, 'model', LinearGoalsModel.load(app_module.app.config['LINEAR_MODEL_PATH']))
+    monkeypatch.setattr(app_module, 'warmup_state', 'ready')
+    client = app_module.app.test_client()
+
+    response = client.post('/update_elo')
+    assert response.status_code == 200 and not response.json['refreshing']
+    assert response.json['team_list'] and response.json['elo_version'] == app_module.elo_snapshot.version
+    job = queue.get(response.json['job_id'])
+    assert job['kind'] == 'elo_refresh' and job['status'] == 'succeeded'
+
+def test_process_job_ignores_locks_held_by_other_threads(tmp_path):
+    # A forked child would inherit the lock in its held state and block on it
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), workers=1)
+    queue.register('lock', take_held_lock, process=True)
+    taken, release = threading.Event(), threading.Event()
+
+    def hold():
+        with HELD:
+            taken.set()
+            release.wait(30)
+    holder = threading.Thread(target=hold, daemon=True)
+    holder.start()
+    taken.wait(5)
+    try:
+        job = queue.wait(queue.submit('lock')['id'], timeout=60)
+    finally:
+        release.set()
+        holder.join()
+    assert job['status'] == 'succeeded' and job['result'] == {'acquired': True}
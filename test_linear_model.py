@@ -0,0 +1,31 @@
+import warnings
+import joblib
+import numpy as np
+
+from src.linear_model import LinearGoalsModel, matches_model
+
+SKLEARN_MODEL = 'models/elo_model.pkl'
+LINEAR_MODEL = 'models/elo_model.npz'
+
+def load_models():
+    return joblib.load(SKLEARN_MODEL), LinearGoalsModel.load(LINEAR_MODEL)
+
+def test_export_matches_sklearn_exactly():
+    model, compiled = load_models()
+    features = np.random.default_rng(0).uniform(1200, 2200, size=(1000, 2))
+    assert matches_model(compiled, model, features)
+    # Single rows as the app passes them
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        for home_elo, away_elo in features[:50].round():
+            expected = model.predict([[home_elo, away_elo]])[0]
+            assert compiled.predict_one(home_elo, away_elo) == tuple(expected)
+
+def test_export_round_trips(tmp_path):
+    _, compiled = load_models()
+    path = tmp_path / 'model.npz'
+    compiled.save(path)
+    loaded = LinearGoalsModel.load(path)
+    assert np.array_equal(loaded.coef, compiled.coef)
+    assert np.array_equal(loaded.intercept, compiled.intercept)
+    assert loaded.feature_names == ('home_elo', 'away_elo')
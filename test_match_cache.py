@@ -0,0 +1,79 @@
+import os
+import shutil
+from src import data_loading
+from src import match_cache
+from src.match_cache import load_compiled_matches
+
+def copy_csv(tmp_path):
+    path = str(tmp_path / 'matches.csv')
+    shutil.copyfile(data_loading.MATCH_CSV, path)
+    return path
+
+def count_compiles(monkeypatch):
+    calls = []
+    compile_match_csv = match_cache.compile_match_csv
+    def counting(csv_path):
+        calls.append(csv_path)
+        return compile_match_csv(csv_path)
+    monkeypatch.setattr(match_cache, 'compile_match_csv', counting)
+    return calls
+
+def test_cache_reused_until_csv_changes(tmp_path, monkeypatch):
+    csv_path = copy_csv(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    calls = count_compiles(monkeypatch)
+
+    arrays, teams, seasons = load_compiled_matches(csv_path, cache_dir)
+    assert len(calls) == 1
+    cached, cached_teams, cached_seasons = load_compiled_matches(csv_path, cache_dir)
+    assert len(calls) == 1
+    assert (cached['home_team'] == arrays['home_team']).all()
+    assert cached_teams == teams and cached_seasons == seasons
+
+    # New mtime, same content: the cache is kept and its mtime refreshed
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_compiled_matches(csv_path, cache_dir)
+    load_compiled_matches(csv_path, cache_dir)
+    assert len(calls) == 1
+
+    # Appending a row changes the size
+    with open(csv_path, 'rb') as f:
+        last_row = f.read().rstrip(b'\r\n').rsplit(b'\n', 1)[1]
+    with open(csv_path, 'ab') as f:
+        f.write(last_row + b'\n')
+    arrays, _, _ = load_compiled_matches(csv_path, cache_dir)
+    assert len(calls) == 2
+    assert len(arrays['date']) == len(cached['date']) + 1
+
+def test_same_size_content_change_rebuilds(tmp_path, monkeypatch):
+    csv_path = copy_csv(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    calls = count_compiles(monkeypatch)
+    arrays, _, _ = load_compiled_matches(csv_path, cache_dir)
+
+    # Swap one goal digit in the last row: same size, new mtime and hash
+    with open(csv_path, 'rb') as f:
+        content = f.read()
+    body, tail = content.rstrip(b'\r\n').rsplit(b'\n', 1)
+    fields = tail.split(b',')
+    header = content.split(b'\n', 1)[0].rstrip(b'\r').decode('utf-8-sig').split(',')
+    column = header.index('FTH Goals')
+    fields[column] = b'9' if fields[column] != b'9' else b'8'
+    changed = body + b'\n' + b','.join(fields) + content[len(content.rstrip(b'\r\n')):]
+    assert len(changed) == len(content)
+    with open(csv_path, 'wb') as f:
+        f.write(changed)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    rebuilt, _, _ = load_compiled_matches(csv_path, cache_dir)
+    assert len(calls) == 2
+    assert rebuilt['fth_goals'][-1] == int(fields[column])
+    assert (rebuilt['fth_goals'][:-1] == arrays['fth_goals'][:-1]).all()
+
+def test_cache_path_is_independent_of_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert os.path.isabs(data_loading.MATCH_CACHE_DIR)
+    assert data_loading.load_match_data() is not None
+    assert not os.path.exists(tmp_path / 'data')
@@ -0,0 +1,41 @@
+import os
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src import metrics
+from src.metrics import MetricsRegistry
+
+def test_histograms_render_cumulative_buckets():
+    registry = MetricsRegistry(enabled=True, buckets=(0.001, 0.01))
+    labels = (('route', '/predict'), ('stage', 'model'))
+    for seconds in (0.0005, 0.005, 0.005, 2.0):
+        registry.observe('stage_duration_seconds', labels, seconds)
+    registry.inc('scrape_failures_total', (('stage', 'fetch'),))
+    text = registry.render()
+    assert 'epl_stage_duration_seconds_bucket{route="/predict",stage="model",le="0.001"} 1' in text
+    assert 'epl_stage_duration_seconds_bucket{route="/predict",stage="model",le="0.01"} 3' in text
+    assert 'epl_stage_duration_seconds_bucket{route="/predict",stage="model",le="+Inf"} 4' in text
+    assert 'epl_stage_duration_seconds_count{route="/predict",stage="model"} 4' in text
+    assert 'epl_scrape_failures_total{stage="fetch"} 1' in text
+
+    # Disabled: nothing is recorded and stopwatches are 0
+    registry = MetricsRegistry(enabled=False)
+    registry.observe('stage_duration_seconds', labels, 0.1)
+    registry.inc('scrape_failures_total')
+    assert registry.render() == '\n'
+
+def test_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(metrics.registry, 'enabled', True)
+    client = app_module.app.test_client()
+    client.get('/healthz')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    text = response.get_data(as_text=True)
+    assert 'epl_request_duration_seconds_count{method="GET",route="/healthz",status="200"}' in text
+    assert 'epl_prediction_cache_hits_total' in text
+
+    monkeypatch.setattr(metrics.registry, 'enabled', False)
+    assert metrics.start() == 0 and metrics.lap('model', 0) == 0
+    assert client.get('/metrics').status_code == 404
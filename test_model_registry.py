@@ -0,0 +1,63 @@
+import os
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import numpy as np
+import app as app_module
+from src.data_scraping import parse_elo_html
+from src.linear_model import LinearGoalsModel
+from src.model_registry import ModelRegistry
+from src.shared_elo import SharedEloStore
+
+FEATURES = ['home_elo', 'away_elo']
+
+def base_model():
+    return LinearGoalsModel.load('models/elo_model.npz')
+
+def test_publish_activate_and_load(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.current() is None and registry.load() == (None, None)
+
+    model = base_model()
+    first = registry.publish(model.to_arrays(), {'features': FEATURES, 'metrics': {'r2': 0.1}})
+    assert registry.current() == first
+    arrays, metadata = registry.load()
+    assert isinstance(arrays['coef'], np.memmap)
+    assert metadata['features'] == FEATURES and metadata['metrics'] == {'r2': 0.1}
+    loaded = LinearGoalsModel.from_arrays(arrays, metadata['features'])
+    assert np.array_equal(loaded.predict([[1900, 1800]]), model.predict([[1900, 1800]]))
+
+    # A new version is only visible once activated, and older ones stay for rollback
+    second = registry.publish({'coef': model.coef * 2, 'intercept': model.intercept}, {'features': FEATURES},
+                              activate=False)
+    assert registry.current() == first
+    registry.activate(second)
+    assert registry.current() == second
+    assert registry.versions() == sorted([first, second])
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.')]
+
+def test_app_swaps_model_between_requests(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    monkeypatch.setattr(app_module, 'model_registry', registry)
+    monkeypatch.setattr(app_module, 'model_registry_stamp', None)
+    monkeypatch.setattr(app_module, 'elo_store', SharedEloStore(str(tmp_path / 'elo.json')))
+    monkeypatch.setattr(app_module, 'elo_store_stamp', None)
+    monkeypatch.setattr(app_module, 'elo_snapshot', None)
+    monkeypatch.setattr(app_module, 'fixture_matrix', None)
+    monkeypatch.setattr(app_module, 'warmup_state', 'ready')
+    monkeypatch.setattr(app_module, 'model', base_model())
+    monkeypatch.setattr(app_module, 'model_version', 'file')
+    with open('data/fixtures/clubelo_ENG.html', encoding='utf-8') as f:
+        app_module.set_elo_data(parse_elo_html(f.read()))
+    client = app_module.app.test_client()
+    fixture = {'home_team': 'Liverpool', 'away_team': 'Arsenal'}
+    before = client.post('/predict', json=fixture).json
+
+    # Twice the intercept: more goals predicted for both sides
+    model = base_model()
+    version = registry.publish({'coef': model.coef, 'intercept': model.intercept * 2}, {'features': FEATURES})
+    after = client.post('/predict', json=fixture).json
+    assert app_module.model_version == version
+    assert after['home_score'] > before['home_score']
+    assert client.get('/readyz').json['model_version'] == version
@@ -0,0 +1,63 @@
+import os
+import numpy as np
+
+from src.data_scraping import parse_elo_html
+from src.historical_elo import historical_elo_features
+from src.linear_model import LinearGoalsModel
+from src.model_registry import ModelRegistry
+from src.model_search import (FEATURE_CACHE_DIR, LEADERBOARD_PATH, REGISTRY_DIR,
+                              build_feature_cache, compile_candidate, default_candidates, fit_candidate,
+                              register_best, run_search, shift_invariant, _load_features)
+
+def test_walk_forward_search_in_parallel(tmp_path):
+    data = historical_elo_features(state_path=str(tmp_path / 'elo.npz'))
+    candidates = [c for c in default_candidates() if c['kind'] in ('linear', 'poisson')]
+    serial = run_search(data, candidates, min_train_seasons=28, workers=1, cache_dir=str(tmp_path))
+    parallel = run_search(data, candidates, min_train_seasons=28, workers=2, cache_dir=str(tmp_path))
+
+    assert [entry['name'] for entry in serial] == [entry['name'] for entry in parallel]
+    assert serial[0]['log_loss'] == parallel[0]['log_loss']
+    assert all(entry['folds'] == 4 for entry in serial)
+    assert [entry['log_loss'] for entry in serial] == sorted(entry['log_loss'] for entry in serial)
+
+def test_candidates_fold_back_to_raw_ratings(tmp_path):
+    data = historical_elo_features(state_path=str(tmp_path / 'elo.npz'))
+    feature_dir, _ = build_feature_cache(data, str(tmp_path))
+    raw = data[['home_elo', 'away_elo']].to_numpy()[:100]
+    for candidate in default_candidates():
+        X, y, _ = _load_features(feature_dir, candidate['features'])
+        coef, intercept, link = fit_candidate(candidate, np.asarray(X), np.asarray(y))
+        linear = np.asarray(X[:100]) @ coef.T + intercept
+        expected = np.exp(linear) if link == 'log' else linear
+        assert np.allclose(compile_candidate(candidate, coef, intercept, link).predict(raw), expected)
+
+def test_registered_model_serves_clubelo_ratings(tmp_path):
+    data = historical_elo_features(state_path=str(tmp_path / 'elo.npz'))
+    leaderboard = run_search(data, min_train_seasons=28, workers=1, cache_dir=str(tmp_path))
+    # Make sure a raw-rating candidate tops the board
+    leaderboard.sort(key=lambda entry: shift_invariant(entry['features']))
+
+    registry_dir = str(tmp_path / 'registry')
+    version = register_best(data, leaderboard, registry_dir, activate=True, cache_dir=str(tmp_path))
+    registry = ModelRegistry(registry_dir)
+    assert registry.current() == version
+    arrays, metadata = registry.load(version)
+    assert metadata['model_type'].endswith('/elo_diff') and metadata['rank'] > 1
+    model = LinearGoalsModel.from_arrays(arrays, metadata['features'], metadata['link'])
+
+    with open('data/fixtures/clubelo_ENG.html', encoding='utf-8') as f:
+        clubelo = parse_elo_html(f.read())['Elo'].to_numpy(dtype=float)
+    latest = data.groupby('home_team')['home_elo'].last()
+    # clubelo ratings sit well above the replayed scale the model was trained on
+    shift = clubelo.mean() - latest.mean()
+    assert shift > 100
+
+    fixtures = np.column_stack([clubelo, clubelo[::-1]])
+    served = model.predict(fixtures)
+    assert np.allclose(served, model.predict(fixtures - shift))
+    assert np.all((served > 0.2) & (served < 4))
+
+def test_default_paths_are_independent_of_working_directory():
+    root = os.path.dirname(os.path.abspath(__file__))
+    for path in (FEATURE_CACHE_DIR, LEADERBOARD_PATH, REGISTRY_DIR):
+        assert os.path.isabs(path) and path.startswith(root)
@@ -0,0 +1,67 @@
+import os
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src.data_scraping import parse_elo_html
+from src.elo_snapshot import EloSnapshot
+from src.linear_model import LinearGoalsModel
+from src.prediction import predict_match, predict_matches
+from src.shared_elo import SharedEloStore
+
+def load_snapshot():
+    with open('data/fixtures/clubelo_ENG.html', encoding='utf-8') as f:
+        return EloSnapshot.from_dataframe(parse_elo_html(f.read()), version=1)
+
+def load_model():
+    return LinearGoalsModel.load('models/elo_model.npz')
+
+def test_batch_matches_single_predictions():
+    model = load_model()
+    snapshot = load_snapshot()
+    custom_elos = {'Liverpool': 1850, 'Arsenal': 1990}
+    fixtures = [
+        {'home_team': 'Liverpool', 'away_team': 'Arsenal'},
+        {'home_team': 'Chelsea', 'away_team': 'Nowhere Rovers'},
+        {'home_team': 'Arsenal', 'away_team': 'Chelsea', 'custom_elos': {'Arsenal': 1700, 'Chelsea': 1710}},
+        ('Man City', 'Wolves'),
+    ]
+    batch = predict_matches(model, fixtures, custom_elos=custom_elos, snapshot=snapshot)
+    single = [
+        predict_match(model, 'Liverpool', 'Arsenal', custom_elos, snapshot=snapshot),
+        None,
+        predict_match(model, 'Arsenal', 'Chelsea', {'Arsenal': 1700, 'Chelsea': 1710}, snapshot=snapshot),
+        predict_match(model, 'Man City', 'Wolves', custom_elos, snapshot=snapshot),
+    ]
+    assert batch == single
+    assert batch[0]['elo_diff'] == -140
+
+def test_batch_route(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, 'elo_store', SharedEloStore(str(tmp_path / 'elo.json')))
+    monkeypatch.setattr(app_module, 'model', load_model())
+    monkeypatch.setattr(app_module, 'elo_snapshot', load_snapshot())
+    monkeypatch.setattr(app_module, 'warmup_state', 'ready')
+    client = app_module.app.test_client()
+    fixtures = [{'home_team': 'Liverpool', 'away_team': 'Arsenal'}, {'home_team': 'Liverpool', 'away_team': 'Nowhere'}]
+    response = client.post('/predict/batch', json={'fixtures': fixtures})
+    assert response.status_code == 200
+    predictions = response.json['predictions']
+    assert predictions[1] is None
+    single = predict_match(app_module.model, 'Liverpool', 'Arsenal', snapshot=app_module.elo_snapshot)
+    assert predictions[0]['home_prob'] == single['home_prob']
+    assert predictions[0]['betting_odds'] == single['betting_odds']
+    assert client.post('/predict/batch', json={'fixtures': [{'home_team': 'Liverpool'}]}).status_code == 400
+
+def test_odds_agree_with_probabilities():
+    model = load_model()
+    snapshot = load_snapshot()
+    for home_team, away_team in (('Liverpool', 'Arsenal'), ('Man City', 'Wolves'), ('Wolves', 'Man City')):
+        prediction = predict_match(model, home_team, away_team, snapshot=snapshot)
+        odds = [float(line.split(': ')[1]) for line in prediction['betting_odds'][1:]]
+        probs = [prediction['home_prob'], prediction['draw_prob'], prediction['away_prob']]
+        for price, prob in zip(odds, probs):
+            # Both are rounded, so compare the implied probability loosely
+            assert abs(100 / price - prob) < 0.5, (home_team, away_team, odds, probs)
+        # The favourite is the shortest price
+        assert odds.index(min(odds)) == probs.index(max(probs))
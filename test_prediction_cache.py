@@ -0,0 +1,80 @@
+import os
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src.data_scraping import parse_elo_html
+from src.linear_model import LinearGoalsModel
+from src.prediction_cache import PredictionCache
+from src.shared_elo import SharedEloStore
+
+def load_fixture():
+    with open('data/fixtures/clubelo_ENG.html', encoding='utf-8') as f:
+        return parse_elo_html(f.read())
+
+def test_hits_misses_and_lru_eviction():
+    cache = PredictionCache(maxsize=2)
+    cache.invalidate('g1')
+    assert cache.get('a', 'g1') is None
+    cache.put('a', 1, 'g1')
+    cache.put('b', 2, 'g1')
+    assert cache.get('a', 'g1') == 1
+    # 'b' is now least recently used
+    cache.put('c', 3, 'g1')
+    assert cache.get('b', 'g1') is None
+    assert cache.get('a', 'g1') == 1 and cache.get('c', 'g1') == 3
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (3, 2, 1, 2)
+
+def test_other_generations_bypass_the_cache():
+    cache = PredictionCache(maxsize=10)
+    cache.invalidate('g1')
+    cache.put('a', 1, 'g1')
+    # A request still holding the old generation neither reads nor writes
+    cache.invalidate('g2')
+    assert len(cache) == 0
+    cache.put('a', 1, 'g1')
+    assert cache.get('a', 'g1') is None and cache.get('a', 'g2') is None
+    cache.invalidate('g2')
+    assert cache.stats()['invalidations'] == 2
+
+def test_expiry():
+    cache = PredictionCache(maxsize=10, ttl=1e-9)
+    cache.invalidate('g1')
+    cache.put('a', 1, 'g1')
+    assert cache.get('a', 'g1') is None
+    assert cache.stats()['expirations'] == 1
+
+def test_app_invalidates_on_new_data_and_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, 'elo_store', SharedEloStore(str(tmp_path / 'elo.json')))
+    monkeypatch.setattr(app_module, 'prediction_cache', PredictionCache(maxsize=16))
+    monkeypatch.setattr(app_module, 'model', LinearGoalsModel.load(app_module.app.config['LINEAR_MODEL_PATH']))
+    monkeypatch.setattr(app_module, 'model_version', 'test-1')
+    monkeypatch.setattr(app_module, 'elo_snapshot', None)
+    monkeypatch.setattr(app_module, 'warmup_state', 'ready')
+    monkeypatch.setattr(app_module, 'sync_elo_data', lambda: None)
+    monkeypatch.setattr(app_module, 'sync_model', lambda: None)
+    app_module.set_elo_data(load_fixture())
+    client = app_module.app.test_client()
+    fixture = {'home_team': 'Liverpool', 'away_team': 'Arsenal'}
+
+    first = client.post('/predict', json=fixture).json
+    assert client.post('/predict', json=fixture).json == first
+    stats = client.get('/predict/cache').json
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+    # New ELO data starts a new generation
+    app_module.set_elo_data(load_fixture())
+    assert client.get('/predict/cache').json['size'] == 0
+    client.post('/predict', json=fixture)
+    stats = client.get('/predict/cache').json
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 2, 1)
+
+    # So does a new model
+    app_module.set_model(app_module.model, 'test-2')
+    assert client.get('/predict/cache').json['size'] == 0
+    client.post('/predict', json=fixture)
+    client.post('/predict', json=fixture)
+    stats = client.get('/predict/cache').json
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (2, 3, 3)
@@ -0,0 +1,33 @@
+import os
+import json
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src.profiling import RequestProfiler
+
+def test_requests_profiled_on_demand_and_sampled(tmp_path, monkeypatch):
+    profiler = RequestProfiler(str(tmp_path), enabled=True, sample_rate=3, token='secret', keep=2)
+    monkeypatch.setattr(app_module, 'request_profiler', profiler)
+    client = app_module.app.test_client()
+
+    # Wrong token: only counts towards the sample
+    assert 'X-Profile-Id' not in client.get('/healthz', headers={'X-Profile': 'nope'}).headers
+    response = client.get('/healthz?profile=secret')
+    name = response.headers['X-Profile-Id']
+    with open(tmp_path / f"{name}.json") as f:
+        metadata = json.load(f)
+    assert metadata['route'] == '/healthz' and metadata['status'] == 200
+    assert 'elo_version' in metadata and metadata['seconds'] > 0
+    assert os.path.getsize(tmp_path / f"{name}.prof") > 0
+
+    # One in three requests is sampled; only the newest two profiles are kept
+    sampled = [client.get('/healthz').headers.get('X-Profile-Id') for _ in range(6)]
+    assert sum(name is not None for name in sampled) == 2
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.prof')]) == 2
+
+def test_profiling_off_by_default():
+    assert app_module.request_profiler.enabled is False
+    response = app_module.app.test_client().get('/healthz', headers={'X-Profile': '1'})
+    assert 'X-Profile-Id' not in response.headers
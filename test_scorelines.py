@@ -0,0 +1,34 @@
+import math
+import numpy as np
+
+from src.scorelines import GridCache, score_grids, grid_markets, OVER_UNDER_LINES
+
+def poisson(k, mu):
+    return math.exp(-mu) * mu ** k / math.factorial(k)
+
+def test_grid_matches_independent_poisson():
+    grids = score_grids(np.array([1.5, 0.4]), np.array([1.1, 2.7]))
+    assert np.allclose(grids.sum(axis=(1, 2)), 1.0)
+    assert math.isclose(grids[0, 2, 1], poisson(2, 1.5) * poisson(1, 1.1))
+    assert math.isclose(grids[1, 0, 3], poisson(0, 0.4) * poisson(3, 2.7))
+
+def test_markets_are_consistent():
+    markets = grid_markets(score_grids(np.array([1.8, 0.9]), np.array([0.7, 1.6])))
+    total = markets['home_win'] + markets['draw'] + markets['away_win']
+    assert np.allclose(total, 1.0)
+    assert markets['home_win'][0] > markets['away_win'][0]
+    assert markets['away_win'][1] > markets['home_win'][1]
+    # Over probabilities fall as the line rises
+    assert np.all(np.diff(markets['over'], axis=1) < 0)
+    assert markets['over'].shape == (2, len(OVER_UNDER_LINES))
+    assert tuple(markets['correct_scores'][0, 0]) == (1, 0)
+
+def test_cache_reuses_quantized_grids():
+    cache = GridCache(maxsize=2)
+    first = cache.grids([1.501, 0.8], [1.0, 1.2])
+    assert (cache.hits, cache.misses) == (0, 2)
+    second = cache.grids([1.499, 0.8], [1.0, 1.2])
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert np.array_equal(first, second)
+    cache.grids([2.0], [2.0])
+    assert len(cache) == 2
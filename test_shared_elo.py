@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import threading
+import pandas as pd
+import pytest
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src import shared_elo
+from src.shared_elo import SharedEloStore
+
+def ratings(top=2015):
+    return pd.DataFrame({'Team': ['Liverpool', 'Arsenal', 'Chelsea'], 'Elo': [top, 1990, 1875]})
+
+def test_write_is_atomic(tmp_path, monkeypatch):
+    store = SharedEloStore(str(tmp_path / 'elo' / 'elo.json'))
+    assert store.stamp() is None and store.read() == (None, 0, None)
+    with store.lock():
+        assert store.write(ratings(), 100.0) == 1
+
+    # A write that fails half way leaves the previous version in place
+    def broken_dump(data, f):
+        f.write('{"version": 2, "teams": [')
+        raise OSError('disk full')
+    monkeypatch.setattr(shared_elo.json, 'dump', broken_dump)
+    with pytest.raises(OSError):
+        store.write(ratings(1500))
+    monkeypatch.undo()
+    elo_df, version, fetched_at = store.read()
+    assert version == 1 and fetched_at == 100.0 and elo_df['Elo'].tolist() == [2015, 1990, 1875]
+
+    # Readers racing a writer only ever see complete versions
+    seen = []
+    done = threading.Event()
+    def reader():
+        while not done.is_set():
+            elo_df, version, _ = store.read()
+            seen.append((version, elo_df['Elo'].iloc[0] if elo_df is not None else None))
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for top in range(2001, 2051):
+        with store.lock():
+            store.write(ratings(top))
+    done.set()
+    thread.join()
+    assert seen and all(top == 1999 + version for version, top in seen if version > 1)
+    assert [name for name in os.listdir(tmp_path / 'elo') if name.endswith('.tmp')] == []
+
+def test_stamp_changes_when_another_process_writes(tmp_path):
+    path = str(tmp_path / 'elo.json')
+    store = SharedEloStore(path)
+    with store.lock():
+        store.write(ratings())
+    stamp = store.stamp()
+    assert store.stamp() == stamp
+
+    code = (
+        "import sys, pandas as pd\n"
+        "from src.shared_elo import SharedEloStore\n"
+        "store = SharedEloStore(sys.argv[1])\n"
+        "with store.lock():\n"
+        "    store.write(pd.DataFrame({'Team': ['Liverpool'], 'Elo': [1700]}))\n"
+    )
+    subprocess.run([sys.executable, '-c', code, path], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert store.stamp() != stamp
+    elo_df, version, _ = store.read()
+    assert version == 2 and elo_df['Team'].tolist() == ['Liverpool']
+
+def test_lock_falls_back_without_fcntl(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_elo, 'fcntl', None)
+    store = SharedEloStore(str(tmp_path / 'elo.json'))
+    with store.lock():
+        store.write(ratings())
+    with store.lock():
+        assert store.write(ratings(1800)) == 2
+    assert store.read()[0]['Elo'].iloc[0] == 1800
+
+def test_sync_retries_after_a_failed_read(tmp_path, monkeypatch):
+    store = SharedEloStore(str(tmp_path / 'elo.json'))
+    monkeypatch.setattr(app_module, 'elo_store', store)
+    monkeypatch.setattr(app_module, 'elo_store_stamp', None)
+    monkeypatch.setattr(app_module, 'elo_snapshot', None)
+    monkeypatch.setattr(app_module, 'model', None)
+    with store.lock():
+        store.write(ratings())
+
+    read = store.read
+    monkeypatch.setattr(store, 'read', lambda: (None, 0, None))
+    app_module.sync_elo_data()
+    assert app_module.elo_snapshot is None
+
+    monkeypatch.setattr(store, 'read', read)
+    app_module.sync_elo_data()
+    assert app_module.elo_snapshot is not None and app_module.elo_snapshot.version == 1
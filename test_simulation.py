@@ -0,0 +1,91 @@
+import os
+import time
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src.data_scraping import parse_elo_html
+from src.elo_snapshot import EloSnapshot
+from src.linear_model import LinearGoalsModel
+from src.simulation import CHUNK_SIZE, simulate_season
+
+def load_snapshot():
+    with open('data/fixtures/clubelo_ENG.html', encoding='utf-8') as f:
+        return EloSnapshot.from_dataframe(parse_elo_html(f.read()), version=1)
+
+def load_model():
+    return LinearGoalsModel.load('models/elo_model.npz')
+
+def full_season(snapshot):
+    teams = snapshot.teams.tolist()
+    return [(home, away) for home in teams for away in teams if home != away]
+
+def test_seeded_results_are_deterministic_for_any_process_count():
+    model, snapshot = load_model(), load_snapshot()
+    fixtures = full_season(snapshot)[:60]
+    n_sims = 2 * CHUNK_SIZE + 10
+    single = simulate_season(model, fixtures, snapshot, n_sims=n_sims, seed=42)
+    assert simulate_season(model, fixtures, snapshot, n_sims=n_sims, seed=42) == single
+    assert simulate_season(model, fixtures, snapshot, n_sims=n_sims, seed=42, processes=2) == single
+    assert simulate_season(model, fixtures, snapshot, n_sims=n_sims, seed=43) != single
+
+def test_full_season_meets_speed_target():
+    """100k simulations of a whole season should take seconds, not minutes"""
+    model, snapshot = load_model(), load_snapshot()
+    started = time.perf_counter()
+    result = simulate_season(model, full_season(snapshot), snapshot, n_sims=100000, seed=1)
+    elapsed = time.perf_counter() - started
+    assert elapsed < 20, f"100k simulations took {elapsed:.1f}s"
+
+    assert result['fixtures'] == 380 and result['complete_league']
+    standings = result['standings']
+    assert abs(sum(row['title_prob'] for row in standings) - 100) < 0.1
+    assert abs(sum(row['relegation_prob'] for row in standings) - 300) < 0.1
+
+def test_relegation_needs_a_complete_league():
+    model, snapshot = load_model(), load_snapshot()
+    # A handful of fixtures between a few teams is not a league
+    result = simulate_season(model, [('Liverpool', 'Arsenal'), ('Arsenal', 'Chelsea')], snapshot, n_sims=100, seed=1)
+    assert not result['complete_league']
+    assert all(row['relegation_prob'] is None for row in result['standings'])
+
+    # The rest of a season is, given the table it continues from
+    teams = snapshot.teams.tolist()
+    table = {team: {'points': 40 - i, 'goal_diff': 0, 'goals_for': 40} for i, team in enumerate(teams)}
+    fixtures = full_season(snapshot)[:30]
+    assert not simulate_season(model, fixtures, snapshot, n_sims=100, seed=1)['complete_league']
+    result = simulate_season(model, fixtures, snapshot, table=table, n_sims=100, seed=1)
+    assert result['complete_league']
+    assert all(row['relegation_prob'] is not None for row in result['standings'])
+
+def test_invalid_parameters_are_rejected(monkeypatch):
+    monkeypatch.setattr(app_module, 'model', load_model())
+    monkeypatch.setattr(app_module, 'elo_snapshot', load_snapshot())
+    monkeypatch.setattr(app_module, 'warmup_state', 'ready')
+    monkeypatch.setattr(app_module, 'sync_elo_data', lambda: None)
+    client = app_module.app.test_client()
+    fixtures = [{'home_team': 'Liverpool', 'away_team': 'Arsenal'}]
+
+    for body in ({'fixtures': fixtures, 'n_sims': 'lots'}, {'fixtures': fixtures, 'n_sims': None},
+                 {'fixtures': fixtures, 'n_sims': 0}, {'fixtures': fixtures, 'seed': 'abc'},
+                 {'fixtures': fixtures, 'seed': -1}, {'fixtures': fixtures, 'table': ['Liverpool']},
+                 {'fixtures': fixtures, 'table': {'Liverpool': {'points': 'ten'}}},
+                 {'fixtures': 'Liverpool v Arsenal'}, {}):
+        response = client.post('/simulate', json=body)
+        assert response.status_code == 400, body
+    assert client.post('/simulate', data='not json', content_type='application/json').status_code == 400
+
+    response = client.post('/simulate', json={'fixtures': fixtures, 'n_sims': '100', 'seed': '7',
+                                              'table': {'Liverpool': {'points': 3}}})
+    assert response.status_code == 200
+    assert response.json['n_sims'] == 100 and response.json['seed'] == 7
+
+def test_goal_difference_ranks_ahead_of_goals_scored():
+    model, snapshot = load_model(), load_snapshot()
+    # Level on points: goal difference decides, however many goals were scored
+    table = {'Liverpool': {'points': 10, 'goal_diff': 0, 'goals_for': 1500},
+             'Arsenal': {'points': 10, 'goal_diff': 1, 'goals_for': 0}}
+    result = simulate_season(model, [('Chelsea', 'Everton')], snapshot, table=table, n_sims=100, seed=1)
+    title = {row['team']: row['title_prob'] for row in result['standings']}
+    assert title['Arsenal'] == 100 and title['Liverpool'] == 0
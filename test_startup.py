@@ -0,0 +1,56 @@
+import os
+import sys
+import subprocess
+
+# Import the app without its warm-up; the tests drive it explicitly
+os.environ['APP_WARMUP'] = 'off'
+
+import app as app_module
+from src.data_loading import load_match_data
+from src.data_scraping import parse_elo_html
+from src.head_to_head import build_head_to_head
+from src.linear_model import LinearGoalsModel
+from src.model_registry import ModelRegistry
+from src.shared_elo import SharedEloStore
+
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'joblib', 'bs4', 'requests', 'sqlalchemy', 'flask_sqlalchemy', 'flask_migrate')
+
+def test_import_skips_heavy_modules():
+    code = (
+        "import sys, app; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, APP_WARMUP='off')
+    result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
+def test_health_and_readiness(tmp_path, monkeypatch):
+    # Keep the per-request syncs away from the local ELO store and registry
+    monkeypatch.setattr(app_module, 'elo_store', SharedEloStore(str(tmp_path / 'elo.json')))
+    monkeypatch.setattr(app_module, 'elo_store_stamp', None)
+    monkeypatch.setattr(app_module, 'model_registry', ModelRegistry(str(tmp_path / 'registry')))
+    monkeypatch.setattr(app_module, 'model_registry_stamp', None)
+    monkeypatch.setattr(app_module, 'elo_snapshot', None)
+    monkeypatch.setattr(app_module, 'fixture_matrix', None)
+    client = app_module.app.test_client()
+    monkeypatch.setattr(app_module, 'warmup_state', 'pending')
+
+    assert client.get('/healthz').status_code == 200
+    response = client.get('/readyz')
+    assert response.status_code == 503
+    assert response.json['warmup'] == 'pending'
+    assert client.post('/predict', json={'home_team': 'Liverpool', 'away_team': 'Arsenal'}).status_code == 503
+
+    # What warm_up() loads, without fetching from clubelo.com
+    monkeypatch.setattr(app_module, 'model', LinearGoalsModel.load(app_module.app.config['LINEAR_MODEL_PATH']))
+    monkeypatch.setattr(app_module, 'head_to_head', build_head_to_head(load_match_data()))
+    with open('data/fixtures/clubelo_ENG.html', encoding='utf-8') as f:
+        app_module.set_elo_data(parse_elo_html(f.read()))
+    monkeypatch.setattr(app_module, 'warmup_state', 'ready')
+
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.json['ready'] is True
+    response = client.post('/predict', json={'home_team': 'Liverpool', 'away_team': 'Arsenal'})
+    assert response.status_code == 200
+    assert response.json['home_team'] == 'Liverpool'
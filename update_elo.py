@@ -1,5 +1,10 @@
+import os
+
+# Only the app context is needed here, not the model and data
+os.environ.setdefault('APP_WARMUP', 'off')
+
 from app import app
 from src.data_scraping import update_elo_data
 
 with app.app_context():
-    update_elo_data() 
\ No newline at end of file
+    update_elo_data()